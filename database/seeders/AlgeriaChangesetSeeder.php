@@ -0,0 +1,116 @@
+<?php
+
+namespace Database\Seeders;
+
+use App\Models\City;
+use App\Models\Province;
+use Illuminate\Database\Seeder;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Applies locations.changeset.json (built by `python -m toolchain.changeset`)
+ * so a dataset update only touches the provinces and cities that changed.
+ * Rows that are already inserted are skipped, so running it twice is a no-op.
+ */
+class AlgeriaChangesetSeeder extends Seeder
+{
+    /**
+     * Changeset to apply; defaults to database/seeders/data/locations.changeset.json.
+     */
+    public ?string $file = null;
+
+    public function run(): void
+    {
+        $file = $this->file ?? database_path('seeders/data/locations.changeset.json');
+        if (!file_exists($file)) {
+            $this->command->warn('Changeset not found at ' . $file . '; run `python -m toolchain.changeset` first.');
+            return;
+        }
+
+        $changeset = json_decode(file_get_contents($file), true);
+        if (($changeset['version'] ?? null) !== 1) {
+            $this->command->warn('Changeset invalid or of an unsupported version; skipping.');
+            return;
+        }
+
+        DB::transaction(function () use ($changeset) {
+            $this->applyProvinces($changeset['provinces']);
+            $this->applyCities($changeset['cities']);
+        });
+    }
+
+    private function applyProvinces(array $changes): void
+    {
+        $now = now();
+        $existing = Province::whereIn('code', array_map(fn (array $c) => $c['values']['code'], $changes['insert']))
+            ->pluck('code')
+            ->all();
+        $rows = [];
+        foreach ($changes['insert'] as $change) {
+            if (!in_array($change['values']['code'], $existing, true)) {
+                $rows[] = $change['values'] + ['created_at' => $now, 'updated_at' => $now];
+            }
+        }
+        if ($rows) {
+            Province::insert($rows);
+        }
+
+        $updated = 0;
+        foreach ($changes['update'] as $change) {
+            $updated += Province::where('code', $change['key']['code'])->update($change['set'] + ['updated_at' => $now]);
+        }
+
+        // Cities of a deleted province go with it (cascadeOnDelete).
+        $deleted = Province::whereIn('code', array_map(fn (array $c) => $c['key']['code'], $changes['delete']))->delete();
+
+        $this->command->info(sprintf('Provinces: %d inserted, %d updated, %d deleted.', count($rows), $updated, $deleted));
+    }
+
+    private function applyCities(array $changes): void
+    {
+        $provinceIds = Province::pluck('id', 'code');
+        $now = now();
+        $city = function (array $key) use ($provinceIds) {
+            return City::where('province_id', $provinceIds[$key['province_code']] ?? null)
+                ->where('name_ar', $key['name_ar']);
+        };
+
+        $deleted = 0;
+        foreach ($changes['delete'] as $change) {
+            $deleted += $city($change['key'])->delete();
+        }
+
+        $updated = 0;
+        foreach ($changes['update'] as $change) {
+            $updated += $city($change['key'])->update($change['set'] + ['updated_at' => $now]);
+        }
+
+        $existing = $changes['insert']
+            ? City::query()->get(['province_id', 'name_ar'])->keyBy(fn (City $city) => $city->province_id . '|' . $city->name_ar)
+            : collect();
+        $rows = [];
+        foreach ($changes['insert'] as $change) {
+            $values = $change['values'];
+            $provinceId = $provinceIds[$values['province_code']] ?? null;
+            if (!$provinceId) {
+                $this->command->warn("Province code {$values['province_code']} not found for city {$values['name_ar']}");
+                continue;
+            }
+            if ($existing->has($provinceId . '|' . $values['name_ar'])) {
+                continue;
+            }
+            $rows[] = [
+                'province_id' => $provinceId,
+                'name_ar' => $values['name_ar'],
+                'name_en' => $values['name_en'],
+                'created_at' => $now,
+                'updated_at' => $now,
+            ];
+        }
+        foreach (array_chunk($rows, 150) as $chunk) {
+            City::insert($chunk);
+        }
+
+        $this->command->info(sprintf('Cities: %d inserted, %d updated, %d deleted.', count($rows), $updated, $deleted));
+    }
+}
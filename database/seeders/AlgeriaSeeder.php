@@ -42,38 +42,102 @@ private function seedProvinces(): void
     }
 
     private function seedCities(): void
+    {
+        $chunks = $this->loadCityChunks();
+        if ($chunks === null) {
+            return;
+        }
+
+        // Resolve every province code and load the existing cities up front so
+        // new cities go in as one multi-row INSERT per chunk.
+        $provinceIds = Province::pluck('id', 'code');
+        $inserted = 0;
+        $updated = 0;
+
+        DB::transaction(function () use ($chunks, $provinceIds, &$inserted, &$updated) {
+            $existing = City::query()
+                ->get(['id', 'province_id', 'name_ar', 'name_en'])
+                ->keyBy(fn (City $city) => $city->province_id . '|' . $city->name_ar);
+            $queued = [];
+            $now = now();
+
+            foreach ($chunks as $chunk) {
+                $rows = [];
+                foreach ($chunk as [$code, $nameAr, $nameEn]) {
+                    $provinceId = $provinceIds[$code] ?? null;
+                    if (!$provinceId) {
+                        $this->command->warn("Province code {$code} not found for city {$nameAr}");
+                        continue;
+                    }
+
+                    $key = $provinceId . '|' . $nameAr;
+                    $nameEn = $nameEn ?: $nameAr;
+                    if ($city = $existing->get($key)) {
+                        if ($city->name_en !== $nameEn) {
+                            $city->update(['name_en' => $nameEn]);
+                            $updated++;
+                        }
+                        continue;
+                    }
+
+                    if (isset($queued[$key])) {
+                        continue;
+                    }
+
+                    $queued[$key] = true;
+                    $rows[] = [
+                        'province_id' => $provinceId,
+                        'name_ar' => $nameAr,
+                        'name_en' => $nameEn,
+                        'created_at' => $now,
+                        'updated_at' => $now,
+                    ];
+                }
+
+                if ($rows) {
+                    City::insert($rows);
+                    $inserted += count($rows);
+                }
+            }
+        });
+
+        $this->command->info("Cities dataset seeded ({$inserted} inserted, {$updated} updated).");
+    }
+
+    /**
+     * City rows as chunks of [province_code, name_ar, name_en].
+     *
+     * Prefers the pre-validated cities.seed.json built by `python -m toolchain.seeds`
+     * and falls back to cities.json when the artifact is missing or stale.
+     */
+    private function loadCityChunks(): ?array
     {
         $file = database_path('seeders/data/cities.json');
         if (!file_exists($file)) {
             $this->command->warn('Cities JSON not found at ' . $file . '; skipping.');
-            return;
+            return null;
+        }
+
+        $artifactFile = database_path('seeders/data/cities.seed.json');
+        if (file_exists($artifactFile)) {
+            $artifact = json_decode(file_get_contents($artifactFile), true);
+            if (($artifact['version'] ?? null) === 1 && ($artifact['source_sha1'] ?? null) === sha1_file($file)) {
+                return $artifact['chunks'];
+            }
+            $this->command->warn('cities.seed.json is out of date with cities.json; using cities.json.');
         }
 
         $cities = json_decode(file_get_contents($file), true);
         if (!$cities) {
             $this->command->warn('Cities JSON invalid or empty; skipping.');
-            return;
+            return null;
         }
 
-        DB::transaction(function () use ($cities) {
-            foreach ($cities as $c) {
-                $province = Province::where('code', $c['province_code'])->first();
-                if (!$province) {
-                    $this->command->warn("Province code {$c['province_code']} not found for city {$c['name_ar']}");
-                    continue;
-                }
-
-                City::updateOrCreate(
-                    ['province_id' => $province->id, 'name_ar' => $c['name_ar']],
-                    [
-                        'province_id' => $province->id,
-                        'name_ar' => $c['name_ar'],
-                        'name_en' => $c['name_en'] ?? $c['name_ar']
-                    ]
-                );
-            }
-        });
+        $rows = array_map(
+            fn (array $c) => [$c['province_code'], $c['name_ar'], $c['name_en'] ?? $c['name_ar']],
+            $cities
+        );
 
-        $this->command->info('Cities dataset seeded.');
+        return array_chunk($rows, 150);
     }
 }
@@ -1,5 +1,15 @@
 #!/usr/bin/env python3
+# Hand-curated city list. The full commune dataset is generated from
+# algeria_cities.sql by `python -m toolchain.communes` instead, so this
+# writes cities.curated.json and only replaces cities.json with --force.
+import argparse
 import json
+import os
+import sys
+
+from toolchain.buildcache import run_cached
+from toolchain.fsutil import write_if_changed
+from toolchain.paths import SEED_DATA_DIR, display_path
 
 cities_data = [
     {"province_code": "01", "name_ar": "أدرار", "name_en": "Adrar"},
@@ -127,8 +137,39 @@ cities_data = [
     {"province_code": "58", "name_ar": "بريدجة", "name_en": "Beridja"}
 ]
 
-output_path = '/home/houdaifayahia/www/Laravel-Vue-Inertia-general-purpose/database/seeders/data/cities.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(cities_data, f, ensure_ascii=False, indent=2)
 
-print(f"✓ Created cities.json with {len(cities_data)} cities")
+CURATED_JSON = os.path.join(SEED_DATA_DIR, 'cities.curated.json')
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write the hand-curated city list.')
+    parser.add_argument('--out', default=CURATED_JSON, help='output file (default: %(default)s)')
+    parser.add_argument('--force', action='store_true',
+                        help='allow replacing cities.json, and rebuild even when the list is unchanged')
+    args = parser.parse_args(argv)
+
+    output_path = os.path.abspath(args.out)
+    if output_path == os.path.abspath(CITIES_JSON) and not args.force:
+        print(f"✗ Refusing to replace cities.json (the full commune list) with {len(cities_data)} curated "
+              "cities; pass --force to do it anyway")
+        return 1
+
+    data = json.dumps(cities_data, ensure_ascii=False, indent=2).encode('utf-8')
+    ran, _ = run_cached(
+        f'generate_cities_real:{display_path(output_path)}',
+        [__file__], [output_path],
+        lambda: write_if_changed(output_path, data),
+        force=args.force,
+    )
+    name = display_path(output_path)
+    if not ran:
+        print(f"• {name} already matches the curated list")
+        return 0
+
+    print(f"✓ Created {name} with {len(cities_data)} cities")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
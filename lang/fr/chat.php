@@ -112,7 +112,8 @@
     'status_resolved' => 'Résolu',
 
     // Notifications
-    'new_message' => 'Nouveau message de :user',
+    'new_message' => 'Nouveau message',
+    'new_message_from' => 'Nouveau message de :user',
     'new_message_in' => 'Nouveau message dans :channel',
     'mentioned_you' => ':user vous a mentionné',
     'user_joined' => ':user a rejoint la conversation',
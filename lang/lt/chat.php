@@ -112,7 +112,8 @@
     'status_resolved' => 'Išspręsta',
 
     // Notifications
-    'new_message' => 'Nauja žinutė nuo :user',
+    'new_message' => 'Nauja žinutė',
+    'new_message_from' => 'Nauja žinutė nuo :user',
     'new_message_in' => 'Nauja žinutė :channel',
     'mentioned_you' => ':user jus paminėjo',
     'user_joined' => ':user prisijungė prie pokalbio',
@@ -0,0 +1,56 @@
+import assert from 'node:assert/strict';
+import { afterEach, describe, it } from 'node:test';
+import { cachedFetchJson, fetchJson } from './fetchJson.ts';
+
+const realFetch = globalThis.fetch;
+let calls: string[] = [];
+
+// Answers each request with the next status in `statuses` (200 when empty).
+function mockFetch(statuses: number[] = []) {
+    calls = [];
+    globalThis.fetch = (async (url: string) => {
+        calls.push(url);
+        const status = statuses.shift() ?? 200;
+        return new Response(JSON.stringify({ url }), { status });
+    }) as typeof fetch;
+}
+
+afterEach(() => {
+    globalThis.fetch = realFetch;
+});
+
+describe('fetchJson', () => {
+    it('parses the response', async () => {
+        mockFetch();
+        assert.deepEqual(await fetchJson('/a.json'), { url: '/a.json' });
+    });
+
+    it('rejects on an error status', async () => {
+        mockFetch([404]);
+        await assert.rejects(fetchJson('/missing.json'), {
+            message: 'Failed to load /missing.json: 404',
+        });
+    });
+});
+
+describe('cachedFetchJson', () => {
+    it('shares one request per URL', async () => {
+        mockFetch();
+        const [first, second] = await Promise.all([
+            cachedFetchJson('/lang/en/faq.1.json'),
+            cachedFetchJson('/lang/en/faq.1.json'),
+        ]);
+        assert.equal(first, second);
+        assert.equal(await cachedFetchJson('/lang/en/faq.1.json'), first);
+        assert.deepEqual(calls, ['/lang/en/faq.1.json']);
+    });
+
+    it('retries a URL whose request failed', async () => {
+        mockFetch([503]);
+        await assert.rejects(cachedFetchJson('/lang/en/about.1.json'));
+        assert.deepEqual(await cachedFetchJson('/lang/en/about.1.json'), {
+            url: '/lang/en/about.1.json',
+        });
+        assert.equal(calls.length, 2);
+    });
+});
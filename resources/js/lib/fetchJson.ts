@@ -0,0 +1,29 @@
+/**
+ * JSON fetching shared by the lazy loaders in this directory.
+ *
+ * `cachedFetchJson` keeps one request per URL for the rest of the session,
+ * so callers asking for the same file share it; a failed request is
+ * dropped again so the next call retries instead of rethrowing the old
+ * error.
+ */
+const requests = new Map<string, Promise<unknown>>();
+
+export async function fetchJson<T>(url: string): Promise<T> {
+    const response = await fetch(url, { credentials: 'same-origin' });
+    if (!response.ok) {
+        throw new Error(`Failed to load ${url}: ${response.status}`);
+    }
+    return response.json() as Promise<T>;
+}
+
+export function cachedFetchJson<T>(url: string): Promise<T> {
+    let request = requests.get(url);
+    if (!request) {
+        request = fetchJson<T>(url).catch((error) => {
+            requests.delete(url);
+            throw error;
+        });
+        requests.set(url, request);
+    }
+    return request as Promise<T>;
+}
@@ -0,0 +1,65 @@
+/**
+ * Lazy per-namespace translation loading.
+ *
+ * `python -m toolchain.bundles` splits every lang/php_<locale>.json into
+ * content-hashed chunks under public/lang/ plus a manifest. These helpers
+ * fetch only the namespaces a page needs, e.g. as the i18nVue `resolve`
+ * callback: `resolve: (lang) => loadNamespaces(lang, ['sidebar', 'doctors'])`.
+ * `loadCompiledNamespaces` returns the same messages precompiled for
+ * `interpolate` from ./messageFormat.
+ */
+import { cachedFetchJson } from './fetchJson.ts';
+import type { CompiledMessage } from './messageFormat';
+
+type ChunkEntry = {
+    file: string;
+    compiled: string;
+    keys: number;
+    bytes: number;
+};
+type BundleManifest = {
+    version: number;
+    locales: Record<string, Record<string, ChunkEntry>>;
+};
+type Messages = Record<string, string>;
+type CompiledMessages = Record<string, CompiledMessage>;
+
+const BUNDLES_URL = '/lang';
+
+export function loadBundleManifest(): Promise<BundleManifest> {
+    return cachedFetchJson<BundleManifest>(`${BUNDLES_URL}/manifest.json`);
+}
+
+function loadChunk<T>(file: string): Promise<T> {
+    // Chunk names are content hashed, so a loaded chunk never goes stale.
+    return cachedFetchJson<T>(`${BUNDLES_URL}/${file}`);
+}
+
+async function loadChunks<T>(
+    locale: string,
+    namespaces: string[],
+    field: 'file' | 'compiled',
+): Promise<T> {
+    const manifest = await loadBundleManifest();
+    const chunks = manifest.locales[locale] ?? {};
+    const loaded = await Promise.all(
+        namespaces
+            .filter((namespace) => chunks[namespace])
+            .map((namespace) => loadChunk<T>(chunks[namespace][field])),
+    );
+    return Object.assign({}, ...loaded);
+}
+
+export function loadNamespaces(
+    locale: string,
+    namespaces: string[],
+): Promise<Messages> {
+    return loadChunks<Messages>(locale, namespaces, 'file');
+}
+
+export function loadCompiledNamespaces(
+    locale: string,
+    namespaces: string[],
+): Promise<CompiledMessages> {
+    return loadChunks<CompiledMessages>(locale, namespaces, 'compiled');
+}
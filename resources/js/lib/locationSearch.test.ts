@@ -0,0 +1,45 @@
+import assert from 'node:assert/strict';
+import { readFileSync } from 'node:fs';
+import { describe, it } from 'node:test';
+import { LocationIndex, type LocationMatch } from './locationSearch.ts';
+
+// Built by toolchain/search.py; test_search.py keeps it current.
+const data = JSON.parse(
+    readFileSync(
+        new URL('./__fixtures__/search-index.json', import.meta.url),
+        'utf-8',
+    ),
+);
+
+function names(matches: LocationMatch[]): string[] {
+    return matches.map((match) => match.entry[2]);
+}
+
+describe('LocationIndex.search', () => {
+    const index = new LocationIndex(data);
+
+    it('ranks prefix hits above fuzzy ones', () => {
+        assert.deepEqual(names(index.search('oran')), [
+            'Oranais',
+            'Oran Nord',
+            'Ouran',
+        ]);
+    });
+
+    it('normalizes Arabic queries', () => {
+        assert.deepEqual(names(index.search('وهران', 2)), [
+            'Oranais',
+            'Oran Nord',
+        ]);
+    });
+
+    it('falls back to trigrams for typos', () => {
+        assert.deepEqual(names(index.search('tlemsen')), ['Tlemcen']);
+    });
+
+    it('applies the province filter before the fuzzy gate', () => {
+        // The two prefix hits in 01 fill the limit but must not hide 02.
+        assert.deepEqual(names(index.search('oran', 2, '02')), ['Ouran']);
+        assert.deepEqual(names(index.search('oran nord', 10, '02')), []);
+    });
+});
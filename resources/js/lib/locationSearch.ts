@@ -0,0 +1,251 @@
+/**
+ * Client for the location autocomplete index built by
+ * `python -m toolchain.search` (public/locations/search-index.json).
+ *
+ * `normalizeName` mirrors toolchain/textnorm.py; keep the two in sync. The
+ * index ships no normalized names: they are recomputed from the entries,
+ * and posting lists are delta-encoded (gaps between ascending entry ids).
+ */
+import { fetchJson } from './fetchJson.ts';
+
+export type LocationEntry = [
+    provinceCode: string,
+    nameAr: string,
+    nameEn: string,
+];
+export type LocationMatch = { score: number; entry: LocationEntry };
+
+type SearchIndexData = {
+    version: number;
+    entries: LocationEntry[];
+    terms: string[];
+    postings: number[][];
+    trigrams: Record<string, number[]>;
+};
+
+const INDEX_URL = '/locations/search-index.json';
+const INDEX_VERSION = 2;
+const EXACT = 3;
+const PREFIX = 2;
+const TOKEN_PREFIX = 1;
+const FUZZY = 0;
+const MIN_SIMILARITY = 0.4;
+
+const ARABIC_MAP: Record<string, string> = {
+    'ٱ': 'ا',
+    'ى': 'ي',
+    'ة': 'ه',
+    'ک': 'ك',
+    'ی': 'ي',
+    'ء': '',
+    'ـ': '',
+};
+const LATIN_FOLDS: [string, string][] = [
+    ['dj', 'j'],
+    ['ou', 'u'],
+    ['q', 'k'],
+    ['y', 'i'],
+];
+const ARABIC_ARTICLE = 'ال';
+
+function foldLatin(token: string): string {
+    let folded = token.replace(/([a-z])\1+/g, '$1');
+    for (const [source, target] of LATIN_FOLDS) {
+        folded = folded.split(source).join(target);
+    }
+    return folded === 'al' ? 'el' : folded;
+}
+
+function foldArabic(token: string): string {
+    return token.length > 2 && token.endsWith('ا')
+        ? token.slice(0, -1) + 'ه'
+        : token;
+}
+
+export function normalizeName(text: string): string {
+    const cleaned = text
+        .normalize('NFKD')
+        .replace(/\p{M}/gu, '')
+        .replace(/[ٱىةکیءـ]/g, (char) => ARABIC_MAP[char])
+        .toLowerCase();
+    return cleaned
+        .split(/[^\p{L}\p{N}]+/u)
+        .filter(Boolean)
+        .map((token) => {
+            if (/^[a-z]+$/.test(token)) {
+                return foldLatin(token);
+            }
+            return /^[ء-ي]+$/.test(token) ? foldArabic(token) : token;
+        })
+        .join(' ');
+}
+
+function trigrams(text: string): Set<string> {
+    const grams = new Set<string>();
+    for (const token of text.split(' ').filter(Boolean)) {
+        const padded = ` ${token} `;
+        for (let i = 0; i < padded.length - 2; i++) {
+            grams.add(padded.slice(i, i + 3));
+        }
+    }
+    return grams;
+}
+
+function lowerBound(terms: string[], value: string, from = 0): number {
+    let lo = from;
+    let hi = terms.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (terms[mid] < value) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+
+export class LocationIndex {
+    private keys = new Map<number, string[]>();
+    private grams = new Map<number, Set<string>[]>();
+
+    constructor(private data: SearchIndexData) {
+        if (data.version !== INDEX_VERSION) {
+            throw new Error(`Unsupported search index version ${data.version}`);
+        }
+    }
+
+    private prefixIds(token: string): Set<number> {
+        const { terms, postings } = this.data;
+        const lo = lowerBound(terms, token);
+        const hi = lowerBound(terms, token + '\uffff', lo);
+        const ids = new Set<number>();
+        for (let i = lo; i < hi; i++) {
+            let id = 0;
+            for (const gap of postings[i]) {
+                id += gap;
+                ids.add(id);
+            }
+        }
+        return ids;
+    }
+
+    private entryKeys(id: number): string[] {
+        let keys = this.keys.get(id);
+        if (!keys) {
+            const [, nameAr, nameEn] = this.data.entries[id];
+            keys = [normalizeName(nameAr), normalizeName(nameEn)];
+            this.keys.set(id, keys);
+        }
+        return keys;
+    }
+
+    private entryGrams(id: number): Set<string>[] {
+        let grams = this.grams.get(id);
+        if (!grams) {
+            grams = this.entryKeys(id).map(trigrams);
+            this.grams.set(id, grams);
+        }
+        return grams;
+    }
+
+    private tier(id: number, query: string): number {
+        const keys = this.entryKeys(id);
+        if (keys.includes(query)) {
+            return EXACT;
+        }
+        return keys.some((key) => key.startsWith(query))
+            ? PREFIX
+            : TOKEN_PREFIX;
+    }
+
+    search(text: string, limit = 10, province?: string): LocationMatch[] {
+        const query = normalizeName(text);
+        const tokens = query.split(' ').filter(Boolean);
+        if (!tokens.length) {
+            return [];
+        }
+
+        let candidates: Set<number> | null = null;
+        for (const token of tokens) {
+            const ids = this.prefixIds(token);
+            candidates = candidates
+                ? new Set([...candidates].filter((id) => ids.has(id)))
+                : ids;
+            if (!candidates.size) {
+                break;
+            }
+        }
+
+        const { entries } = this.data;
+        // Filter before the fuzzy gate so other provinces cannot crowd it out.
+        const inProvince = (id: number) =>
+            !province || entries[id][0] === province;
+        const scored = new Map<number, [number, number]>();
+        candidates?.forEach((id) => {
+            if (inProvince(id)) {
+                scored.set(id, [this.tier(id, query), 1]);
+            }
+        });
+
+        if (scored.size < limit) {
+            const queryGrams = trigrams(query);
+            const hits = new Map<number, number>();
+            queryGrams.forEach((gram) => {
+                let id = 0;
+                for (const gap of this.data.trigrams[gram] ?? []) {
+                    id += gap;
+                    hits.set(id, (hits.get(id) ?? 0) + 1);
+                }
+            });
+            const needed = (MIN_SIMILARITY * queryGrams.size) / 2;
+            hits.forEach((shared, id) => {
+                if (scored.has(id) || shared < needed || !inProvince(id)) {
+                    return;
+                }
+                const similarity = Math.max(
+                    ...this.entryGrams(id).map((grams) => {
+                        let common = 0;
+                        grams.forEach((gram) => {
+                            if (queryGrams.has(gram)) {
+                                common++;
+                            }
+                        });
+                        return (2 * common) / (queryGrams.size + grams.size);
+                    }),
+                );
+                if (similarity >= MIN_SIMILARITY) {
+                    scored.set(id, [FUZZY, similarity]);
+                }
+            });
+        }
+
+        return [...scored.entries()]
+            .sort(
+                ([a, [tierA, simA]], [b, [tierB, simB]]) =>
+                    tierB - tierA ||
+                    simB - simA ||
+                    entries[a][2].length - entries[b][2].length ||
+                    a - b,
+            )
+            .slice(0, limit)
+            .map(([id, [tier, similarity]]) => ({
+                score: tier + similarity,
+                entry: entries[id],
+            }));
+    }
+}
+
+let indexRequest: Promise<LocationIndex> | null = null;
+
+export function loadLocationIndex(): Promise<LocationIndex> {
+    if (!indexRequest) {
+        indexRequest = fetchJson<SearchIndexData>(INDEX_URL)
+            .then((data) => new LocationIndex(data))
+            .catch((error) => {
+                indexRequest = null;
+                throw error;
+            });
+    }
+    return indexRequest;
+}
@@ -0,0 +1,46 @@
+/**
+ * Per-province location data built by `python -m toolchain.hierarchy`.
+ *
+ * The manifest lists every province with its shard file; a shard holds one
+ * province's dairas and communes, so cascading pickers only download the
+ * province that was selected.
+ */
+import { cachedFetchJson } from './fetchJson.ts';
+
+export type Commune = { name_ar: string; name_en: string };
+export type Daira = { name_ar: string; name_en: string; communes: Commune[] };
+export type ProvinceShard = {
+    code: string;
+    name_ar: string;
+    name_en: string;
+    dairas: Daira[];
+};
+export type ProvinceEntry = {
+    name_ar: string;
+    name_en: string;
+    file: string;
+    bytes: number;
+    communes: number;
+    dairas: number;
+};
+type LocationManifest = {
+    version: number;
+    provinces: Record<string, ProvinceEntry>;
+};
+
+const LOCATIONS_URL = '/locations';
+
+export function loadLocationManifest(): Promise<LocationManifest> {
+    return cachedFetchJson<LocationManifest>(`${LOCATIONS_URL}/manifest.json`);
+}
+
+export async function loadProvinceShard(
+    code: string,
+): Promise<ProvinceShard | null> {
+    const manifest = await loadLocationManifest();
+    const entry = manifest.provinces[code];
+    if (!entry) {
+        return null;
+    }
+    return cachedFetchJson<ProvinceShard>(`${LOCATIONS_URL}/${entry.file}`);
+}
@@ -0,0 +1,54 @@
+import assert from 'node:assert/strict';
+import { describe, it } from 'node:test';
+import { type CompiledMessage, interpolate } from './messageFormat.ts';
+
+// As compiled by toolchain/messages.py.
+const experience: CompiledMessage = [
+    'Minimum Experience: ',
+    ['years', 0, '{years}'],
+    ' years',
+];
+const required: CompiledMessage = [
+    ['attribute', 1, ':Attribute'],
+    ' is required',
+];
+const shout: CompiledMessage = ['HELLO ', ['name', 2, ':NAME']];
+const greeting: CompiledMessage = ['Welcome, ', ['name']];
+
+describe('interpolate', () => {
+    it('returns plain messages as they are', () => {
+        assert.equal(interpolate('Save'), 'Save');
+    });
+
+    it('replaces brace placeholders', () => {
+        assert.equal(
+            interpolate(experience, { years: 5 }),
+            'Minimum Experience: 5 years',
+        );
+    });
+
+    it('keeps an unreplaced brace placeholder as written', () => {
+        assert.equal(
+            interpolate(experience),
+            'Minimum Experience: {years} years',
+        );
+    });
+
+    it('applies the case of capitalised placeholders', () => {
+        assert.equal(
+            interpolate(required, { attribute: 'email' }),
+            'Email is required',
+        );
+        assert.equal(interpolate(shout, { name: 'amina' }), 'HELLO AMINA');
+    });
+
+    it('keeps unreplaced capitalised placeholders as written', () => {
+        assert.equal(interpolate(required), ':Attribute is required');
+        assert.equal(interpolate(shout), 'HELLO :NAME');
+    });
+
+    it('renders a plain slot as :name when unreplaced', () => {
+        assert.equal(interpolate(greeting), 'Welcome, :name');
+        assert.equal(interpolate(greeting, { name: 'Lina' }), 'Welcome, Lina');
+    });
+});
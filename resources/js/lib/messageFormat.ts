@@ -0,0 +1,52 @@
+/**
+ * Interpolation for precompiled messages.
+ *
+ * `python -m toolchain.bundles` writes compiled chunks where every message
+ * with placeholders is already split into literal segments and slots:
+ * `"Minimum Experience: {years} years"` becomes
+ * `['Minimum Experience: ', ['years', 0, '{years}'], ' years']`. Rendering
+ * is a plain concatenation, so long lists do no regex work per item.
+ *
+ * A slot keeps the token it was written as (`[name]` stands for `:name`)
+ * and renders it unchanged when no value is given.
+ */
+export type Slot = [name: string, transform?: number, token?: string];
+export type CompiledMessage = string | (string | Slot)[];
+export type Replacements = Record<string, string | number>;
+
+// Slot transforms; keep in sync with toolchain/messages.py.
+const UCFIRST = 1;
+const UPPER = 2;
+
+function applyTransform(value: string, transform = 0): string {
+    if (transform === UPPER) {
+        return value.toUpperCase();
+    }
+    if (transform === UCFIRST) {
+        return value.charAt(0).toUpperCase() + value.slice(1);
+    }
+    return value;
+}
+
+export function interpolate(
+    message: CompiledMessage,
+    replacements: Replacements = {},
+): string {
+    if (typeof message === 'string') {
+        return message;
+    }
+    let result = '';
+    for (const segment of message) {
+        if (typeof segment === 'string') {
+            result += segment;
+            continue;
+        }
+        const [name, transform, token = `:${name}`] = segment;
+        const value = replacements[name];
+        result +=
+            value === undefined
+                ? token
+                : applyTransform(String(value), transform);
+    }
+    return result;
+}
@@ -0,0 +1,108 @@
+<?php
+
+namespace Tests\Feature;
+
+use App\Models\City;
+use App\Models\Province;
+use Database\Seeders\AlgeriaChangesetSeeder;
+use Database\Seeders\AlgeriaSeeder;
+use Illuminate\Foundation\Testing\RefreshDatabase;
+use Tests\TestCase;
+
+class AlgeriaChangesetSeederTest extends TestCase
+{
+    use RefreshDatabase;
+
+    private function applyChangeset(?array $changeset = null): void
+    {
+        $seeder = new AlgeriaChangesetSeeder();
+        if ($changeset !== null) {
+            $seeder->file = tempnam(sys_get_temp_dir(), 'changeset');
+            file_put_contents($seeder->file, json_encode($changeset));
+        }
+        $this->app->instance(AlgeriaChangesetSeeder::class, $seeder);
+
+        try {
+            $this->seed(AlgeriaChangesetSeeder::class);
+        } finally {
+            if ($changeset !== null) {
+                unlink($seeder->file);
+            }
+        }
+    }
+
+    private function snapshot(): array
+    {
+        return [
+            Province::orderBy('id')->get(['id', 'code', 'name_ar', 'name_en'])->toArray(),
+            City::orderBy('id')->get(['id', 'province_id', 'name_ar', 'name_en'])->toArray(),
+        ];
+    }
+
+    private function changeset(): array
+    {
+        return [
+            'version' => 1,
+            'provinces' => [
+                'insert' => [['values' => ['code' => '59', 'name_ar' => 'ولاية تجريبية', 'name_en' => 'Test Province']]],
+                'update' => [['key' => ['code' => '01'], 'set' => ['name_en' => 'Adrar Province']]],
+                'delete' => [['key' => ['code' => '58']]],
+            ],
+            'cities' => [
+                'insert' => [
+                    ['values' => ['province_code' => '59', 'name_ar' => 'مدينة تجريبية', 'name_en' => 'Test City']],
+                    ['values' => ['province_code' => '16', 'name_ar' => 'حي تجريبي', 'name_en' => 'Test District']],
+                ],
+                'update' => [
+                    ['key' => ['province_code' => '16', 'name_ar' => 'ابن عكنون'], 'set' => ['name_en' => 'Ben Aknoun Centre']],
+                ],
+                'delete' => [['key' => ['province_code' => '16', 'name_ar' => 'الابيار']]],
+            ],
+        ];
+    }
+
+    public function test_changeset_inserts_updates_and_deletes_rows(): void
+    {
+        $this->seed(AlgeriaSeeder::class);
+        $provinces = Province::count();
+        $cities = City::count();
+        $citiesOf58 = Province::where('code', '58')->firstOrFail()->cities()->count();
+
+        $this->applyChangeset($this->changeset());
+
+        // 58 goes with its cities; 59 and two cities are added, one city deleted.
+        $this->assertEquals($provinces, Province::count());
+        $this->assertEquals($cities - $citiesOf58 + 2 - 1, City::count());
+        $this->assertFalse(Province::where('code', '58')->exists());
+        $this->assertEquals('Adrar Province', Province::where('code', '01')->value('name_en'));
+        $this->assertEquals(
+            'Test City',
+            Province::where('code', '59')->firstOrFail()->cities()->value('name_en')
+        );
+        $this->assertEquals('Ben Aknoun Centre', City::where('name_ar', 'ابن عكنون')->value('name_en'));
+        $this->assertFalse(City::where('name_ar', 'الابيار')->exists());
+    }
+
+    public function test_applying_a_changeset_twice_is_idempotent(): void
+    {
+        $this->seed(AlgeriaSeeder::class);
+        $this->applyChangeset($this->changeset());
+        $after = $this->snapshot();
+
+        $this->applyChangeset($this->changeset());
+
+        $this->assertEquals($after, $this->snapshot());
+    }
+
+    public function test_shipped_changeset_is_a_no_op_on_the_current_dataset(): void
+    {
+        $this->seed(AlgeriaSeeder::class);
+        $seeded = $this->snapshot();
+
+        $this->applyChangeset();
+        $this->assertEquals($seeded, $this->snapshot());
+
+        $this->seed(AlgeriaSeeder::class);
+        $this->assertEquals($seeded, $this->snapshot());
+    }
+}
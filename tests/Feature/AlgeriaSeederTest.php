@@ -0,0 +1,60 @@
+<?php
+
+namespace Tests\Feature;
+
+use App\Models\City;
+use App\Models\Province;
+use Database\Seeders\AlgeriaSeeder;
+use Illuminate\Foundation\Testing\RefreshDatabase;
+use Tests\TestCase;
+
+class AlgeriaSeederTest extends TestCase
+{
+    use RefreshDatabase;
+
+    private function dataset(string $file): array
+    {
+        return json_decode(file_get_contents(database_path('seeders/data/' . $file)), true);
+    }
+
+    public function test_seeds_every_province_and_city(): void
+    {
+        $this->seed(AlgeriaSeeder::class);
+
+        $this->assertEquals(count($this->dataset('provinces.json')), Province::count());
+        $this->assertEquals($this->dataset('cities.seed.json')['rows'], City::count());
+        $this->assertEquals(count($this->dataset('cities.json')), City::count());
+
+        $adrar = Province::where('code', '01')->firstOrFail();
+        $this->assertEquals('Adrar', $adrar->name_en);
+        $this->assertTrue($adrar->cities()->where('name_en', 'Adrar')->exists());
+    }
+
+    public function test_reseeding_is_idempotent(): void
+    {
+        $this->seed(AlgeriaSeeder::class);
+        $provinces = Province::orderBy('id')->get(['id', 'code', 'name_ar', 'name_en'])->toArray();
+        $cities = City::orderBy('id')->get(['id', 'province_id', 'name_ar', 'name_en'])->toArray();
+
+        $this->seed(AlgeriaSeeder::class);
+
+        $this->assertEquals($provinces, Province::orderBy('id')->get(['id', 'code', 'name_ar', 'name_en'])->toArray());
+        $this->assertEquals($cities, City::orderBy('id')->get(['id', 'province_id', 'name_ar', 'name_en'])->toArray());
+    }
+
+    public function test_reseeding_restores_missing_and_edited_rows(): void
+    {
+        $this->seed(AlgeriaSeeder::class);
+        $count = City::count();
+
+        $edited = City::orderBy('id')->firstOrFail();
+        $name = $edited->name_en;
+        $edited->update(['name_en' => 'Renamed']);
+        City::orderByDesc('id')->firstOrFail()->delete();
+
+        $this->seed(AlgeriaSeeder::class);
+
+        $this->assertEquals($count, City::count());
+        $this->assertEquals($name, $edited->fresh()->name_en);
+    }
+}
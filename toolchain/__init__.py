@@ -0,0 +1 @@
+"""Data and i18n toolchain for the Laravel app (translations, location datasets)."""
@@ -0,0 +1,121 @@
+"""Single entry point for the project toolchain.
+
+    python -m toolchain build                 # every stage, independent ones in parallel
+    python -m toolchain build bundles         # one stage and what it depends on
+    python -m toolchain build --force         # ignore the build cache
+    python -m toolchain graph                 # print the stage graph
+    python -m toolchain <tool> [args ...]     # run one tool, e.g. `search -q oran`
+
+The project root is the nearest directory above the current one holding
+``artisan`` (override with ``--root``), so the CLI works from any checkout
+or CI workspace. Tool modules are only imported when they are run.
+"""
+import argparse
+import importlib
+import os
+import sys
+
+# Command name -> module; imported lazily so `python -m toolchain` starts fast.
+TOOLS = {
+    'communes': 'toolchain.communes',
+    'seeds': 'toolchain.seeds',
+    'changeset': 'toolchain.changeset',
+    'hierarchy': 'toolchain.hierarchy',
+    'search': 'toolchain.search',
+    'proximity': 'toolchain.proximity',
+    'locstore': 'toolchain.locstore',
+    'reconcile': 'toolchain.reconcile',
+    'phpsync': 'toolchain.phpsync',
+    'translations': 'toolchain.translations',
+    'bundles': 'toolchain.bundles',
+    'compress': 'toolchain.compress',
+    'coverage': 'toolchain.coverage',
+    'messages': 'toolchain.messages',
+    'fallbacks': 'toolchain.fallbacks',
+    'keyscan': 'toolchain.keyscan',
+    'lint': 'toolchain.jsonlint',
+    'bench': 'toolchain.bench',
+    'loadgen': 'toolchain.loadgen',
+    'watch': 'toolchain.watch',
+}
+
+
+def _find_root(start):
+    # Same walk as paths.find_project_root, which cannot be imported before TOOLCHAIN_ROOT is set.
+    path = os.path.abspath(start)
+    while not os.path.isfile(os.path.join(path, 'artisan')):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    return path
+
+
+def _build(args, root):
+    from . import pipeline
+
+    try:
+        names = pipeline.resolve(args.stages, with_deps=not args.no_deps)
+    except KeyError as e:
+        print(f"✗ {e.args[0]} (available: {', '.join(pipeline.STAGES)})")
+        return 2
+
+    def show(result):
+        mark = {pipeline.OK: '✓', pipeline.FAILED: '✗', pipeline.SKIPPED: '•'}[result.status]
+        suffix = ' (dependency failed)' if result.status == pipeline.SKIPPED else f' ({result.seconds:.2f}s)'
+        print(f"{mark} {result.name}{suffix}")
+        for line in result.output.rstrip().splitlines():
+            print(f"   {line}" if line else '')
+
+    results = pipeline.run_graph(names, root, jobs=args.jobs, force=args.force, on_done=show)
+    failed = [r.name for r in results if r.status != pipeline.OK]
+    print(f"\n{len(results) - len(failed)}/{len(results)} stages succeeded")
+    return 1 if failed else 0
+
+
+def _graph():
+    from .pipeline import STAGES, order
+
+    for name in order(list(STAGES)):
+        stage = STAGES[name]
+        deps = f" <- {', '.join(stage.deps)}" if stage.deps else ''
+        print(f"{name:<13} {stage.module}{deps}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m toolchain', description='Project data and i18n toolchain.')
+    parser.add_argument('--root', help='project root (default: nearest directory with artisan)')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    build = commands.add_parser('build', help='run stages in dependency order')
+    build.add_argument('stages', nargs='*', help='stages to run (default: all)')
+    build.add_argument('--jobs', '-j', type=int, help='stages run at the same time (default: one per CPU)')
+    build.add_argument('--force', action='store_true', help='rebuild even when the inputs are unchanged')
+    build.add_argument('--no-deps', action='store_true', help='do not add the dependencies of the given stages')
+    commands.add_parser('graph', help='print the stage graph')
+    for name, module in TOOLS.items():
+        commands.add_parser(name, help=f'run {module}', add_help=False)
+
+    args, rest = parser.parse_known_args(argv)
+    root = os.path.abspath(args.root) if args.root else _find_root(os.getcwd())
+    if root is None:
+        print("✗ No Laravel project (artisan) found above the current directory; use --root")
+        return 2
+    # Read by toolchain.paths, which must not be imported before this point.
+    os.environ['TOOLCHAIN_ROOT'] = root
+
+    if args.command == 'build':
+        if rest:
+            parser.error(f"unrecognized arguments: {' '.join(rest)}")
+        return _build(args, root)
+    if args.command == 'graph':
+        return _graph()
+    if args.command in TOOLS:
+        return importlib.import_module(TOOLS[args.command]).main(rest)
+    parser.print_help()
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
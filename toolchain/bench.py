@@ -0,0 +1,432 @@
+"""Benchmarks for the data and i18n toolchain at scaled dataset sizes.
+
+Synthetic datasets shaped like algeria_cities.sql, cities.json /
+provinces.json and lang/php_<locale>.json are generated from a fixed seed
+at each scale (1x = today's 58 wilayas, 1541 communes and ~1000 keys per
+locale), held in memory (and written to a temporary directory for the
+cases that write files, with fsync off), and every case is timed over
+``--repeat`` runs, keeping the median and the spread around it, then run
+once more under tracemalloc for its peak memory.
+
+Wall-clock times depend on the machine, so every timed run is paired with
+a run of a fixed calibration loop (plain dict, str and json work, the
+toolchain's staple) and each case is recorded in calibration units as
+well as in seconds.
+Results can be stored as a baseline; later runs compare the units against
+it and exit non-zero when a case got slower than ``--tolerance`` by more
+than its noise floor (``--noise`` seconds, or three times the combined
+spread of both runs when that is wider) or its peak memory grew by more
+than ``--memory-tolerance``, so a CI step can fail on regressions on any
+machine:
+
+    python -m toolchain.bench --save-baseline      # record
+    python -m toolchain.bench                      # compare, exit 1 on regression
+    python -m toolchain.bench --scale 100 --case communes.parse
+"""
+import argparse
+import fnmatch
+import gc
+import io
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from . import fsutil
+from .fsutil import write_if_changed
+from .paths import BASE_PATH, LOCALES, display_path
+
+BASELINE_PATH = os.path.join(BASE_PATH, 'toolchain', 'bench_baseline.json')
+BASELINE_VERSION = 3
+SCALES = (1, 10, 100)
+DEFAULT_SCALES = (1, 10)
+# Slowdowns under this many seconds are scheduling noise, not regressions.
+NOISE = 0.05
+
+BASE_PROVINCES = 58
+BASE_COMMUNES = 1541
+BASE_KEYS = 1000
+SEED = 20251107
+
+_LATIN = ('ou', 'led', 'ain', 'bir', 'sidi', 'ben', 'el', 'ha', 'ma', 'ra', 'ta', 'zi', 'dj', 'mel',
+          'kha', 'ne', 'sa', 'bou', 'ti', 'ghr', 'am', 'mi', 'ra', 'chi', 'ya')
+_ARABIC = ('أو', 'لاد', 'عين', 'بئر', 'سيدي', 'بن', 'ال', 'حا', 'ما', 'را', 'تا', 'زي', 'ج', 'مل',
+           'خا', 'ني', 'سا', 'بو', 'تي', 'غر', 'ام', 'مي', 'ري', 'شي', 'يا')
+_WORDS = ('the', 'appointment', 'child', 'session', 'doctor', 'is', 'available', 'please', 'select',
+          'your', 'profile', 'saved', 'new', 'message', 'from', 'schedule', 'activity', 'results')
+_PLACEHOLDERS = (':attribute', ':name', ':count', '{years}', ':Date', ':MAX')
+_NAMESPACES = ('auth', 'bookings', 'chat', 'children', 'dashboard', 'doctors', 'faq', 'landing',
+               'permissions', 'roles', 'settings', 'sidebar', 'specialists', 'users', 'validation',
+               'welcome', 'about', 'activities', 'appointments', 'contact')
+
+
+def _name(rng, parts):
+    return ' '.join(''.join(rng.choice(parts) for _ in range(rng.randint(2, 3))) for _ in range(rng.randint(1, 3)))
+
+
+class Dataset:
+    """A synthetic dataset at ``scale`` written below ``root``."""
+
+    def __init__(self, scale, root):
+        self.scale = scale
+        self.root = root
+        rng = random.Random(f'{SEED}:{scale}')
+
+        self.provinces = []
+        for index in range(BASE_PROVINCES * scale):
+            code = str(index + 1).zfill(2)
+            self.provinces.append({'code': code, 'name_ar': _name(rng, _ARABIC), 'name_en': _name(rng, _LATIN).title()})
+
+        self.communes = []
+        seen = set()
+        while len(self.communes) < BASE_COMMUNES * scale:
+            province = self.provinces[len(self.communes) * len(self.provinces) // (BASE_COMMUNES * scale)]
+            name_en = _name(rng, _LATIN).title()
+            if rng.random() < 0.02:
+                name_en = name_en.replace(' ', " M'", 1)  # unescaped quote, as in the real dump
+            if (province['code'], name_en) in seen:
+                continue
+            seen.add((province['code'], name_en))
+            daira = rng.randrange(max(1, len(self.communes) // 3 + 1))
+            self.communes.append({
+                'province_code': province['code'],
+                'name_ar': _name(rng, _ARABIC) + f' {len(self.communes)}',
+                'name_en': name_en,
+                'daira_name_ar': f'دائرة {daira}',
+                'daira_name_en': f'Daira {daira}',
+            })
+
+        self.translations = {}
+        keys = [f'{rng.choice(_NAMESPACES)}.key_{i}' for i in range(BASE_KEYS * scale)]
+        slots = {key: rng.sample(_PLACEHOLDERS, rng.randint(1, 2)) if rng.random() < 0.15 else [] for key in keys}
+        for locale in LOCALES:
+            messages = {}
+            for key in keys:
+                words = [rng.choice(_WORDS) for _ in range(rng.randint(2, 9))]
+                for slot in slots[key]:
+                    words.insert(rng.randrange(len(words) + 1), slot)
+                messages[key] = ' '.join(words).capitalize()
+            self.translations[locale] = messages
+
+        # 5% changed and 5% new keys, the shape of a typical pack merge.
+        self.changes = {k: v + ' (updated)' for k, v in list(self.translations['en'].items())[::20]}
+        self.changes.update({f'bench.added_{i}': f'Added {i}' for i in range(len(self.changes))})
+
+        self.sql_path = self.path('algeria_cities.sql')
+        self.lang_dir = self.path('lang')
+        os.makedirs(self.lang_dir, exist_ok=True)
+        self._write_sql()
+        for locale, messages in self.translations.items():
+            self.write_locale(locale)
+        self.lang_text = self.locale_text('en')
+
+    def path(self, *parts):
+        return os.path.join(self.root, f'{self.scale}x', *parts)
+
+    def locale_text(self, locale):
+        return json.dumps(self.translations[locale], ensure_ascii=False, separators=(',', ':'))
+
+    def write_locale(self, locale):
+        with open(os.path.join(self.lang_dir, f'php_{locale}.json'), 'w', encoding='utf-8') as f:
+            f.write(self.locale_text(locale))
+
+    def _write_sql(self):
+        names = {p['code']: p for p in self.provinces}
+        columns = ('id,commune_name,commune_name_ascii,daira_name,daira_name_ascii,'
+                   'wilaya_code,wilaya_name,wilaya_name_ascii')
+        os.makedirs(os.path.dirname(self.sql_path), exist_ok=True)
+        lines = ['CREATE TABLE IF NOT EXISTS algeria_cities(\n', '  id INTEGER NOT NULL PRIMARY KEY\n', ');\n', '\n']
+        for index, c in enumerate(self.communes, 1):
+            province = names[c['province_code']]
+            values = (c['name_ar'], c['name_en'], c['daira_name_ar'], c['daira_name_en'],
+                      c['province_code'], province['name_ar'], province['name_en'])
+            quoted = ','.join(f"'{v}'" for v in values)
+            lines.append(f'INSERT INTO algeria_cities({columns}) VALUES ({index},{quoted});\n')
+        # The communes cases parse these lines, so they never time disk reads.
+        self.sql_lines = lines
+        with open(self.sql_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+
+    def sizes(self):
+        return {'provinces': len(self.provinces), 'communes': len(self.communes),
+                'keys': len(self.translations['en']), 'sql_bytes': os.path.getsize(self.sql_path)}
+
+
+def _case_communes_parse(ds):
+    from .communes import parse_communes
+    return lambda: sum(1 for _ in parse_communes(ds.sql_lines))
+
+
+def _case_communes_convert(ds):
+    from .communes import parse_communes, write_cities
+    return lambda: write_cities(parse_communes(ds.sql_lines), io.StringIO())
+
+
+def _case_seeds_encode(ds):
+    from .seeds import encode_artifact, resolve_rows
+    codes = {p['code'] for p in ds.provinces}
+    return lambda: encode_artifact(resolve_rows(ds.communes, codes)[0], '0' * 40)
+
+
+def _fresh_dirs(ds, name):
+    """A new empty output directory per call, so repeats never time a no-op rewrite."""
+    for run in itertools.count():
+        path = ds.path(f'{name}.{run}')
+        os.makedirs(path)
+        yield path
+
+
+def _case_hierarchy_build(ds):
+    from .hierarchy import build_shards
+    dirs = _fresh_dirs(ds, 'locations')
+    return lambda: build_shards(ds.communes, ds.provinces, next(dirs))
+
+
+def _case_search_build(ds):
+    from .search import build_index, encode_index
+    return lambda: encode_index(build_index(ds.communes))
+
+
+def _case_search_query(ds):
+    from .search import LocationIndex, build_index
+    index = LocationIndex(build_index(ds.communes))
+    rng = random.Random(SEED)
+    queries = [rng.choice(ds.communes)['name_en'][:rng.randint(3, 8)] for _ in range(100)]
+    return lambda: [index.search(q) for q in queries]
+
+
+def _case_reconcile_match(ds):
+    from .reconcile import reconcile
+    rng = random.Random(SEED)
+    curated = [dict(c, name_en=c['name_en'][:-1]) for c in rng.sample(ds.communes, 130)]
+    return lambda: reconcile(curated, ds.communes)
+
+
+def _case_translations_merge(ds):
+    from .translations import merge_locale
+
+    def run():
+        result = merge_locale('en', ds.changes, ds.lang_dir)
+        ds.write_locale('en')
+        return result
+    return run
+
+
+def _case_jsonpatch_patch(ds):
+    from .jsonpatch import patch_text
+    return lambda: patch_text(ds.lang_text, ds.changes)
+
+
+def _case_jsonlint_lint(ds):
+    from .jsonlint import lint_text
+    broken = ds.lang_text[:-1] + ',}'  # forces the diagnostic scanner
+    return lambda: (lint_text(ds.lang_text), lint_text(broken))
+
+
+def _case_bundles_build(ds):
+    from .bundles import build_bundles
+    dirs = _fresh_dirs(ds, 'public-lang')
+    return lambda: build_bundles(ds.translations, next(dirs))
+
+
+def _case_messages_compile(ds):
+    from .messages import check_placeholders, compile_messages
+    return lambda: ([compile_messages(m) for m in ds.translations.values()], check_placeholders(ds.translations))
+
+
+def _case_locstore_load(ds):
+    from .locstore import LocationStore
+    path = ds.path('locations.snapshot')
+    with open(path, 'wb') as f:
+        f.write(LocationStore.from_records(ds.communes).encode())
+
+    def run():
+        with LocationStore.load(path) as store:
+            return [store.value(row, 'name_en') for row in store.province_rows('01')]
+    return run
+
+
+CASES = {
+    'communes.parse': _case_communes_parse,
+    'communes.convert': _case_communes_convert,
+    'seeds.encode': _case_seeds_encode,
+    'hierarchy.build': _case_hierarchy_build,
+    'search.build': _case_search_build,
+    'search.query': _case_search_query,
+    'locstore.load': _case_locstore_load,
+    'reconcile.match': _case_reconcile_match,
+    'translations.merge': _case_translations_merge,
+    'jsonpatch.patch': _case_jsonpatch_patch,
+    'jsonlint.lint': _case_jsonlint_lint,
+    'bundles.build': _case_bundles_build,
+    'messages.compile': _case_messages_compile,
+}
+
+
+def _timed(run):
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def measure(run, repeat=5):
+    """``(seconds, units, spread, peak_bytes)`` of ``run()``.
+
+    Every timed run directly follows a run of the calibration loop, so a
+    machine that speeds up or slows down mid-benchmark shifts both alike.
+    ``seconds`` is the median time, ``units`` the median of the per-run
+    ratios to the calibration loop and ``spread`` their median absolute
+    deviation.
+    """
+    times = []
+    ratios = []
+    for _ in range(repeat):
+        calibration = _timed(_calibration_workload)
+        elapsed = _timed(run)
+        times.append(elapsed)
+        ratios.append(elapsed / calibration)
+    units = statistics.median(ratios)
+    spread = statistics.median(abs(r - units) for r in ratios)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), units, spread, peak
+
+
+def _calibration_workload():
+    messages = {f'ns{i % 20}.key_{i}': f'Message number {i} for :name' for i in range(20000)}
+    text = json.dumps(messages, ensure_ascii=False)
+    parsed = json.loads(text)
+    chunks = {}
+    for key, value in sorted(parsed.items()):
+        chunks.setdefault(key.partition('.')[0], {})[key] = value.lower().split(' ')
+    return len(chunks)
+
+
+def calibrate(repeat=7):
+    """Median time of the fixed calibration loop on this machine, in seconds."""
+    return statistics.median(_timed(_calibration_workload) for _ in range(repeat))
+
+
+def run_benchmarks(scales, patterns=None, repeat=5, on_result=None):
+    """``{"<case>@<scale>x": {"seconds", "units", "spread", "peak_bytes"}}`` for every selected case."""
+    names = [n for n in CASES if not patterns or any(fnmatch.fnmatch(n, p) for p in patterns)]
+    results = {}
+    fsync, fsutil.FSYNC = fsutil.FSYNC, False
+    try:
+        with tempfile.TemporaryDirectory(prefix='toolchain-bench-') as root:
+            for scale in scales:
+                dataset = Dataset(scale, root)
+                for name in names:
+                    seconds, units, spread, peak = measure(CASES[name](dataset), repeat)
+                    key = f'{name}@{scale}x'
+                    results[key] = {'seconds': round(seconds, 6), 'units': round(units, 4),
+                                    'spread': round(spread, 4), 'peak_bytes': peak}
+                    if on_result:
+                        on_result(key, results[key], dataset)
+    finally:
+        fsutil.FSYNC = fsync
+    return results
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('results', {}) if data.get('version') == BASELINE_VERSION else {}
+
+
+def save_baseline(results, calibration, path=BASELINE_PATH, merge=True):
+    merged = dict(load_baseline(path)) if merge else {}
+    merged.update(results)
+    data = {'version': BASELINE_VERSION, 'calibration_seconds': round(calibration, 6),
+            'results': dict(sorted(merged.items()))}
+    return write_if_changed(path, (json.dumps(data, indent=2) + '\n').encode('utf-8'))
+
+
+def regressions(results, baseline, calibration, tolerance=0.5, memory_tolerance=0.25, noise=NOISE):
+    """``[(key, message), ...]`` for results worse than ``baseline``.
+
+    Times are compared in calibration units. A slowdown only counts when it
+    exceeds the noise floor: ``noise`` seconds on this machine, or three
+    times the spread of both runs when that is wider.
+    """
+    found = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        slower = result['units'] - base['units']
+        floor = max(noise / calibration, 3 * (result.get('spread', 0) + base.get('spread', 0)))
+        if slower > floor and result['units'] > base['units'] * (1 + tolerance):
+            found.append((key, f"{base['units']:.2f} -> {result['units']:.2f} calibration units "
+                               f"({result['seconds'] * 1000:.1f} ms here)"))
+        if result['peak_bytes'] > base['peak_bytes'] * (1 + memory_tolerance):
+            found.append((key, f"peak {base['peak_bytes'] // 1024} KB -> {result['peak_bytes'] // 1024} KB"))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the toolchain on synthetic datasets.')
+    parser.add_argument('--scale', type=int, action='append', choices=SCALES, dest='scales',
+                        help='dataset scale (repeatable, default: 1 and 10)')
+    parser.add_argument('--case', action='append', dest='cases', help='glob of cases to run (repeatable)')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case (the median is kept)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed slowdown (0.5 = 50%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.25, help='allowed peak memory growth')
+    parser.add_argument('--noise', type=float, default=NOISE, help='ignore slowdowns below this many seconds')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    scales = args.scales or list(DEFAULT_SCALES)
+    calibration = calibrate()
+    reported = set()
+    if not args.json:
+        print(f"calibration loop: {calibration * 1000:.1f} ms")
+
+    def show(key, result, dataset):
+        if args.json:
+            return
+        if dataset.scale not in reported:
+            reported.add(dataset.scale)
+            sizes = ', '.join(f'{k}={v}' for k, v in dataset.sizes().items())
+            print(f"\n{dataset.scale}x ({sizes})")
+        base = baseline.get(key)
+        change = f"  ({(result['units'] / base['units'] - 1) * 100:+.0f}%)" if base and base['units'] else ''
+        print(f"   {key.split('@')[0]:<20} {result['seconds'] * 1000:9.1f} ms {result['units']:9.2f} units  "
+              f"{result['peak_bytes'] / 1024:9.0f} KB peak{change}")
+
+    results = run_benchmarks(scales, args.cases, args.repeat, show)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.save_baseline:
+        save_baseline(results, calibration, args.baseline)
+        print(f"\n✓ Saved baseline: {display_path(args.baseline)} ({len(results)} results)")
+        return 0
+
+    found = regressions(results, baseline, calibration, args.tolerance, args.memory_tolerance, args.noise)
+    for key, message in found:
+        print(f"✗ regression {key}: {message}")
+    if baseline and not found and not args.json:
+        print(f"\n✓ No regressions against {display_path(args.baseline)}")
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Content-hash build cache shared by the data generators.
+
+Every stage records the sha1 of its inputs and of the outputs it produced
+in storage/framework/toolchain/build-cache.json. On the next run the stage
+is skipped when the inputs hash the same and the outputs are still exactly
+what it wrote, so nothing is recomputed and no file (or mtime) changes.
+File hashes are memoized by (size, mtime) so a no-op run only stats files.
+Saving merges with whatever other processes saved meanwhile, so stages can
+run concurrently (see toolchain.pipeline).
+
+    ran, result = run_cached('communes', [sql, __file__], [cities_json], build)
+"""
+import contextlib
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are merged but not serialized
+    fcntl = None
+
+from .fsutil import write_if_changed
+from .paths import CACHE_DIR, display_path
+
+CACHE_VERSION = 1
+CACHE_PATH = os.path.join(CACHE_DIR, 'build-cache.json')
+
+
+class BuildCache:
+    def __init__(self, data=None, path=CACHE_PATH):
+        data = data if data and data.get('version') == CACHE_VERSION else {}
+        self.stages = data.get('stages', {})
+        self.files = data.get('files', {})
+        self.path = path
+        self._lock = threading.Lock()
+        self._touched = set()
+
+    @classmethod
+    def load(cls, path=CACHE_PATH):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f), path)
+        except (OSError, ValueError):
+            return cls(path=path)
+
+    def save(self):
+        """Write the stages recorded or forgotten here on top of the file's current content."""
+        with _locked(self.path + '.lock'):
+            current = BuildCache.load(self.path)
+            with self._lock:
+                stages = dict(current.stages)
+                for stage in self._touched:
+                    if stage in self.stages:
+                        stages[stage] = self.stages[stage]
+                    else:
+                        stages.pop(stage, None)
+                files = dict(current.files, **self.files)
+                data = {'version': CACHE_VERSION, 'stages': stages, 'files': files}
+                encoded = json.dumps(data, ensure_ascii=False, indent=1, sort_keys=True).encode('utf-8')
+            return write_if_changed(self.path, encoded)
+
+    def digest(self, path):
+        """sha1 of ``path`` (None when missing), reusing the memo while size and mtime match."""
+        key = display_path(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            memo = self.files.get(key)
+        if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            return memo[2]
+
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                sha1.update(block)
+        digest = sha1.hexdigest()
+        with self._lock:
+            self.files[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def fingerprint(self, paths):
+        return {display_path(p): self.digest(p) for p in sorted(set(paths))}
+
+    def is_fresh(self, stage, inputs, outputs, params=None):
+        with self._lock:
+            recorded = self.stages.get(stage)
+        if not recorded or recorded.get('params') != params:
+            return False
+        if recorded['inputs'] != self.fingerprint(inputs):
+            return False
+        current = self.fingerprint(outputs)
+        return None not in current.values() and recorded['outputs'] == current
+
+    def record(self, stage, inputs, outputs, params=None):
+        entry = {'inputs': self.fingerprint(inputs), 'outputs': self.fingerprint(outputs), 'params': params}
+        with self._lock:
+            self.stages[stage] = entry
+            self._touched.add(stage)
+
+    def forget(self, stage):
+        with self._lock:
+            self.stages.pop(stage, None)
+            self._touched.add(stage)
+
+
+@contextlib.contextmanager
+def _locked(path):
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def run_cached(stage, inputs, outputs, build, params=None, force=False, cache=None, ok=None):
+    """Run ``build()`` unless ``stage`` is fresh; returns ``(ran, result)``.
+
+    ``outputs`` may be a callable evaluated after the build for stages whose
+    output names are only known afterwards. The stage is recorded only when
+    ``ok(result)`` holds (default: always); a build that raises or fails
+    the check drops its previous entry, since its outputs may be half written.
+    """
+    own_cache = cache is None
+    cache = cache or BuildCache.load()
+    resolve_outputs = outputs if callable(outputs) else (lambda: outputs)
+
+    if not force and cache.is_fresh(stage, inputs, resolve_outputs(), params):
+        return False, None
+
+    try:
+        result = build()
+        if ok is None or ok(result):
+            cache.record(stage, inputs, resolve_outputs(), params)
+        else:
+            cache.forget(stage)
+    except BaseException:
+        cache.forget(stage)
+        raise
+    finally:
+        if own_cache:
+            cache.save()
+    return True, result
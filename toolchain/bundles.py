@@ -0,0 +1,242 @@
+"""Per-namespace translation chunks for lazy loading on the frontend.
+
+Splits each flat lang/php_<locale>.json into one chunk per key namespace
+(``doctors.*``, ``contact.*``, ...) written as
+``public/lang/<locale>/<namespace>.<hash>.json`` plus a ``manifest.json``
+mapping locale -> namespace -> chunk file. Keys without a dot land in the
+``_root`` namespace. Chunk names change only when their content does, so
+they can be cached forever; chunks no longer referenced are removed.
+
+Each namespace also gets a precompiled chunk (``compiled`` in the
+manifest) with placeholder messages pre-split by toolchain.messages. The
+build fails without writing anything when a locale's placeholders differ
+from en.
+
+Keys a locale lacks are filled in from its fallback chain
+(toolchain.fallbacks, lt -> en by default) so every shipped locale is
+complete; ``--no-fallbacks`` ships the files as they are.
+
+With ``--prune-unused`` keys that toolchain.keyscan finds no reference to
+in resources/js are left out of the chunks; keys under a computed prefix
+such as `appointments.${status}` are kept.
+
+    python -m toolchain.bundles
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from . import fallbacks, keyscan
+from .buildcache import run_cached
+from .fsutil import remove_file, write_if_changed
+from .messages import check_placeholders, compile_messages
+from .paths import BASE_PATH, LANG_DIR, LOCALES, display_path, lang_file
+
+BUNDLES_DIR = os.path.join(BASE_PATH, 'public', 'lang')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 2
+ROOT_NAMESPACE = '_root'
+
+
+def namespace_of(key):
+    head, dot, _ = key.partition('.')
+    return head if dot and head else ROOT_NAMESPACE
+
+
+def split_namespaces(translations):
+    chunks = {}
+    for key, value in translations.items():
+        chunks.setdefault(namespace_of(key), {})[key] = value
+    return chunks
+
+
+def encode_chunk(chunk):
+    return json.dumps(chunk, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def content_hash(data, length=10):
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def build_locale(locale, translations, out_dir=BUNDLES_DIR):
+    """Write one locale's chunks; returns ``(manifest_entry, written_paths)``."""
+    entry = {}
+    written = []
+    for namespace, chunk in sorted(split_namespaces(translations).items()):
+        data = encode_chunk(chunk)
+        rel = f'{locale}/{namespace}.{content_hash(data)}.json'
+        path = os.path.join(out_dir, rel)
+        if write_if_changed(path, data):
+            written.append(path)
+        compiled = encode_chunk(compile_messages(chunk))
+        compiled_rel = f'{locale}/{namespace}.compiled.{content_hash(compiled)}.json'
+        if write_if_changed(os.path.join(out_dir, compiled_rel), compiled):
+            written.append(os.path.join(out_dir, compiled_rel))
+        entry[namespace] = {'file': rel, 'compiled': compiled_rel, 'keys': len(chunk), 'bytes': len(data)}
+    return entry, written
+
+
+def load_manifest(out_dir=BUNDLES_DIR):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'locales': {}}
+
+
+def prune(out_dir, manifest, locales):
+    """Delete chunk files of ``locales`` the manifest no longer references."""
+    referenced = {os.path.normpath(c[field]) for ns in manifest['locales'].values()
+                  for c in ns.values() for field in ('file', 'compiled')}
+    removed = []
+    for locale in locales:
+        locale_dir = os.path.join(out_dir, locale)
+        if not os.path.isdir(locale_dir):
+            continue
+        for name in os.listdir(locale_dir):
+            rel = os.path.normpath(os.path.join(locale, name))
+            if name.endswith('.json') and rel not in referenced:
+                remove_file(os.path.join(locale_dir, name))
+                removed.append(rel)
+    return removed
+
+
+def load_translations(locale, lang_dir=LANG_DIR):
+    with open(lang_file(locale, lang_dir), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_bundles(sources, out_dir=BUNDLES_DIR):
+    """Build chunks for ``sources`` ({locale: {key: text}}) and update the manifest.
+
+    Locales not in ``sources`` keep their existing manifest entries.
+    """
+    manifest = load_manifest(out_dir)
+    written = []
+    for locale, translations in sources.items():
+        entry, locale_written = build_locale(locale, translations, out_dir)
+        manifest['locales'][locale] = entry
+        written.extend(locale_written)
+
+    data = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8') + b'\n'
+    if write_if_changed(os.path.join(out_dir, MANIFEST_NAME), data):
+        written.append(os.path.join(out_dir, MANIFEST_NAME))
+    removed = prune(out_dir, manifest, sources)
+    return manifest, written, removed
+
+
+def output_files(out_dir=BUNDLES_DIR, locales=None):
+    """The manifest plus every chunk it lists (for ``locales``, default all)."""
+    manifest = load_manifest(out_dir)
+    files = [os.path.join(out_dir, MANIFEST_NAME)]
+    for locale, entry in manifest['locales'].items():
+        if locales is None or locale in locales:
+            files.extend(os.path.join(out_dir, c[field]) for c in entry.values() for field in ('file', 'compiled'))
+    return files
+
+
+def shipped_messages(sources, locales, overrides=None, usage=None, log=print):
+    """The messages shipped for ``locales`` out of ``sources`` ({locale: messages}).
+
+    With ``overrides`` (``{}`` for the default chains) fallback chains are
+    resolved and the report is written; ``None`` ships the files as they
+    are. With a keyscan ``usage`` unreferenced keys are dropped.
+    """
+    if overrides is not None:
+        sources, provenance = fallbacks.resolve(sources, locales, overrides)
+        fallbacks.write_report(fallbacks.build_report(sources, provenance, overrides))
+        for locale, borrowed in provenance.items():
+            if borrowed:
+                chain = ' → '.join(fallbacks.chain_for(locale, overrides)[1:])
+                log(f"• {locale}: {len(borrowed)} keys filled in from {chain}")
+    else:
+        sources = {l: m for l, m in sources.items() if l in locales}
+
+    if usage is not None:
+        for locale, translations in sources.items():
+            sources[locale] = usage.filter(translations)
+            log(f"• {locale}: {len(translations) - len(sources[locale])} unused keys pruned")
+    return sources
+
+
+def _build(args, locales, overrides):
+    sources = {}
+    failed = False
+    for locale in fallbacks.required_locales(locales, overrides) if args.fallbacks else locales:
+        try:
+            sources[locale] = load_translations(locale, args.lang_dir)
+        except FileNotFoundError:
+            print(f"• {display_path(lang_file(locale, args.lang_dir))} not found, skipping {locale}")
+        except ValueError as e:
+            failed = True
+            print(f"✗ Error reading {display_path(lang_file(locale, args.lang_dir))}: {e}")
+
+    for key, locale, missing, extra in check_placeholders(sources):
+        failed = True
+        details = ', '.join([f"missing :{n}" for n in missing] + [f"unexpected :{n}" for n in extra])
+        print(f"✗ {display_path(lang_file(locale, args.lang_dir))} {key}: {details}")
+    if failed:
+        # Nothing is written, so the previous chunks and manifest stay consistent.
+        print(f"\n✗ {display_path(args.out_dir)} left unchanged")
+        return 1
+
+    usage = keyscan.scan(args.sources)[0] if args.prune_unused else None
+    sources = shipped_messages(sources, locales, overrides if args.fallbacks else None, usage)
+    manifest, written, removed = build_bundles(sources, args.out_dir)
+    for locale in sources:
+        entry = manifest['locales'][locale]
+        total = sum(c['bytes'] for c in entry.values())
+        print(f"✓ {locale}: {len(entry)} namespaces, {total} bytes")
+    print(f"\n{len(written)} files written, {len(removed)} stale chunks removed -> {display_path(args.out_dir)}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Split locale bundles into content-hashed namespace chunks.')
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--out-dir', default=BUNDLES_DIR)
+    parser.add_argument('--locale', action='append', dest='locales', help='limit to a locale (repeatable)')
+    parser.add_argument('--prune-unused', action='store_true', help='drop keys resources/js never references')
+    parser.add_argument('--sources', default=keyscan.SOURCES_DIR, help='frontend sources scanned by --prune-unused')
+    parser.add_argument('--no-fallbacks', dest='fallbacks', action='store_false',
+                        help='ship each locale as is instead of filling in keys from its fallback chain')
+    parser.add_argument('--chain', action='append', metavar='LOCALE=FALLBACK,...', help='custom fallback chain')
+    parser.add_argument('--force', action='store_true', help='rebuild even when the locale files are unchanged')
+    args = parser.parse_args(argv)
+
+    try:
+        overrides = fallbacks.parse_chains(args.chain)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+    locales = args.locales or list(LOCALES)
+    needed = fallbacks.required_locales(locales, overrides) if args.fallbacks else locales
+    inputs = [lang_file(locale, args.lang_dir) for locale in needed] + [__file__, fallbacks.__file__]
+    if args.prune_unused:
+        inputs += keyscan.discover_sources(args.sources) + [keyscan.__file__]
+    ran, result = run_cached(
+        f'bundles:{display_path(args.out_dir)}',
+        inputs,
+        lambda: output_files(args.out_dir, locales),
+        lambda: _build(args, locales, overrides),
+        params={
+            'locales': locales,
+            'prune_unused': args.prune_unused,
+            'fallbacks': overrides if args.fallbacks else None,
+        },
+        force=args.force,
+        ok=lambda code: code == 0,
+    )
+    if not ran:
+        print(f"• {display_path(args.out_dir)} is up to date")
+        return 0
+    return result
+
+
+if __name__ == '__main__':
+    sys.exit(main())
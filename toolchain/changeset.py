@@ -0,0 +1,179 @@
+"""Minimal changeset between two versions of the location dataset.
+
+Rows are matched on a stable key: the province code for provinces, and
+province code + toolchain.textnorm form of ``name_ar`` for cities, so a
+re-spelled commune (hamza, tatweel, diacritics) is an update rather than
+a delete plus an insert. Only the columns AlgeriaSeeder stores are
+compared (``name_en`` falls back to ``name_ar`` as in the seeder).
+
+Writes database/seeders/data/locations.changeset.json:
+
+    {"version": 1,
+     "provinces": {"insert": [{"values": {...}}],
+                   "update": [{"key": {"code": "01"}, "set": {"name_ar": ...}}],
+                   "delete": [{"key": {"code": "59"}}]},
+     "cities":    {"insert": [...], "update": [...], "delete": [...]}}
+
+A city's ``key`` holds the exact ``name_ar`` of the old version, which is
+what the database row matches on. AlgeriaChangesetSeeder applies the file,
+touching only these rows instead of reseeding everything.
+
+By default the newest ``*.backup.<timestamp>`` of each file is the old
+version and the current file the new one:
+
+    python -m toolchain.changeset
+    python -m toolchain.changeset --old-cities a.json --new-cities b.json --summary
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+from . import textnorm
+from .buildcache import run_cached
+from .fsutil import write_if_changed
+from .paths import SEED_DATA_DIR, display_path
+from .textnorm import normalize
+
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+PROVINCES_JSON = os.path.join(SEED_DATA_DIR, 'provinces.json')
+CHANGESET_PATH = os.path.join(SEED_DATA_DIR, 'locations.changeset.json')
+CHANGESET_VERSION = 1
+
+COLUMNS = ('name_ar', 'name_en')
+
+
+def latest_backup(path):
+    """The newest ``<path>.backup.<timestamp>`` next to ``path``, or None."""
+    backups = sorted(glob.glob(glob.escape(path) + '.backup.*'))
+    return backups[-1] if backups else None
+
+
+def _province_row(p):
+    code = str(p['code']).zfill(2)
+    return (code,), {'code': code, 'name_ar': p['name_ar'], 'name_en': p.get('name_en') or p['name_ar']}
+
+
+def _city_row(c):
+    code = str(c['province_code']).zfill(2)
+    row = {'province_code': code, 'name_ar': c['name_ar'], 'name_en': c.get('name_en') or c['name_ar']}
+    return (code, normalize(c['name_ar'])), row
+
+
+def index_rows(rows, row_fn):
+    """``({key: row}, duplicates)``; later rows with an existing key are reported, not kept."""
+    indexed = {}
+    duplicates = []
+    for item in rows:
+        key, row = row_fn(item)
+        if key in indexed:
+            duplicates.append(row)
+        else:
+            indexed[key] = row
+    return indexed, duplicates
+
+
+def diff_rows(old, new, key_columns, columns=COLUMNS):
+    """Insert/update/delete lists turning ``old`` into ``new`` (both ``{key: row}``)."""
+    changes = {'insert': [], 'update': [], 'delete': []}
+    for key in sorted(new.keys() - old.keys()):
+        changes['insert'].append({'values': new[key]})
+    for key in sorted(old.keys() & new.keys()):
+        changed = {c: new[key][c] for c in columns if old[key][c] != new[key][c]}
+        if changed:
+            changes['update'].append({'key': {c: old[key][c] for c in key_columns}, 'set': changed})
+    for key in sorted(old.keys() - new.keys()):
+        changes['delete'].append({'key': {c: old[key][c] for c in key_columns}})
+    return changes
+
+
+def _load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_changeset(old_provinces, new_provinces, old_cities, new_cities):
+    """``(changeset, duplicates)``; duplicates are ``(label, row)`` dropped from either version."""
+    changeset = {'version': CHANGESET_VERSION}
+    duplicates = []
+    for name, row_fn, key_columns, old, new in (
+        ('provinces', _province_row, ('code',), old_provinces, new_provinces),
+        ('cities', _city_row, ('province_code', 'name_ar'), old_cities, new_cities),
+    ):
+        old_rows, old_dupes = index_rows(old, row_fn)
+        new_rows, new_dupes = index_rows(new, row_fn)
+        duplicates += [(f'old {name}', r) for r in old_dupes] + [(f'new {name}', r) for r in new_dupes]
+        changeset[name] = diff_rows(old_rows, new_rows, key_columns)
+    return changeset, duplicates
+
+
+def encode_changeset(changeset):
+    # One change per line keeps the file reviewable in diffs.
+    lines = ['{', f'    "version": {changeset["version"]},']
+    for t, table in enumerate(('provinces', 'cities')):
+        lines.append(f'    "{table}": {{')
+        for o, op in enumerate(('insert', 'update', 'delete')):
+            entries = [json.dumps(e, ensure_ascii=False, sort_keys=True) for e in changeset[table][op]]
+            body = ('\n' + ',\n'.join(f'            {e}' for e in entries) + '\n        ') if entries else ''
+            lines.append(f'        "{op}": [{body}]' + (',' if o < 2 else ''))
+        lines.append('    }' + (',' if t == 0 else ''))
+    lines.append('}')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff two location dataset versions into a minimal changeset.')
+    parser.add_argument('--old-provinces', help='default: newest provinces.json.backup.*')
+    parser.add_argument('--new-provinces', default=PROVINCES_JSON)
+    parser.add_argument('--old-cities', help='default: newest cities.json.backup.*')
+    parser.add_argument('--new-cities', default=CITIES_JSON)
+    parser.add_argument('--out', default=CHANGESET_PATH)
+    parser.add_argument('--summary', action='store_true', help='print the counts only, write nothing')
+    parser.add_argument('--force', action='store_true', help='rebuild even when the inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    args.old_provinces = args.old_provinces or latest_backup(args.new_provinces)
+    args.old_cities = args.old_cities or latest_backup(args.new_cities)
+    if not args.old_provinces or not args.old_cities:
+        print("✗ No previous dataset version found; pass --old-provinces and --old-cities")
+        return 1
+    inputs = [args.old_provinces, args.new_provinces, args.old_cities, args.new_cities]
+
+    def build():
+        changeset, duplicates = build_changeset(*(_load(p) for p in inputs))
+        if not args.summary:
+            write_if_changed(args.out, encode_changeset(changeset))
+        return changeset, duplicates
+
+    try:
+        if args.summary:
+            ran, result = True, build()
+        else:
+            ran, result = run_cached(
+                f'changeset:{display_path(args.out)}',
+                inputs + [__file__, textnorm.__file__], [args.out], build,
+                force=args.force,
+                ok=lambda result: not result[1],
+            )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Error building changeset: {e}")
+        return 1
+    if not ran:
+        print(f"• {display_path(args.out)} is up to date")
+        return 0
+
+    changeset, duplicates = result
+    for label, row in duplicates:
+        print(f"✗ {label}: duplicate {row['name_ar']} ({'/'.join(v for k, v in row.items() if 'code' in k)}) ignored")
+    print(f"{display_path(args.old_cities)} -> {display_path(args.new_cities)}")
+    for table in ('provinces', 'cities'):
+        counts = {op: len(changeset[table][op]) for op in ('insert', 'update', 'delete')}
+        print(f"   {table:<10} +{counts['insert']} ~{counts['update']} -{counts['delete']}")
+    if not args.summary:
+        print(f"✓ Saved: {display_path(args.out)}")
+    return 1 if duplicates else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
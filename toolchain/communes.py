@@ -0,0 +1,226 @@
+"""Streaming importer for the algeria_cities.sql commune dump.
+
+Reads the INSERT rows one statement at a time (memory stays bounded by one
+wilaya's communes) and writes database/seeders/data/cities.json with the
+daira of each commune kept alongside it:
+
+    {"province_code": "01", "name_ar": ..., "name_en": ...,
+     "daira_name_ar": ..., "daira_name_en": ...}
+
+Wilaya names are collected once into a code-indexed lookup while streaming.
+
+The dump is not strictly valid SQL: names such as 'Oued M'zi' contain
+unescaped apostrophes. A quote only closes a string when it is followed by
+``,`` or ``)``, which recovers those rows instead of dropping them.
+
+    python -m toolchain.communes
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from .buildcache import run_cached
+from .fsutil import AtomicWriter
+from .paths import COMMUNES_SQL, SEED_DATA_DIR, display_path
+
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+
+COLUMNS = ('id', 'commune_name', 'commune_name_ascii', 'daira_name', 'daira_name_ascii',
+           'wilaya_code', 'wilaya_name', 'wilaya_name_ascii')
+Commune = namedtuple('Commune', COLUMNS)
+
+_INSERT = re.compile(r'INSERT\s+INTO\s+`?(\w+)`?\s*\(([^)]*)\)\s*VALUES\s*', re.IGNORECASE)
+_STRING_PART = re.compile(r"[^'\\]+|\\.|''|'", re.DOTALL)
+_BARE_VALUE = re.compile(r'[^,)\s]+')
+_SQL_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', 'Z': '\x1a'}
+
+
+class Wilaya:
+    __slots__ = ('code', 'name_ar', 'name_en', 'communes', 'dairas')
+
+    def __init__(self, code, name_ar, name_en):
+        self.code = code
+        self.name_ar = name_ar
+        self.name_en = name_en
+        self.communes = 0
+        self.dairas = set()
+
+
+def _skip_ws(text, pos):
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _read_string(text, pos):
+    """Read a quoted literal starting at ``text[pos] == "'"``; returns (value, end)."""
+    out = []
+    pos += 1
+    while pos < len(text):
+        match = _STRING_PART.match(text, pos)
+        part = match.group()
+        pos = match.end()
+        if part == "''":
+            out.append("'")
+        elif part == "'":
+            after = _skip_ws(text, pos)
+            if after >= len(text) or text[after] in ',)':
+                return ''.join(out), pos
+            out.append("'")
+        elif part[0] == '\\':
+            out.append(_SQL_ESCAPES.get(part[1], part[1]))
+        else:
+            out.append(part)
+    raise ValueError('unterminated string literal')
+
+
+def parse_tuples(text, pos=0):
+    """Yield the value lists of ``(...), (...);`` starting at ``pos``."""
+    while True:
+        pos = _skip_ws(text, pos)
+        if pos >= len(text) or text[pos] == ';':
+            return
+        if text[pos] != '(':
+            raise ValueError(f"expected '(' at offset {pos}")
+        values = []
+        pos += 1
+        while True:
+            pos = _skip_ws(text, pos)
+            if text[pos] == "'":
+                value, pos = _read_string(text, pos)
+            else:
+                match = _BARE_VALUE.match(text, pos)
+                if not match:
+                    raise ValueError(f'expected a value at offset {pos}')
+                raw = match.group()
+                pos = match.end()
+                value = None if raw.upper() == 'NULL' else raw
+            values.append(value)
+            pos = _skip_ws(text, pos)
+            if text[pos] == ',':
+                pos += 1
+                continue
+            if text[pos] == ')':
+                pos += 1
+                break
+            raise ValueError(f"expected ',' or ')' at offset {pos}")
+        yield values
+        pos = _skip_ws(text, pos)
+        if pos < len(text) and text[pos] == ',':
+            pos += 1
+
+
+def _statements(lines):
+    buffer = []
+    for line in lines:
+        if not buffer and not line.lstrip().upper().startswith('INSERT'):
+            continue
+        buffer.append(line)
+        if line.rstrip().endswith(';'):
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def parse_communes(lines, table='algeria_cities', source=COMMUNES_SQL):
+    """Yield a ``Commune`` for every row inserted into ``table`` by the dump ``lines``."""
+    for line_no, statement in enumerate(_statements(lines), 1):
+        match = _INSERT.match(statement.lstrip())
+        if not match or match.group(1) != table:
+            continue
+        columns = [c.strip().strip('`') for c in match.group(2).split(',')]
+        try:
+            for values in parse_tuples(statement.lstrip(), match.end()):
+                row = dict(zip(columns, values))
+                yield Commune(**{c: row.get(c) for c in COLUMNS})
+        except (ValueError, IndexError) as e:
+            raise ValueError(f'{display_path(source)}: INSERT #{line_no}: {e}') from None
+
+
+def read_communes(path=COMMUNES_SQL, table='algeria_cities'):
+    """Yield a ``Commune`` for every row inserted into ``table``, in file order."""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from parse_communes(f, table, path)
+
+
+def city_record(commune):
+    return {
+        'province_code': commune.wilaya_code.zfill(2),
+        'name_ar': commune.commune_name,
+        'name_en': commune.commune_name_ascii,
+        'daira_name_ar': commune.daira_name,
+        'daira_name_en': commune.daira_name_ascii,
+    }
+
+
+def write_cities(communes, f):
+    """Write the cities.json array of ``communes`` to ``f``; returns ``(count, wilayas)``.
+
+    Communes are sorted by Arabic name within each wilaya; the dump lists
+    wilayas contiguously, so only one wilaya is ever held in memory.
+    """
+    wilayas = {}
+    count = 0
+    f.write('[')
+    for code, group in itertools.groupby(communes, key=lambda c: c.wilaya_code.zfill(2)):
+        group = sorted(group, key=lambda c: c.commune_name)
+        wilaya = wilayas.get(code)
+        if wilaya is None:
+            wilaya = wilayas[code] = Wilaya(code, group[0].wilaya_name, group[0].wilaya_name_ascii)
+        for commune in group:
+            record = json.dumps(city_record(commune), ensure_ascii=False, indent=4)
+            f.write(',\n    ' if count else '\n    ')
+            f.write(record.replace('\n', '\n    '))
+            wilaya.communes += 1
+            wilaya.dairas.add(commune.daira_name_ascii)
+            count += 1
+    f.write('\n]' if count else ']')
+    return count, wilayas
+
+
+def import_communes(sql_path=COMMUNES_SQL, out_path=CITIES_JSON):
+    """Stream ``sql_path`` into ``out_path``; returns ``(count, wilayas, changed)``."""
+    writer = AtomicWriter(out_path)
+    with writer as f:
+        count, wilayas = write_cities(read_communes(sql_path), f)
+    return count, wilayas, writer.changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Regenerate cities.json from algeria_cities.sql.')
+    parser.add_argument('--sql', default=COMMUNES_SQL)
+    parser.add_argument('--out', default=CITIES_JSON)
+    parser.add_argument('--force', action='store_true', help='re-import even when the dump is unchanged')
+    args = parser.parse_args(argv)
+
+    try:
+        ran, result = run_cached(
+            f'communes:{display_path(args.out)}', [args.sql, __file__], [args.out],
+            lambda: import_communes(args.sql, args.out), force=args.force,
+        )
+    except (OSError, ValueError) as e:
+        print(f"✗ Error importing {display_path(args.sql)}: {e}")
+        return 1
+    if not ran:
+        print(f"• {display_path(args.out)} is up to date with {display_path(args.sql)}")
+        return 0
+
+    count, wilayas, changed = result
+
+    state = 'Saved' if changed else 'Unchanged'
+    print(f"✓ {state}: {display_path(args.out)} ({count} communes)")
+    print(f"\n📊 Cities per Province (Top 10):")
+    for code in sorted(wilayas)[:10]:
+        wilaya = wilayas[code]
+        print(f"   [{code}] {wilaya.name_en}: {wilaya.communes} communes, {len(wilaya.dairas)} dairas")
+    print(f"\n✅ Total: {count} communes across {len(wilayas)} provinces")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Precompressed .gz/.br siblings for the generated public JSON assets.
+
+Every ``*.json`` under public/lang and public/locations gets
+``<file>.json.gz`` (gzip level 9) and, when the optional ``brotli``
+package is installed, ``<file>.json.br`` (quality 11) next to it, so the
+web server can send them as they are instead of compressing per request:
+
+    location ~ ^/(lang|locations)/ {
+        gzip_static on;
+        brotli_static on;     # ngx_brotli
+    }
+
+Files below ``--min-size`` (``MIN_SIZE`` bytes) are served as they are,
+and a variant that would not be smaller than its source is not kept. Each
+root gets a ``precompressed.json`` manifest of sizes (null: no variant):
+
+    {"version": 2, "min_size": 256, "files": {"en/auth.1a2b3c4d5e.json":
+        {"sha1": "...", "bytes": 2311, "gzip": 702, "br": 598}}}
+
+Files whose sha1 still matches the manifest are not recompressed (unless
+the size threshold changed), and
+siblings of deleted sources are removed. The generators write through
+toolchain.fsutil, which deletes a file's siblings whenever it rewrites or
+removes it, so between a rebuild and the next compress run the server
+falls back to the plain file rather than an outdated variant.
+
+    python -m toolchain.compress
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .fsutil import write_if_changed
+from .paths import BASE_PATH, display_path
+
+try:
+    import brotli
+except ImportError:  # optional: only the .gz variants are written
+    brotli = None
+
+ROOTS = (os.path.join(BASE_PATH, 'public', 'lang'), os.path.join(BASE_PATH, 'public', 'locations'))
+MANIFEST_NAME = 'precompressed.json'
+MANIFEST_VERSION = 2
+# Below this a compressed copy saves less than a request's headers cost.
+MIN_SIZE = 256
+ENCODINGS = (('gzip', '.gz'), ('br', '.br'))
+
+
+def compress(data, encoding):
+    if encoding == 'gzip':
+        # mtime=0 keeps the output byte-identical across builds.
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+def encodings():
+    return [(name, suffix) for name, suffix in ENCODINGS if name != 'br' or brotli is not None]
+
+
+def discover(root):
+    found = []
+    for directory, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            if name.endswith('.json') and path != os.path.join(root, MANIFEST_NAME):
+                found.append(path)
+    return found
+
+
+def compress_file(path, min_size=MIN_SIZE):
+    """Write the siblings of ``path``; returns its manifest entry."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    entry = {'sha1': hashlib.sha1(data).hexdigest(), 'bytes': len(data)}
+    for name, suffix in encodings():
+        packed = compress(data, name) if len(data) >= min_size else data
+        if len(packed) < len(data):
+            write_if_changed(path + suffix, packed)
+            entry[name] = len(packed)
+        else:
+            entry[name] = None
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+    return entry
+
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'min_size': MIN_SIZE, 'files': {}}
+
+
+def _is_current(path, entry):
+    if not entry:
+        return False
+    for name, suffix in encodings():
+        # A missing size means brotli was unavailable last time, or the file was not compressible.
+        if name not in entry or (entry[name] is not None and not os.path.exists(path + suffix)):
+            return False
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest() == entry['sha1']
+
+
+def remove_orphans(root, sources):
+    """Delete .gz/.br files whose source is gone."""
+    removed = []
+    suffixes = tuple(suffix for _, suffix in ENCODINGS)
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            if name.endswith(suffixes) and os.path.splitext(path)[0] not in sources:
+                os.unlink(path)
+                removed.append(path)
+    return removed
+
+
+def precompress(root, jobs=None, force=False, min_size=MIN_SIZE):
+    """Compress every JSON file under ``root``; returns ``(manifest, compressed, removed)``."""
+    manifest = load_manifest(root)
+    force = force or manifest.get('min_size') != min_size
+    sources = discover(root)
+    files = {}
+    stale = []
+    for path in sources:
+        rel = os.path.relpath(path, root).replace(os.sep, '/')
+        entry = manifest['files'].get(rel)
+        if not force and _is_current(path, entry):
+            files[rel] = entry
+        else:
+            stale.append((rel, path))
+
+    if len(stale) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            paths = [path for _, path in stale]
+            entries = list(pool.map(compress_file, paths, [min_size] * len(paths), chunksize=8))
+    else:
+        entries = [compress_file(path, min_size) for _, path in stale]
+    files.update((rel, entry) for (rel, _), entry in zip(stale, entries))
+
+    manifest = {'version': MANIFEST_VERSION, 'min_size': min_size, 'files': dict(sorted(files.items()))}
+    data = json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True).encode('utf-8') + b'\n'
+    write_if_changed(os.path.join(root, MANIFEST_NAME), data)
+    return manifest, len(stale), remove_orphans(root, set(sources))
+
+
+def totals(manifest):
+    sums = {'bytes': 0, 'gzip': 0, 'br': 0}
+    for entry in manifest['files'].values():
+        sums['bytes'] += entry['bytes']
+        for name, _ in ENCODINGS:
+            # Counted at the size actually served: the plain file when no variant was kept.
+            sums[name] += entry.get(name) or entry['bytes']
+    return sums
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write .gz/.br siblings and a size manifest for generated JSON assets.')
+    parser.add_argument('roots', nargs='*', default=list(ROOTS), help='directories to compress (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, help='worker processes')
+    parser.add_argument('--force', action='store_true', help='recompress files whose content is unchanged')
+    parser.add_argument('--min-size', type=int, default=MIN_SIZE, help='smaller files get no variants (bytes)')
+    args = parser.parse_args(argv)
+
+    if brotli is None:
+        print("• brotli is not installed (pip install brotli); writing .gz variants only")
+    for root in args.roots:
+        if not os.path.isdir(root):
+            print(f"• {display_path(root)} not found, skipping")
+            continue
+        try:
+            manifest, compressed, removed = precompress(root, args.jobs, args.force, args.min_size)
+        except (OSError, ValueError) as e:
+            print(f"✗ Error compressing {display_path(root)}: {e}")
+            return 1
+        sums = totals(manifest)
+        br = f", br {sums['br']}" if brotli is not None else ''
+        print(f"✓ {display_path(root)}: {len(manifest['files'])} files ({compressed} compressed, "
+              f"{len(removed)} orphans removed), {sums['bytes']} bytes -> gzip {sums['gzip']}{br}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
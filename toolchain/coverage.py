@@ -0,0 +1,206 @@
+"""Cross-locale translation key coverage index.
+
+Builds a key -> locales presence matrix for the three places translations
+live:
+
+    json        lang/php_<locale>.json
+    dysgraphia  lang/php_dysgraphia_<locale>.json
+    php         lang/<locale>/<group>.php   (keys flattened to group.key)
+
+Per-file key lists are persisted in storage/framework/toolchain/ and only
+files whose size/mtime changed are re-hashed; only files whose hash changed
+are re-parsed. Locale files that do not exist are reported as missing
+instead of failing.
+
+    python -m toolchain.coverage            # summary against en
+    python -m toolchain.coverage --check    # non-zero exit when keys are missing
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from . import phparray
+from .fsutil import write_if_changed
+from .paths import CACHE_DIR, LANG_DIR, LOCALES, display_path
+
+INDEX_VERSION = 1
+INDEX_PATH = os.path.join(CACHE_DIR, 'coverage-index.json')
+FAMILIES = ('json', 'dysgraphia', 'php')
+
+_JSON_FILE = re.compile(r'^php_(?:(?P<dysgraphia>dysgraphia)_)?(?P<locale>[A-Za-z_]+)\.json$')
+
+
+def discover_sources(lang_dir=LANG_DIR):
+    """Yield ``(path, family, locale, group)`` for every translation source."""
+    for name in sorted(os.listdir(lang_dir)):
+        path = os.path.join(lang_dir, name)
+        if os.path.isdir(path):
+            for group in sorted(os.listdir(path)):
+                if group.endswith('.php'):
+                    yield os.path.join(path, group), 'php', name, group[:-4]
+            continue
+        match = _JSON_FILE.match(name)
+        if match:
+            family = 'dysgraphia' if match.group('dysgraphia') else 'json'
+            yield path, family, match.group('locale'), None
+
+
+def parse_keys(path, family, group=None):
+    if family == 'php':
+        return sorted(phparray.flatten(phparray.load(path), group))
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError('top-level value is not an object')
+    return sorted(data)
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class CoverageIndex:
+    def __init__(self, files=None, path=INDEX_PATH):
+        self.files = files or {}
+        self.path = path
+        self.stats = {'reused': 0, 'rehashed': 0, 'parsed': 0}
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                return cls(data['files'], path)
+        except (OSError, ValueError, KeyError):
+            pass
+        return cls(path=path)
+
+    def save(self):
+        data = {'version': INDEX_VERSION, 'files': self.files}
+        return write_if_changed(self.path, json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+
+    def refresh(self, lang_dir=LANG_DIR):
+        """Bring the index in line with ``lang_dir``, parsing only what changed."""
+        seen = {}
+        for path, family, locale, group in discover_sources(lang_dir):
+            rel = display_path(path)
+            stat = os.stat(path)
+            entry = self.files.get(rel)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                self.stats['reused'] += 1
+                seen[rel] = entry
+                continue
+
+            digest = _digest(path)
+            if entry and entry['sha1'] == digest:
+                self.stats['rehashed'] += 1
+            else:
+                self.stats['parsed'] += 1
+                entry = {'family': family, 'locale': locale, 'sha1': digest, 'keys': [], 'error': None}
+                try:
+                    entry['keys'] = parse_keys(path, family, group)
+                except (OSError, ValueError) as e:
+                    entry['error'] = str(e)
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            seen[rel] = entry
+        self.files = seen
+        return self
+
+    def locales(self, family):
+        found = {e['locale'] for e in self.files.values() if e['family'] == family}
+        return list(LOCALES) + sorted(found - set(LOCALES))
+
+    def matrix(self, family):
+        """``{key: [locales that define it]}`` for one source family."""
+        presence = {}
+        for entry in self.files.values():
+            if entry['family'] != family:
+                continue
+            for key in entry['keys']:
+                presence.setdefault(key, set()).add(entry['locale'])
+        return {key: sorted(locales) for key, locales in sorted(presence.items())}
+
+    def errors(self):
+        return {path: e['error'] for path, e in sorted(self.files.items()) if e['error']}
+
+    def report(self, reference='en'):
+        """Per family and locale: defined/missing keys relative to ``reference``."""
+        summary = {}
+        for family in FAMILIES:
+            matrix = self.matrix(family)
+            present_locales = {e['locale'] for e in self.files.values() if e['family'] == family}
+            if not present_locales:
+                continue
+            expected = [k for k, locales in matrix.items() if reference in locales]
+            family_summary = {}
+            for locale in self.locales(family):
+                if locale == reference:
+                    continue
+                if locale not in present_locales:
+                    family_summary[locale] = {'file_missing': True, 'missing': expected, 'extra': []}
+                    continue
+                family_summary[locale] = {
+                    'file_missing': False,
+                    'missing': [k for k in expected if locale not in matrix[k]],
+                    'extra': [k for k, locales in matrix.items() if locale in locales and reference not in locales],
+                }
+            summary[family] = {'reference_keys': len(expected), 'locales': family_summary}
+        return summary
+
+
+def build_index(lang_dir=LANG_DIR, index_path=INDEX_PATH):
+    index = CoverageIndex.load(index_path).refresh(lang_dir)
+    index.save()
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report translation key coverage across locales.')
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--index', default=INDEX_PATH, help='where the cached index is stored')
+    parser.add_argument('--reference', default='en', help='locale other locales are compared against')
+    parser.add_argument('--family', choices=FAMILIES, action='append', help='limit to a source family')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    parser.add_argument('--verbose', '-v', action='store_true', help='list missing keys')
+    parser.add_argument('--check', action='store_true', help='exit non-zero on missing keys or unreadable files')
+    args = parser.parse_args(argv)
+
+    index = build_index(args.lang_dir, args.index)
+    summary = {f: s for f, s in index.report(args.reference).items() if not args.family or f in args.family}
+    errors = index.errors()
+
+    if args.json:
+        print(json.dumps({'errors': errors, 'coverage': summary}, ensure_ascii=False, indent=2))
+    else:
+        for path, error in errors.items():
+            print(f"✗ {path}: {error}")
+        for family, family_summary in summary.items():
+            total = family_summary['reference_keys']
+            print(f"\n{family} ({total} {args.reference} keys)")
+            for locale, info in family_summary['locales'].items():
+                missing = len(info['missing'])
+                if info['file_missing']:
+                    print(f"   ✗ {locale}: no file")
+                    continue
+                mark = '✓' if not missing else '✗'
+                covered = total - missing
+                percent = 100.0 * covered / total if total else 100.0
+                extra = f", {len(info['extra'])} not in {args.reference}" if info['extra'] else ''
+                print(f"   {mark} {locale}: {covered}/{total} ({percent:.1f}%){extra}")
+                if args.verbose:
+                    for key in info['missing']:
+                        print(f"      - {key}")
+        stats = index.stats
+        print(f"\nindex: {stats['parsed']} parsed, {stats['rehashed']} rehashed, {stats['reused']} reused")
+
+    incomplete = any(info['missing'] for s in summary.values() for info in s['locales'].values())
+    return 1 if args.check and (incomplete or errors) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Resolve locale fallback chains at build time.
+
+Every locale falls back to ``FALLBACK_LOCALE`` (en, as in config/app.php),
+a regional locale such as fr_CA to its base locale first;
+``--chain lt=fr,en`` sets a longer chain. The chain of each fallback is
+followed in turn (lt=fr with fr=ar gives lt → fr → ar → en), and a locale
+already in the chain is not visited again, so cycles end. Resolving fills each locale's
+missing keys from the first locale of its chain that has them, so the
+shipped bundles are complete and a runtime lookup is a single map hit.
+
+toolchain.bundles resolves chains before splitting chunks and writes the
+provenance of every filled-in key to
+storage/framework/toolchain/fallback-report.json:
+
+    {"version": 1, "chains": {"lt": ["lt", "en"]},
+     "locales": {"lt": {"keys": 944, "own": 610, "from": {"en": ["about.title", ...]}}}}
+
+This module prints the same report without building anything:
+
+    python -m toolchain.fallbacks            # per locale: own vs borrowed keys
+    python -m toolchain.fallbacks -v         # list the borrowed keys
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+from .fsutil import write_if_changed
+from .paths import CACHE_DIR, FALLBACK_LOCALE, LANG_DIR, LOCALES, display_path, lang_file
+
+REPORT_PATH = os.path.join(CACHE_DIR, 'fallback-report.json')
+REPORT_VERSION = 1
+
+
+def parse_chains(specs):
+    """``['lt=fr,en', ...]`` -> ``{'lt': ['fr', 'en']}``."""
+    chains = {}
+    for spec in specs or ():
+        locale, sep, rest = spec.partition('=')
+        if not sep or not locale.strip():
+            raise ValueError(f'bad fallback chain {spec!r}, expected LOCALE=FALLBACK[,FALLBACK...]')
+        chains[locale.strip()] = [l.strip() for l in rest.split(',') if l.strip()]
+    return chains
+
+
+def base_locale(locale):
+    """``fr_CA``/``fr-CA`` -> ``fr``; None for a locale without a region."""
+    base = re.split(r'[_-]', locale, 1)[0]
+    return base if base != locale else None
+
+
+def chain_for(locale, overrides=None):
+    """``[locale, fallbacks..., FALLBACK_LOCALE]`` without repeats.
+
+    A locale's fallbacks are its override, else its base locale; each
+    fallback contributes its own chain before the next one.
+    """
+    overrides = overrides or {}
+    chain = []
+    pending = [locale, FALLBACK_LOCALE]
+    while pending:
+        current = pending.pop(0)
+        if current in chain:
+            continue
+        chain.append(current)
+        base = base_locale(current)
+        pending[:0] = overrides.get(current, [base] if base else [])
+    return chain
+
+
+def required_locales(locales, overrides=None):
+    """Every locale whose file is needed to resolve ``locales``."""
+    return list(dict.fromkeys(l for locale in locales for l in chain_for(locale, overrides)))
+
+
+def dependents(changed, locales, overrides=None):
+    """The locales among ``locales`` whose resolved bundle depends on any of ``changed``."""
+    return [l for l in locales if set(chain_for(l, overrides)) & set(changed)]
+
+
+def resolve(sources, locales=None, overrides=None):
+    """``(resolved, provenance)`` for ``locales`` (default: every locale in ``sources``).
+
+    ``sources`` maps locale -> its own messages; chain locales without a
+    source are skipped. ``provenance[locale]`` maps each borrowed key to the
+    locale it came from.
+    """
+    resolved = {}
+    provenance = {}
+    for locale in locales or list(sources):
+        if locale not in sources:
+            continue
+        messages = {}
+        borrowed = {}
+        # Walk the chain backwards so nearer locales overwrite farther ones.
+        for source in reversed(chain_for(locale, overrides)):
+            for key, value in sources.get(source, {}).items():
+                messages[key] = value
+                if source == locale:
+                    borrowed.pop(key, None)
+                else:
+                    borrowed[key] = source
+        resolved[locale] = messages
+        provenance[locale] = borrowed
+    return resolved, provenance
+
+
+def build_report(resolved, provenance, overrides=None):
+    report = {'version': REPORT_VERSION, 'chains': {}, 'locales': {}}
+    for locale, messages in resolved.items():
+        by_source = {}
+        for key, source in sorted(provenance[locale].items()):
+            by_source.setdefault(source, []).append(key)
+        report['chains'][locale] = chain_for(locale, overrides)
+        report['locales'][locale] = {
+            'keys': len(messages),
+            'own': len(messages) - len(provenance[locale]),
+            'from': by_source,
+        }
+    return report
+
+
+def write_report(report, path=REPORT_PATH):
+    """Write ``report``, keeping the entries of locales it does not cover."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    if previous.get('version') == REPORT_VERSION:
+        report = {
+            'version': REPORT_VERSION,
+            'chains': dict(previous['chains'], **report['chains']),
+            'locales': dict(previous['locales'], **report['locales']),
+        }
+    data = json.dumps(report, ensure_ascii=False, indent=1, sort_keys=True).encode('utf-8') + b'\n'
+    return write_if_changed(path, data)
+
+
+def print_report(report, verbose=False):
+    for locale, info in report['locales'].items():
+        borrowed = info['keys'] - info['own']
+        chain = ' → '.join(report['chains'][locale])
+        mark = '✓' if not borrowed else '•'
+        sources = ', '.join(f"{len(keys)} from {source}" for source, keys in info['from'].items())
+        print(f"{mark} {locale} ({chain}): {info['own']}/{info['keys']} own" + (f", {sources}" if sources else ''))
+        if verbose:
+            for source, keys in info['from'].items():
+                for key in keys:
+                    print(f"   ← {source}  {key}")
+
+
+def load_sources(locales, lang_dir=LANG_DIR, log=print):
+    """``{locale: messages}`` for the locales whose file exists; unreadable files raise ValueError."""
+    sources = {}
+    for locale in locales:
+        path = lang_file(locale, lang_dir)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                sources[locale] = json.load(f)
+        except FileNotFoundError:
+            log(f"• {display_path(path)} not found, skipping {locale}")
+        except ValueError as e:
+            raise ValueError(f'{display_path(path)}: {e}')
+    return sources
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report which keys each locale borrows from its fallback chain.')
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--locale', action='append', dest='locales', help='limit to a locale (repeatable)')
+    parser.add_argument('--chain', action='append', metavar='LOCALE=FALLBACK,...', help='custom fallback chain')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    parser.add_argument('--verbose', '-v', action='store_true', help='list borrowed keys')
+    args = parser.parse_args(argv)
+
+    try:
+        overrides = parse_chains(args.chain)
+        locales = args.locales or list(LOCALES)
+        sources = load_sources(required_locales(locales, overrides), args.lang_dir)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+    report = build_report(*resolve(sources, locales, overrides), overrides)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, args.verbose)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
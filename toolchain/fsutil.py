@@ -0,0 +1,114 @@
+"""Small filesystem helpers shared by the generators."""
+import filecmp
+import os
+import tempfile
+
+# Siblings written by toolchain.compress for gzip_static/brotli_static.
+PRECOMPRESSED_SUFFIXES = ('.gz', '.br')
+# Whether finished files are fsync'd before they replace the target;
+# toolchain.bench turns it off so its timings measure the toolchain, not the disk.
+FSYNC = True
+
+
+def drop_precompressed(path):
+    """Delete the .gz/.br siblings of ``path``.
+
+    Called before ``path`` is replaced or removed, so a web server never
+    sees a precompressed copy that is older than the file itself; the
+    compress stage writes fresh ones.
+    """
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        try:
+            os.unlink(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def remove_file(path):
+    """``os.unlink`` that also removes the precompressed siblings."""
+    drop_precompressed(path)
+    os.unlink(path)
+
+
+def write_if_changed(path, data):
+    """Atomically replace ``path`` with ``data`` (bytes).
+
+    Nothing is written when the file already holds exactly ``data``, so
+    mtimes and downstream caches stay untouched. A rewrite drops stale
+    .gz/.br siblings. Returns True on write.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            if FSYNC:
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        drop_precompressed(path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+
+class AtomicWriter:
+    """Stream a file to a temp sibling and swap it in on success.
+
+    Like ``write_if_changed`` but for output too large to hold in memory:
+    when the finished temp file is byte-identical to the existing target it
+    is discarded and the target is left untouched. ``changed`` tells which
+    happened once the ``with`` block exits.
+    """
+
+    def __init__(self, path, mode='w', encoding='utf-8', newline=None):
+        self.path = path
+        self.mode = mode
+        self.encoding = None if 'b' in mode else encoding
+        self.newline = None if 'b' in mode else newline
+        self.changed = False
+        self._tmp_path = None
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(self.path)}.', suffix='.tmp')
+        self._file = os.fdopen(fd, self.mode, encoding=self.encoding, newline=self.newline)
+        return self._file
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._file.close()
+            if exc_type is None:
+                self._commit()
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.unlink(self._tmp_path)
+        return False
+
+    def _commit(self):
+        try:
+            if filecmp.cmp(self._tmp_path, self.path, shallow=False):
+                return
+            mode = os.stat(self.path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        if FSYNC:
+            with open(self._tmp_path, 'rb') as f:
+                os.fsync(f.fileno())
+        os.chmod(self._tmp_path, mode)
+        drop_precompressed(self.path)
+        os.replace(self._tmp_path, self.path)
+        self.changed = True
@@ -0,0 +1,158 @@
+"""Province -> daira -> commune hierarchy with one shard per wilaya.
+
+Reads cities.json (with the daira fields written by toolchain.communes) and
+provinces.json and writes to public/locations/:
+
+    manifest.json               provinces with names, daira/commune counts, shard file
+    <code>.<hash>.json          one province: dairas -> communes
+
+Cascading location pickers load the manifest once and then only the few KB
+of the selected province. Shard names change only with their content;
+shards no longer referenced are pruned.
+
+    python -m toolchain.hierarchy
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+from .buildcache import run_cached
+from .bundles import content_hash
+from .fsutil import remove_file, write_if_changed
+from .paths import BASE_PATH, SEED_DATA_DIR, display_path
+
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+PROVINCES_JSON = os.path.join(SEED_DATA_DIR, 'provinces.json')
+SHARDS_DIR = os.path.join(BASE_PATH, 'public', 'locations')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+_SHARD_FILE = re.compile(r'^\d+\.[0-9a-f]+\.json$')
+
+
+def build_tree(cities, provinces):
+    """``{code: {name_ar, name_en, dairas: {daira_en: {..., communes: [...]}}}}``.
+
+    Cities without a daira are grouped under a daira named after the commune
+    itself, which matches how the dump models daira seats.
+    """
+    tree = {}
+    for p in provinces:
+        code = str(p['code']).zfill(2)
+        tree[code] = {'code': code, 'name_ar': p['name_ar'], 'name_en': p['name_en'], 'dairas': {}}
+
+    for city in cities:
+        code = str(city['province_code']).zfill(2)
+        province = tree.get(code)
+        if province is None:
+            raise ValueError(f"city {city['name_ar']} references unknown province {code}")
+        daira_en = city.get('daira_name_en') or city['name_en']
+        daira = province['dairas'].setdefault(daira_en, {
+            'name_ar': city.get('daira_name_ar') or city['name_ar'],
+            'name_en': daira_en,
+            'communes': [],
+        })
+        daira['communes'].append({'name_ar': city['name_ar'], 'name_en': city['name_en']})
+    return tree
+
+
+def shard_payload(province):
+    dairas = sorted(province['dairas'].values(), key=lambda d: d['name_en'])
+    return {
+        'code': province['code'],
+        'name_ar': province['name_ar'],
+        'name_en': province['name_en'],
+        'dairas': [dict(d, communes=sorted(d['communes'], key=lambda c: c['name_en'])) for d in dairas],
+    }
+
+
+def encode(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_shards(cities, provinces, out_dir=SHARDS_DIR):
+    """Write the shards and manifest; returns ``(manifest, written, removed)``."""
+    manifest = {'version': MANIFEST_VERSION, 'provinces': {}}
+    written = []
+    for code, province in sorted(build_tree(cities, provinces).items()):
+        payload = shard_payload(province)
+        data = encode(payload)
+        name = f'{code}.{content_hash(data)}.json'
+        if write_if_changed(os.path.join(out_dir, name), data):
+            written.append(name)
+        manifest['provinces'][code] = {
+            'name_ar': province['name_ar'],
+            'name_en': province['name_en'],
+            'file': name,
+            'bytes': len(data),
+            'communes': sum(len(d['communes']) for d in payload['dairas']),
+            'dairas': len(payload['dairas']),
+        }
+
+    data = encode(manifest)
+    if write_if_changed(os.path.join(out_dir, MANIFEST_NAME), data):
+        written.append(MANIFEST_NAME)
+
+    # Other generators (e.g. the search index) share the directory; only touch shards.
+    referenced = {entry['file'] for entry in manifest['provinces'].values()}
+    removed = [name for name in os.listdir(out_dir) if _SHARD_FILE.match(name) and name not in referenced]
+    for name in removed:
+        remove_file(os.path.join(out_dir, name))
+    return manifest, written, removed
+
+
+def output_files(out_dir=SHARDS_DIR):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return [os.path.join(out_dir, MANIFEST_NAME)]
+    files = [entry['file'] for entry in manifest.get('provinces', {}).values()]
+    return [os.path.join(out_dir, name) for name in files + [MANIFEST_NAME]]
+
+
+def _build(args):
+    with open(args.cities, 'r', encoding='utf-8') as f:
+        cities = json.load(f)
+    with open(args.provinces, 'r', encoding='utf-8') as f:
+        provinces = json.load(f)
+    return build_shards(cities, provinces, args.out_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build per-province location shards and their manifest.')
+    parser.add_argument('--cities', default=CITIES_JSON)
+    parser.add_argument('--provinces', default=PROVINCES_JSON)
+    parser.add_argument('--out-dir', default=SHARDS_DIR)
+    parser.add_argument('--force', action='store_true', help='rebuild even when the inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    try:
+        ran, result = run_cached(
+            f'hierarchy:{display_path(args.out_dir)}',
+            [args.cities, args.provinces, __file__],
+            lambda: output_files(args.out_dir),
+            lambda: _build(args),
+            force=args.force,
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Error building location shards: {e}")
+        return 1
+    if not ran:
+        print(f"• {display_path(args.out_dir)} is up to date")
+        return 0
+
+    manifest, written, removed = result
+    provinces = manifest['provinces'].values()
+    sizes = sorted(p['bytes'] for p in provinces)
+    print(f"✓ {len(sizes)} province shards, {sum(p['dairas'] for p in provinces)} dairas, "
+          f"{sum(p['communes'] for p in provinces)} communes")
+    if sizes:
+        print(f"   shard size: {sizes[0]}-{sizes[-1]} bytes (median {sizes[len(sizes) // 2]})")
+    print(f"\n{len(written)} files written, {len(removed)} stale shards removed -> {display_path(args.out_dir)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""Validate (and optionally repair) the locale JSON files.
+
+Every file is first parsed with the C json decoder; only files that fail,
+or that contain duplicate keys, go through the slower diagnostic scanner,
+which keeps going past recoverable problems and reports each one with its
+line and column:
+
+    syntax          unrecoverable error (nothing after it is checked)
+    duplicate-key   key repeated in the same object (the last one wins)
+    trailing-comma  ``,`` directly before ``}`` or ``]``
+    escaped-quote   structural quote written as ``\\"`` (a string that was
+                    escaped twice, e.g. ``,\\"welcome.github\\":\\"GitHub\\"``)
+
+``--fix`` removes trailing commas, un-escapes structural quotes and drops
+the earlier copies of duplicate keys, i.e. keeps exactly what a JSON
+decoder already sees. The repaired text is re-checked and only written
+when it is clean. Files are checked in parallel worker processes.
+
+    python -m toolchain.jsonlint                 # every lang/*.json
+    python -m toolchain.jsonlint --fix lang/php_en.json
+
+As a git pre-commit hook::
+
+    git diff --cached --name-only -- 'lang/*.json' | xargs -r python -m toolchain.jsonlint
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .fsutil import write_if_changed
+from .paths import LANG_DIR, display_path
+
+Issue = namedtuple('Issue', 'line column code message fixable')
+LintResult = namedtuple('LintResult', 'path issues fixed error')
+
+_WS = re.compile(r'[ \t\n\r]*')
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?')
+_LITERALS = ('true', 'false', 'null')
+_scanstring = json.decoder.scanstring
+
+
+class _Fatal(Exception):
+    def __init__(self, pos, message):
+        super().__init__(message)
+        self.pos = pos
+        self.message = message
+
+
+def _position(text, pos):
+    line = text.count('\n', 0, pos) + 1
+    return line, pos - (text.rfind('\n', 0, pos) + 1) + 1
+
+
+class _Scanner:
+    """Recursive-descent JSON scanner that records issues and repair edits."""
+
+    def __init__(self, text):
+        self.text = text
+        self.found = []  # (pos, code, message, fixable)
+        self.edits = []  # (start, end) spans to delete
+
+    def issue(self, pos, code, message, fixable=True):
+        self.found.append((pos, code, message, fixable))
+
+    def ws(self, pos):
+        return _WS.match(self.text, pos).end()
+
+    def scan(self):
+        try:
+            pos = self.value(self.ws(0))
+            pos = self.ws(pos)
+            if pos != len(self.text):
+                raise _Fatal(pos, 'extra data after the top-level value')
+        except _Fatal as e:
+            self.issue(e.pos, 'syntax', e.message, False)
+        except RecursionError:
+            self.issue(0, 'syntax', 'nesting too deep', False)
+        return self
+
+    def string(self, pos):
+        text = self.text
+        if text.startswith('\\"', pos):
+            return self.escaped_string(pos)
+        if text[pos:pos + 1] != '"':
+            raise _Fatal(pos, 'expected a string')
+        try:
+            return _scanstring(text, pos + 1, True)
+        except json.JSONDecodeError as e:
+            raise _Fatal(e.pos, e.msg)
+
+    def escaped_string(self, pos):
+        """A ``\\"...\\"`` string; decoded as if both quotes were plain."""
+        text = self.text
+        end = pos + 2
+        while True:
+            end = text.find('\\', end)
+            if end < 0:
+                raise _Fatal(pos, 'unterminated escaped string')
+            if text.startswith('\\"', end):
+                break
+            end += 2
+        try:
+            value, _ = _scanstring(text[pos + 1:end] + '"', 1, True)
+        except json.JSONDecodeError as e:
+            raise _Fatal(pos + e.pos, e.msg)
+        self.issue(pos, 'escaped-quote', f'string {value!r} is written with escaped quotes')
+        self.edits.extend([(pos, pos + 1), (end, end + 1)])
+        return value, end + 2
+
+    def value(self, pos):
+        text = self.text
+        char = text[pos:pos + 1]
+        if char == '{':
+            return self.object(pos)
+        if char == '[':
+            return self.array(pos)
+        if char == '"' or text.startswith('\\"', pos):
+            return self.string(pos)[1]
+        for literal in _LITERALS:
+            if text.startswith(literal, pos):
+                return pos + len(literal)
+        match = _NUMBER.match(text, pos)
+        if match and match.end() > pos:
+            return match.end()
+        raise _Fatal(pos, 'expected a value' if char else 'unexpected end of file')
+
+    def object(self, pos):
+        text = self.text
+        members = []  # (key, start)
+        seen = {}
+        pos = self.ws(pos + 1)
+        if text[pos:pos + 1] == '}':
+            return pos + 1
+        while True:
+            start = pos
+            key, pos = self.string(pos)
+            pos = self.ws(pos)
+            if text[pos:pos + 1] != ':':
+                raise _Fatal(pos, "expected ':' after a key")
+            pos = self.ws(self.value(self.ws(pos + 1)))
+            if key in seen:
+                line, column = _position(text, members[seen[key]][1])
+                self.issue(start, 'duplicate-key', f'duplicate key {key!r} (first defined at {line}:{column})')
+            seen[key] = len(members)
+            members.append((key, start))
+
+            char = text[pos:pos + 1]
+            if char == '}':
+                end = pos + 1
+                break
+            if char != ',':
+                raise _Fatal(pos, "expected ',' or '}' after an object member")
+            comma = pos
+            pos = self.ws(pos + 1)
+            if text[pos:pos + 1] == '}':
+                self.issue(comma, 'trailing-comma', "trailing comma before '}'")
+                self.edits.append((comma, comma + 1))
+                end = pos + 1
+                break
+
+        # The last occurrence wins; drop each earlier one up to the next member.
+        for index, (key, start) in enumerate(members):
+            if seen[key] != index:
+                self.edits.append((start, members[index + 1][1]))
+        return end
+
+    def array(self, pos):
+        text = self.text
+        pos = self.ws(pos + 1)
+        if text[pos:pos + 1] == ']':
+            return pos + 1
+        while True:
+            pos = self.ws(self.value(pos))
+            char = text[pos:pos + 1]
+            if char == ']':
+                return pos + 1
+            if char != ',':
+                raise _Fatal(pos, "expected ',' or ']' after an array item")
+            comma = pos
+            pos = self.ws(pos + 1)
+            if text[pos:pos + 1] == ']':
+                self.issue(comma, 'trailing-comma', "trailing comma before ']'")
+                self.edits.append((comma, comma + 1))
+                return pos + 1
+
+    def issues(self):
+        issues = []
+        for pos, code, message, fixable in sorted(self.found, key=lambda f: f[0]):
+            line, column = _position(self.text, pos)
+            issues.append(Issue(line, column, code, message, fixable))
+        return issues
+
+    def repaired(self):
+        """The text with every edit applied; nested edits inside a dropped member are skipped."""
+        parts = []
+        last = 0
+        for start, end in sorted(self.edits, key=lambda e: (e[0], -e[1])):
+            if start < last:
+                continue
+            parts.append(self.text[last:start])
+            last = end
+        parts.append(self.text[last:])
+        return ''.join(parts)
+
+
+def _has_duplicates(pairs):
+    keys = [k for k, _ in pairs]
+    if len(set(keys)) != len(keys):
+        raise _Fatal(0, 'duplicate keys')
+    return pairs
+
+
+def lint_text(text):
+    """Return ``(issues, repaired_text)``; ``repaired_text`` is None when nothing can be fixed."""
+    try:
+        json.loads(text, object_pairs_hook=_has_duplicates)
+        return [], None
+    except (ValueError, _Fatal):
+        pass
+    scanner = _Scanner(text).scan()
+    issues = scanner.issues()
+    fixable = [i for i in issues if i.fixable]
+    if not fixable or len(fixable) != len(issues):
+        return issues, None
+    return issues, scanner.repaired()
+
+
+def lint_file(path, fix=False):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return LintResult(path, [], False, str(e))
+
+    issues, repaired = lint_text(text)
+    fixed = False
+    if fix and repaired is not None:
+        remaining, _ = lint_text(repaired)
+        if not remaining:
+            fixed = write_if_changed(path, repaired.encode('utf-8'))
+    return LintResult(path, issues, fixed, None)
+
+
+def default_files(lang_dir=LANG_DIR):
+    return sorted(glob.glob(os.path.join(lang_dir, '*.json')))
+
+
+def lint_files(paths, fix=False, jobs=None):
+    paths = list(paths)
+    if len(paths) < 2 or jobs == 1:
+        return [lint_file(p, fix) for p in paths]
+    with ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count() or 1, len(paths))) as pool:
+        return list(pool.map(lint_file, paths, [fix] * len(paths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate locale JSON files with precise error positions.')
+    parser.add_argument('files', nargs='*', help='files to check (default: lang/*.json)')
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--fix', action='store_true', help='repair trailing commas, escaped quotes and duplicate keys')
+    parser.add_argument('--jobs', '-j', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--quiet', '-q', action='store_true', help='only print problems')
+    args = parser.parse_args(argv)
+
+    paths = [f for f in args.files if f.endswith('.json')] if args.files else default_files(args.lang_dir)
+    failed = 0
+    for result in lint_files(paths, args.fix, args.jobs):
+        rel_path = display_path(result.path)
+        if result.error:
+            failed += 1
+            print(f"✗ {rel_path}: {result.error}")
+            continue
+        for issue in result.issues:
+            print(f"{'•' if result.fixed else '✗'} {rel_path}:{issue.line}:{issue.column}: "
+                  f"{issue.code}: {issue.message}")
+        if result.fixed:
+            print(f"✓ Repaired {rel_path} ({len(result.issues)} issues)")
+        elif result.issues:
+            failed += 1
+            hint = ' (fixable with --fix)' if all(i.fixable for i in result.issues) else ''
+            print(f"✗ {rel_path}: {len(result.issues)} issues{hint}")
+        elif not args.quiet:
+            print(f"✓ {rel_path}")
+
+    if not args.quiet:
+        print(f"\n{len(paths) - failed}/{len(paths)} files valid")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
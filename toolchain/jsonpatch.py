@@ -0,0 +1,174 @@
+"""Order-preserving, byte-preserving patches for flat JSON object files.
+
+``json.load`` + ``json.dump`` re-serializes the whole document, so changing
+one key rewrites every byte. ``patch_text`` instead locates each top-level
+member's span in the original text and splices in only the values that
+changed; new keys are appended in the file's own member/indent style and
+everything else (order, whitespace, escapes) is left exactly as it was.
+"""
+import json
+import re
+from collections import namedtuple
+
+_WS = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+Patch = namedtuple('Patch', 'text added updated removed')
+
+
+class Member:
+    __slots__ = ('key', 'start', 'key_end', 'value_start', 'value_end', 'value')
+
+    def __init__(self, key, start, key_end, value_start, value_end, value):
+        self.key = key
+        self.start = start
+        self.key_end = key_end
+        self.value_start = value_start
+        self.value_end = value_end
+        self.value = value
+
+
+def _skip_ws(text, pos):
+    return _WS.match(text, pos).end()
+
+
+def _expect(text, pos, char):
+    if text[pos:pos + 1] != char:
+        raise json.JSONDecodeError(f'Expecting {char!r}', text, pos)
+    return pos + 1
+
+
+def scan_members(text):
+    """Return ``(members, open_pos, close_pos)`` for a top-level JSON object.
+
+    ``members`` keeps document order, including duplicate keys; spans are
+    character offsets into ``text``.
+    """
+    pos = _expect(text, _skip_ws(text, 0), '{')
+    open_pos = pos - 1
+    members = []
+    pos = _skip_ws(text, pos)
+    if text[pos:pos + 1] == '}':
+        return members, open_pos, pos
+
+    while True:
+        start = pos
+        pos = _expect(text, pos, '"')
+        key, key_end = json.decoder.scanstring(text, pos)
+        pos = _expect(text, _skip_ws(text, key_end), ':')
+        value_start = _skip_ws(text, pos)
+        try:
+            value, value_end = _decoder.raw_decode(text, value_start)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError('Expecting value', text, e.pos) from None
+        members.append(Member(key, start, key_end, value_start, value_end, value))
+
+        pos = _skip_ws(text, value_end)
+        if text[pos:pos + 1] == '}':
+            if _skip_ws(text, pos + 1) != len(text):
+                raise json.JSONDecodeError('Extra data', text, _skip_ws(text, pos + 1))
+            return members, open_pos, pos
+        pos = _skip_ws(text, _expect(text, pos, ','))
+
+
+def _style(text, members):
+    """Infer the (member separator, key/value separator) the file uses."""
+    if not members:
+        return ',', ':'
+    first = members[0]
+    colon = text[first.key_end:first.value_start]
+    if len(members) > 1:
+        separator = text[first.value_end:members[1].start]
+    else:
+        # Single member: reuse its indentation, or mirror the colon spacing inline.
+        leading = text[text.rindex('{', 0, first.start) + 1:first.start]
+        separator = ',' + (leading if '\n' in leading else ' ' * colon.endswith(' '))
+    return separator, colon
+
+
+def encode(value, ensure_ascii=False):
+    return json.dumps(value, ensure_ascii=ensure_ascii)
+
+
+def patch_text(text, changes, remove=(), ensure_ascii=False):
+    """Apply ``changes`` ({key: value}) and ``remove`` (keys) to ``text``.
+
+    Returns a ``Patch`` of the new text and the added/updated/removed keys.
+    Values equal to what the file already holds are not touched; with no
+    effective change the original string is returned unchanged.
+    """
+    conflicts = set(changes) & set(remove)
+    if conflicts:
+        raise ValueError(f'keys both changed and removed: {sorted(conflicts)}')
+
+    members, open_pos, close_pos = scan_members(text)
+    # json.load keeps the last duplicate, so that is the one we patch.
+    last = {m.key: m for m in members}
+    remove = {k for k in remove if k in last}
+
+    edits = []
+    added, updated = [], []
+    for key, value in changes.items():
+        member = last.get(key)
+        if member is not None and member.value != value:
+            edits.append((member.value_start, member.value_end, encode(value, ensure_ascii)))
+            updated.append(key)
+
+    if remove:
+        # Drop each run of removed members together with one adjoining separator.
+        index = 0
+        while index < len(members):
+            if members[index].key not in remove:
+                index += 1
+                continue
+            run_end = index
+            while run_end + 1 < len(members) and members[run_end + 1].key in remove:
+                run_end += 1
+            if index > 0:
+                edits.append((members[index - 1].value_end, members[run_end].value_end, ''))
+            elif run_end + 1 < len(members):
+                edits.append((members[0].start, members[run_end + 1].start, ''))
+            else:
+                edits.append((members[0].start, members[run_end].value_end, ''))
+            index = run_end + 1
+
+    additions = [(k, v) for k, v in changes.items() if k not in last]
+    if additions:
+        separator, colon = _style(text, members)
+        remaining = any(m.key not in remove for m in members)
+        parts = []
+        for key, value in additions:
+            if remaining or parts:
+                parts.append(separator)
+            parts.append(f'{encode(key, ensure_ascii)}{colon}{encode(value, ensure_ascii)}')
+            added.append(key)
+        if members:
+            anchor = members[-1].value_end
+            edits.append((anchor, anchor, ''.join(parts)))
+        else:
+            edits.append((close_pos, close_pos, ''.join(parts)))
+
+    removed = sorted(remove)
+    if not edits:
+        return Patch(text, added, updated, removed)
+
+    out = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+        out.append(text[pos:start])
+        out.append(replacement)
+        pos = end
+    out.append(text[pos:])
+    return Patch(''.join(out), added, updated, removed)
+
+
+def patch_file(path, changes, remove=(), ensure_ascii=False):
+    """Patch a JSON file in place and return the ``Patch``; unchanged files are not written."""
+    from .fsutil import write_if_changed
+
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    patch = patch_text(text, changes, remove, ensure_ascii)
+    if patch.text is not text:
+        write_if_changed(path, patch.text.encode('utf-8'))
+    return patch
@@ -0,0 +1,202 @@
+"""Index which translation keys the frontend actually uses.
+
+Scans resources/js (*.vue, *.ts, *.js) for
+
+    calls      t('x.y'), $t(...), __(...), trans(...), wTrans(...), transChoice(...)
+    prefixes   computed keys such as `appointments.${status}`, 'faq.' + id
+               or `faq.item_${n}`, in a call or anywhere else: every key
+               starting with the prefix counts as used
+    literals   any other quoted 'a.b' string, e.g. ``titleKey: 'faq.intro_title'``
+               handed to $t(item.titleKey) later; counts as used when it
+               names a real key
+
+Calls whose key is a plain variable can't be resolved on their own; they
+are counted, and stay covered by the literal and prefix rules above.
+
+Per-file results are cached in storage/framework/toolchain/ by size and
+mtime; changed files are scanned in parallel worker processes.
+
+A key is unused when nothing above references it, and missing when a call
+names a key the reference locale file does not have.
+``toolchain.bundles --prune-unused`` drops unused keys from the shipped
+chunks.
+
+    python -m toolchain.keyscan              # summary for lang/php_en.json
+    python -m toolchain.keyscan -v --check   # list keys, exit 1 on missing keys
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .fsutil import write_if_changed
+from .paths import BASE_PATH, CACHE_DIR, LANG_DIR, display_path, lang_file
+
+SOURCES_DIR = os.path.join(BASE_PATH, 'resources', 'js')
+EXTENSIONS = ('.vue', '.ts', '.js', '.tsx')
+INDEX_PATH = os.path.join(CACHE_DIR, 'keyscan-index.json')
+INDEX_VERSION = 2
+# Below this many changed files a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 32
+
+_CALL = re.compile(
+    r'(?<![\w$])(?:\$t|t|__|trans|wTrans|transChoice|wTransChoice)\(\s*'
+    r'(?:\'((?:[^\'\\\n]|\\.)*)\'|"((?:[^"\\\n]|\\.)*)"|`((?:[^`\\]|\\.)*)`)'
+    # t('faq.' + id) calls no key of its own; _CONCAT_PREFIX takes it as a prefix.
+    r'(?!\s*\+)'
+)
+_COMPUTED_CALL = re.compile(r'(?<![\w$])(?:\$t|t|__|trans|wTrans|transChoice|wTransChoice)\(\s*[A-Za-z_$]')
+_LITERAL = re.compile(r'([\'"`])([A-Za-z0-9_-]+(?:\.[A-Za-z0-9_-]+)+)\1')
+# A dotted head, possibly ending in part of a segment: `faq.${id}`, `faq.item_${n}`.
+_TEMPLATE_PREFIX = re.compile(r'`([A-Za-z0-9_-]+(?:\.[A-Za-z0-9_-]+)*\.[A-Za-z0-9_-]*)\$\{')
+_CONCAT_PREFIX = re.compile(r'([\'"])([A-Za-z0-9_-]+(?:\.[A-Za-z0-9_-]+)*\.[A-Za-z0-9_-]*)\1\s*\+')
+
+
+def scan_text(text):
+    """``{"calls": [...], "prefixes": [...], "literals": [...], "computed": n}`` for one source file."""
+    calls, prefixes = set(), set()
+    for match in _CALL.finditer(text):
+        key = next(g for g in match.groups() if g is not None)
+        if '${' in key:
+            prefix = key.split('${', 1)[0]
+            if prefix:
+                prefixes.add(prefix)
+        elif key:
+            calls.add(key)
+    prefixes.update(m.group(1) for m in _TEMPLATE_PREFIX.finditer(text))
+    prefixes.update(m.group(2) for m in _CONCAT_PREFIX.finditer(text))
+    literals = {m.group(2) for m in _LITERAL.finditer(text)} - calls
+    return {
+        'calls': sorted(calls),
+        'prefixes': sorted(prefixes),
+        'literals': sorted(literals),
+        'computed': len(_COMPUTED_CALL.findall(text)),
+    }
+
+
+def scan_file(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return scan_text(f.read())
+
+
+def discover_sources(sources_dir=SOURCES_DIR):
+    found = []
+    for root, dirs, files in os.walk(sources_dir):
+        dirs[:] = sorted(d for d in dirs if d != 'node_modules' and not d.startswith('.'))
+        found.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(EXTENSIONS))
+    return found
+
+
+class KeyUsage:
+    """Merged scan results of every source file."""
+
+    def __init__(self, files):
+        self.files = files
+        self.calls = {}
+        self.prefixes = set()
+        self.literals = set()
+        self.computed = 0
+        for path, result in files.items():
+            for key in result['calls']:
+                self.calls.setdefault(key, []).append(path)
+            self.prefixes.update(result['prefixes'])
+            self.literals.update(result['literals'])
+            self.computed += result['computed']
+        self._prefixes = tuple(sorted(self.prefixes))
+
+    def is_used(self, key):
+        return key in self.calls or key in self.literals or key.startswith(self._prefixes)
+
+    def unused(self, keys):
+        return sorted(k for k in keys if not self.is_used(k))
+
+    def missing(self, keys):
+        return sorted(k for k in self.calls if k not in keys)
+
+    def filter(self, translations):
+        """``translations`` without the keys nothing references."""
+        return {k: v for k, v in translations.items() if self.is_used(k)}
+
+
+def scan(sources_dir=SOURCES_DIR, index_path=INDEX_PATH, jobs=None):
+    """Scan ``sources_dir`` reusing the cached index; returns ``(usage, stats)``."""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        cached = cached['files'] if cached.get('version') == INDEX_VERSION else {}
+    except (OSError, ValueError, KeyError):
+        cached = {}
+
+    files = {}
+    stale = []
+    for path in discover_sources(sources_dir):
+        key = display_path(path)
+        stat = os.stat(path)
+        entry = cached.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            files[key] = entry
+        else:
+            stale.append((key, path, stat))
+
+    paths = [path for _, path, _ in stale]
+    if len(paths) >= PARALLEL_THRESHOLD and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(scan_file, paths, chunksize=16))
+    else:
+        results = [scan_file(path) for path in paths]
+    for (key, _, stat), result in zip(stale, results):
+        files[key] = dict(result, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    data = {'version': INDEX_VERSION, 'files': dict(sorted(files.items()))}
+    write_if_changed(index_path, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    usage = KeyUsage({k: v for k, v in files.items()})
+    return usage, {'files': len(files), 'scanned': len(stale), 'reused': len(files) - len(stale)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report translation keys used, unused and missing in resources/js.')
+    parser.add_argument('--sources', default=SOURCES_DIR)
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--locale', default='en', help='locale file the keys are compared against')
+    parser.add_argument('--index', default=INDEX_PATH, help='where the cached scan index is stored')
+    parser.add_argument('--jobs', '-j', type=int, help='worker processes for changed files')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    parser.add_argument('--verbose', '-v', action='store_true', help='list unused and missing keys')
+    parser.add_argument('--check', action='store_true', help='exit non-zero when a called key is missing')
+    args = parser.parse_args(argv)
+
+    path = lang_file(args.locale, args.lang_dir)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            keys = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"✗ Error reading {display_path(path)}: {e}")
+        return 1
+
+    usage, stats = scan(args.sources, args.index, args.jobs)
+    unused = usage.unused(keys)
+    missing = usage.missing(keys)
+    if args.json:
+        print(json.dumps({
+            'unused': unused,
+            'missing': {k: usage.calls[k] for k in missing},
+            'prefixes': sorted(usage.prefixes),
+        }, ensure_ascii=False, indent=2))
+    else:
+        used = len(keys) - len(unused)
+        print(f"{'✓' if not missing else '✗'} {display_path(path)}: {used}/{len(keys)} keys used, "
+              f"{len(unused)} unused, {len(missing)} missing")
+        if args.verbose:
+            for key in unused:
+                print(f"   - unused  {key}")
+            for key in missing:
+                print(f"   ✗ missing {key}  ({', '.join(usage.calls[key][:3])})")
+        print(f"\nsources: {stats['files']} files, {stats['scanned']} scanned, {stats['reused']} cached; "
+              f"{usage.computed} calls with computed keys, {len(usage.prefixes)} key prefixes")
+    return 1 if args.check and missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
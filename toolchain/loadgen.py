@@ -0,0 +1,341 @@
+"""Deterministic synthetic data for load-testing search and booking.
+
+Streams users, provider_profiles, children and appointments as CSV bulk-
+load files in storage/app/loadgen/ (``<table>.0001.csv``, a new file
+every ``--chunk-rows`` rows), plus specializations and a manifest.json.
+The same ``--seed`` and counts always produce byte-identical files.
+
+Rows follow the real location data: each provider sits in a commune drawn
+from the seeded cities, so provinces get providers in proportion to their
+communes. Provider popularity is skewed, so a few profiles carry most of
+the appointments, as in production, and each booking sits on its
+provider's ``slot_duration`` grid. Every partner's children and
+appointments are generated together, so memory only grows with the
+number of doctors, whatever the row counts.
+
+Foreign keys are plain ids and assume an empty database seeded with
+AlgeriaSeeder only (province ids follow provinces.json, city ids follow
+cities.seed.json). Users are laid out as doctors first, then partners,
+with ``doctor<n>@loadtest.test`` / ``partner<n>@loadtest.test`` emails and
+the password "password". manifest.json lists the files, the load order
+and the SQL that assigns the roles afterwards. For SQLite (the default
+connection) load.sqlite.sql does all of it:
+
+    cd storage/app/loadgen && sqlite3 ../../../database/database.sqlite < load.sqlite.sql
+
+Elsewhere use ``LOAD DATA LOCAL INFILE ... IGNORE 1 LINES (id, name, ...)``
+(MySQL) or ``\\copy users (id, name, ...) FROM 'users.0001.csv' CSV HEADER``
+(PostgreSQL). The role SQL uses standard string literals; on MySQL double
+the backslashes in ``App\\Models\\User``.
+
+    python -m toolchain.loadgen --doctors 20000 --partners 1000000
+"""
+import argparse
+import bisect
+import csv
+import datetime
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+from .fsutil import AtomicWriter, write_if_changed
+from .paths import BASE_PATH, SEED_DATA_DIR, display_path
+
+OUT_DIR = os.path.join(BASE_PATH, 'storage', 'app', 'loadgen')
+PROVINCES_JSON = os.path.join(SEED_DATA_DIR, 'provinces.json')
+SEED_ARTIFACT = os.path.join(SEED_DATA_DIR, 'cities.seed.json')
+MANIFEST_VERSION = 1
+
+CHUNK_ROWS = 1_000_000
+# The hash Laravel's UserFactory uses for "password".
+PASSWORD_HASH = '$2y$10$92IXUNpkjO0rOQ5byMi.Ye4oKoEa3Ro9llC/.og/at2.uheWG/igi'
+EPOCH = datetime.date(2025, 1, 1)
+
+SPECIALIZATIONS = (
+    ('Dysgraphia', 'dysgraphia', 'Handwriting and fine motor skill specialists', '✍️'),
+    ('Pediatrics', 'pediatrics', 'Child health and development specialists', '👶'),
+    ('Neurology', 'neurology', 'Brain and nervous system specialists', '🧠'),
+    ('Speech Therapy', 'speech-therapy', 'Speech and language specialists', '🗣️'),
+    ('Psychology', 'psychology', 'Child psychology and learning specialists', '💬'),
+)
+# Dysgraphia specialists dominate, as in DysgraphiaSpecialistSeeder.
+SPECIALIZATION_CUM_WEIGHTS = tuple(itertools.accumulate((0.6, 0.15, 0.1, 0.1, 0.05)))
+
+FIRST_NAMES = ('Amine', 'Yacine', 'Karim', 'Sofiane', 'Walid', 'Nassim', 'Riad', 'Samir', 'Mehdi', 'Bilal',
+               'Amina', 'Fatima', 'Leila', 'Sarah', 'Imane', 'Nour', 'Yasmine', 'Meriem', 'Lina', 'Salima')
+LAST_NAMES = ('Benali', 'Boukhelkhal', 'Mansouri', 'Haddad', 'Belkacem', 'Bouzid', 'Cherif', 'Djebbar',
+              'Ferhat', 'Guerfi', 'Hamidi', 'Kaci', 'Larbi', 'Meziane', 'Ouali', 'Rahmani', 'Saadi', 'Zerrouki')
+TITLES = ('Dr.', 'Dr.', 'Dr.', 'Prof.')
+GENDERS = ('male', 'female')
+LOCALES = ('ar', 'ar', 'fr', 'en')
+STATUSES = ('pending', 'confirmed', 'completed', 'cancelled', 'no_show')
+STATUS_CUM_WEIGHTS = tuple(itertools.accumulate((0.15, 0.35, 0.35, 0.1, 0.05)))
+SLOT_MINUTES = (30, 30, 45, 60)
+# Working hours the generated bookings fall in.
+DAY_START, DAY_END = 8 * 60, 17 * 60
+
+TABLES = {
+    'users': ('id', 'name', 'email', 'email_verified_at', 'password', 'locale', 'gender',
+              'created_at', 'updated_at'),
+    'provider_profiles': ('id', 'user_id', 'province_id', 'city_id', 'specialization_id', 'title',
+                          'years_experience', 'slot_duration', 'consultation_fee', 'rating', 'total_reviews',
+                          'is_available', 'created_at', 'updated_at'),
+    'children': ('id', 'partner_id', 'name', 'date_of_birth', 'gender', 'created_at', 'updated_at'),
+    'appointments': ('id', 'provider_profile_id', 'user_id', 'child_id', 'appointment_date', 'start_time',
+                     'end_time', 'status', 'created_at', 'updated_at'),
+}
+SPECIALIZATION_COLUMNS = ('id', 'name', 'slug', 'description', 'icon', 'is_active', 'created_at', 'updated_at')
+# Foreign keys are satisfied when the tables are loaded in this order.
+LOAD_ORDER = ('specializations', 'users', 'provider_profiles', 'children', 'appointments')
+
+
+class ChunkedCsv:
+    """CSV rows split across ``<table>.0001.csv``, ``<table>.0002.csv``, ...; each file has a header."""
+
+    def __init__(self, out_dir, table, columns, chunk_rows=CHUNK_ROWS):
+        self.out_dir = out_dir
+        self.table = table
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.files = []
+        self.rows = 0
+        self._writer = None
+
+    def write(self, row):
+        if self.rows % self.chunk_rows == 0:
+            self._rotate()
+        self._csv.writerow(row)
+        self.rows += 1
+
+    def _rotate(self):
+        self.close()
+        path = os.path.join(self.out_dir, f'{self.table}.{len(self.files) + 1:04d}.csv')
+        self._writer = AtomicWriter(path, newline='')
+        self._csv = csv.writer(self._writer.__enter__(), lineterminator='\n')
+        self._csv.writerow(self.columns)
+        self.files.append(path)
+
+    def close(self, exc=None):
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.__exit__(type(exc) if exc else None, exc, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(exc)
+        return False
+
+
+def load_locations(provinces_path=PROVINCES_JSON, artifact_path=SEED_ARTIFACT):
+    """``[(province_id, city_id), ...]`` with the ids a fresh AlgeriaSeeder run assigns."""
+    with open(provinces_path, 'r', encoding='utf-8') as f:
+        province_ids = {str(p['code']).zfill(2): i for i, p in enumerate(json.load(f), 1)}
+    with open(artifact_path, 'r', encoding='utf-8') as f:
+        artifact = json.load(f)
+    rows = [row for chunk in artifact['chunks'] for row in chunk]
+    return [(province_ids[code], city_id) for city_id, (code, _, _) in enumerate(rows, 1)]
+
+
+class Calendar:
+    """Date and time strings by day offset from EPOCH, formatted once."""
+
+    def __init__(self, first_day, last_day):
+        self.first_day = first_day
+        self.dates = [str(EPOCH + datetime.timedelta(days=d)) for d in range(first_day, last_day + 1)]
+        self.clock = [f'{m // 60:02d}:{m % 60:02d}' for m in range(24 * 60)]
+
+    def date(self, day):
+        return self.dates[day - self.first_day]
+
+    def timestamp(self, day, rng):
+        return f'{self.dates[day - self.first_day]} {self.clock[rng.randrange(1440)]}:{rng.randrange(60):02d}'
+
+
+def _pick(rng, values, cum_weights):
+    return values[bisect.bisect(cum_weights, rng.random() * cum_weights[-1])]
+
+
+def _clock(minute):
+    return f'{minute // 60:02d}:{minute % 60:02d}:00'
+
+
+def day_slots(minutes):
+    """``[(start, end), ...]`` of a ``minutes`` slot grid over the working day.
+
+    Same grid as ProviderScheduleController: slots start at DAY_START every
+    ``minutes`` and the last one ends no later than DAY_END.
+    """
+    return [(_clock(m), _clock(m + minutes)) for m in range(DAY_START, DAY_END - minutes + 1, minutes)]
+
+
+def generate(out_dir, doctors, partners, children_per_partner=1.6, appointments_per_child=3.0,
+             days=365, seed=1, chunk_rows=CHUNK_ROWS, locations=None):
+    """Write every table; returns ``{table: ChunkedCsv}``."""
+    locations = locations or load_locations()
+    calendar = Calendar(-14 * 365, days)
+    profile_rng = random.Random(f'{seed}:profiles')
+    family_rng = random.Random(f'{seed}:families')
+    specializations = range(1, len(SPECIALIZATIONS) + 1)
+    writers = {table: ChunkedCsv(out_dir, table, columns, chunk_rows) for table, columns in TABLES.items()}
+    users, profiles, children, appointments = (writers[t] for t in TABLES)
+    grids = {minutes: day_slots(minutes) for minutes in set(SLOT_MINUTES)}
+    # Each provider's slot_duration, so its bookings sit on its own grid.
+    provider_slots = [None]
+    try:
+        rng = profile_rng
+        for doctor in range(1, doctors + 1):
+            created = calendar.timestamp(-rng.randrange(720), rng)
+            title = rng.choice(TITLES)
+            name = f'{title} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+            users.write((doctor, name, f'doctor{doctor}@loadtest.test', created, PASSWORD_HASH,
+                         rng.choice(LOCALES), rng.choice(GENDERS), created, created))
+            province_id, city_id = rng.choice(locations)
+            reviews = int(rng.expovariate(1 / 40))
+            specialization = _pick(rng, specializations, SPECIALIZATION_CUM_WEIGHTS)
+            years = rng.randrange(1, 35)
+            minutes = rng.choice(SLOT_MINUTES)
+            provider_slots.append(grids[minutes])
+            profiles.write((doctor, doctor, province_id, city_id, specialization, title, years,
+                            minutes, rng.randrange(15, 80) * 100,
+                            f'{rng.uniform(3.0, 5.0):.2f}' if reviews else '0.00', reviews,
+                            int(rng.random() < 0.9), created, created))
+
+        rng = family_rng
+        extra_children = 1 / max(children_per_partner - 1, 1e-9)
+        per_child = 1 / appointments_per_child if appointments_per_child > 0 else None
+        child_id = 0
+        appointment_id = 0
+        for partner in range(1, partners + 1):
+            user_id = doctors + partner
+            created_day = -rng.randrange(540)
+            created = calendar.timestamp(created_day, rng)
+            family = rng.choice(LAST_NAMES)
+            users.write((user_id, f'{rng.choice(FIRST_NAMES)} {family}', f'partner{partner}@loadtest.test', created,
+                         PASSWORD_HASH, rng.choice(LOCALES), rng.choice(GENDERS), created, created))
+            # At least one child each; the mean number of children is children_per_partner.
+            for _ in range(1 + int(rng.expovariate(extra_children))):
+                child_id += 1
+                children.write((child_id, user_id, f'{rng.choice(FIRST_NAMES)} {family}',
+                                calendar.date(-rng.randrange(4 * 365, 14 * 365)),
+                                rng.choice(GENDERS), created, created))
+                for _ in range(int(rng.expovariate(per_child) + 0.5) if per_child else 0):
+                    appointment_id += 1
+                    # Squaring skews bookings towards a popular minority of providers.
+                    provider = 1 + int(doctors * rng.random() ** 2)
+                    day = rng.randrange(days)
+                    start_time, end_time = rng.choice(provider_slots[provider])
+                    booked = calendar.timestamp(day - rng.randrange(1, 30), rng)
+                    appointments.write((appointment_id, provider, user_id, child_id, calendar.date(day),
+                                        start_time, end_time, _pick(rng, STATUSES, STATUS_CUM_WEIGHTS),
+                                        booked, booked))
+    except BaseException as e:
+        for writer in writers.values():
+            writer.close(e)
+        raise
+    for writer in writers.values():
+        writer.close()
+    return writers
+
+
+def role_sql(doctors, partners):
+    statements = []
+    for role, prefix, count in (('doctor', 'doctor', doctors), ('partner', 'partner', partners)):
+        if count:
+            statements.append(
+                "INSERT INTO model_has_roles (role_id, model_type, model_id) "
+                f"SELECT r.id, 'App\\Models\\User', u.id FROM users u JOIN roles r ON r.name = '{role}' "
+                f"WHERE u.email LIKE '{prefix}%@loadtest.test'"
+            )
+    return statements
+
+
+def sqlite_script(files, role_statements):
+    """sqlite3 shell script importing every file through a scratch table, in foreign key order.
+
+    Tables without files (``--partners 0``, ``--appointments-per-child 0``)
+    are left out, since there is nothing to import into their scratch table.
+    """
+    lines = ['.bail on', 'BEGIN;']
+    for table in LOAD_ORDER:
+        if not files[table]:
+            continue
+        scratch = f'_loadgen_{table}'
+        for i, name in enumerate(files[table]):
+            # The first file's header creates the scratch table; later files skip theirs.
+            lines.append(f".import --csv{' --skip 1' if i else ''} {name} {scratch}")
+        columns = ', '.join(SPECIALIZATION_COLUMNS if table == 'specializations' else TABLES[table])
+        lines.append(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {scratch};')
+        lines.append(f'DROP TABLE {scratch};')
+    lines.extend(f'{statement};' for statement in role_statements)
+    lines.append('COMMIT;')
+    return '\n'.join(lines) + '\n'
+
+
+def write_specializations(out_dir):
+    path = os.path.join(out_dir, 'specializations.csv')
+    writer = AtomicWriter(path, newline='')
+    with writer as f:
+        out = csv.writer(f, lineterminator='\n')
+        out.writerow(SPECIALIZATION_COLUMNS)
+        created = f'{EPOCH - datetime.timedelta(days=720)} 00:00:00'
+        out.writerows((i, *spec, 1, created, created) for i, spec in enumerate(SPECIALIZATIONS, 1))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate deterministic bulk-load CSVs for load-testing bookings.')
+    parser.add_argument('--out-dir', default=OUT_DIR)
+    parser.add_argument('--doctors', type=int, default=10_000)
+    parser.add_argument('--partners', type=int, default=100_000, help='parent accounts; each has one or more children')
+    parser.add_argument('--children-per-partner', type=float, default=1.6, help='mean, at least 1')
+    parser.add_argument('--appointments-per-child', type=float, default=3.0, help='mean')
+    parser.add_argument('--days', type=int, default=365, help=f'appointments spread over this many days from {EPOCH}')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='rows per CSV file')
+    args = parser.parse_args(argv)
+
+    if args.doctors < 1 or args.partners < 0 or args.children_per_partner < 1:
+        print("✗ Need at least one doctor, no negative partners and --children-per-partner >= 1")
+        return 1
+    try:
+        locations = load_locations()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Error reading the location data (run `python -m toolchain seeds` first?): {e}")
+        return 1
+
+    start = time.perf_counter()
+    writers = generate(args.out_dir, args.doctors, args.partners, args.children_per_partner,
+                       args.appointments_per_child, args.days, args.seed, args.chunk_rows, locations)
+    files = {table: [os.path.basename(p) for p in w.files] for table, w in writers.items()}
+    files['specializations'] = [os.path.basename(write_specializations(args.out_dir))]
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'seed': args.seed,
+        'params': {k: getattr(args, k) for k in ('doctors', 'partners', 'children_per_partner',
+                                                   'appointments_per_child', 'days', 'chunk_rows')},
+        'rows': {table: w.rows for table, w in writers.items()},
+        'columns': {table: list(columns) for table, columns in TABLES.items()},
+        'load_order': list(LOAD_ORDER),
+        'files': files,
+        'after_load': role_sql(args.doctors, args.partners),
+    }
+    write_if_changed(os.path.join(args.out_dir, 'load.sqlite.sql'),
+                     sqlite_script(files, manifest['after_load']).encode('utf-8'))
+    write_if_changed(os.path.join(args.out_dir, 'manifest.json'),
+                     json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8') + b'\n')
+
+    elapsed = time.perf_counter() - start
+    total = sum(w.rows for w in writers.values())
+    for table, w in writers.items():
+        print(f"✓ {table}: {w.rows} rows in {len(w.files)} file(s)")
+    print(f"\n{total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s) -> {display_path(args.out_dir)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
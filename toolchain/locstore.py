@@ -0,0 +1,292 @@
+"""Compact, memory-mappable location table.
+
+``LocationStore`` holds cities.json as interned strings plus one array of
+string ids per column, and a province code -> row range index, instead of
+~1,500 dicts repeating the same keys, province codes and daira names.
+It serializes to a versioned little-endian snapshot that ``load`` maps
+into memory without parsing anything; strings are decoded on first use.
+
+Snapshot layout (every section starts on a 4-byte boundary):
+
+    header       magic "TCLS", version u16, id width u16 (2 or 4), rows u32,
+                 strings u32, provinces u32, columns u32, sha1 of the source (20 bytes)
+    offsets      (strings + 1) x u32 byte offsets into the blob
+    blob         UTF-8 text of every distinct string
+    columns      per column (COLUMNS order), rows x string id
+    provinces    provinces x (code string id, first row, end row) as u32
+
+Rows are grouped by province code (stable, as cities.json already is).
+``open_store`` reuses storage/framework/toolchain/locations.snapshot while
+its source sha1 matches cities.json and rebuilds it otherwise.
+
+    python -m toolchain.locstore            # build the snapshot
+    python -m toolchain.locstore --stats    # compare with json.load
+"""
+import argparse
+import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import tracemalloc
+
+from .buildcache import run_cached
+from .fsutil import write_if_changed
+from .paths import CACHE_DIR, SEED_DATA_DIR, display_path
+
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, 'locations.snapshot')
+MAGIC = b'TCLS'
+SNAPSHOT_VERSION = 1
+COLUMNS = ('province_code', 'name_ar', 'name_en', 'daira_name_ar', 'daira_name_en')
+
+_HEADER = struct.Struct('<4sHHIIII20s')
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _pad(size):
+    return -size % 4
+
+
+class LocationStore:
+    def __init__(self, offsets, blob, columns, provinces, source_sha1, buffer=None):
+        self._offsets = offsets
+        self._blob = blob
+        self._columns = columns
+        self._decoded = [None] * (len(offsets) - 1)
+        self.provinces = provinces
+        self.source_sha1 = source_sha1
+        self._buffer = buffer
+
+    @classmethod
+    def from_records(cls, records, source_sha1=''):
+        """Build from cities.json-style dicts; missing columns become ''."""
+        records = sorted(records, key=lambda r: str(r.get('province_code', '')).zfill(2))
+        ids = {}
+        strings = []
+        blob = bytearray()
+        offsets = array.array('I', [0])
+        columns = {name: array.array('I') for name in COLUMNS}
+        for record in records:
+            for name in COLUMNS:
+                value = record.get(name) or ''
+                if name == 'province_code':
+                    value = str(value).zfill(2)
+                string_id = ids.get(value)
+                if string_id is None:
+                    string_id = ids[value] = len(strings)
+                    strings.append(value)
+                    blob += value.encode('utf-8')
+                    offsets.append(len(blob))
+                columns[name].append(string_id)
+
+        provinces = {}
+        for row, string_id in enumerate(columns['province_code']):
+            start, _ = provinces.get(strings[string_id], (row, row))
+            provinces[strings[string_id]] = (start, row + 1)
+        return cls(offsets, bytes(blob), columns, provinces, source_sha1)
+
+    def __len__(self):
+        return len(self._columns['province_code'])
+
+    def string(self, string_id):
+        value = self._decoded[string_id]
+        if value is None:
+            start, end = self._offsets[string_id], self._offsets[string_id + 1]
+            value = self._decoded[string_id] = bytes(self._blob[start:end]).decode('utf-8')
+        return value
+
+    def value(self, row, column):
+        return self.string(self._columns[column][row])
+
+    def column(self, column):
+        ids = self._columns[column]
+        return [self.string(i) for i in ids]
+
+    def row(self, row):
+        """One row as the dict cities.json has for it."""
+        return {name: self.string(ids[row]) for name, ids in self._columns.items()}
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def province_rows(self, code):
+        """``range`` of the rows in province ``code`` (empty when unknown)."""
+        return range(*self.provinces.get(str(code).zfill(2), (0, 0)))
+
+    def find(self, code, name):
+        """Row whose name_ar or name_en is exactly ``name`` in province ``code``, or None."""
+        for row in self.province_rows(code):
+            if name in (self.value(row, 'name_ar'), self.value(row, 'name_en')):
+                return row
+        return None
+
+    def encode(self):
+        strings = len(self._offsets) - 1
+        width = 'H' if strings <= 0xFFFF else 'I'
+        sha1 = bytes.fromhex(self.source_sha1) if self.source_sha1 else b'\0' * 20
+        parts = [_HEADER.pack(MAGIC, SNAPSHOT_VERSION, struct.calcsize(width), len(self), strings,
+                              len(self.provinces), len(COLUMNS), sha1)]
+
+        def section(data):
+            parts.append(data + b'\0' * _pad(len(data)))
+
+        section(_le(array.array('I', self._offsets)))
+        section(bytes(self._blob))
+        for name in COLUMNS:
+            section(_le(array.array(width, self._columns[name])))
+        index = array.array('I')
+        for code, (start, end) in sorted(self.provinces.items()):
+            index.extend((self._columns['province_code'][start], start, end))
+        section(_le(index))
+        return b''.join(parts)
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_PATH, use_mmap=True):
+        """Open a snapshot; with ``use_mmap`` nothing is copied until a string is read."""
+        with open(path, 'rb') as f:
+            if use_mmap:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError(f'{display_path(path)}: truncated snapshot')
+        magic, version, width, rows, strings, province_count, column_count, sha1 = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != SNAPSHOT_VERSION or column_count != len(COLUMNS):
+            raise ValueError(f'{display_path(path)}: not a version {SNAPSHOT_VERSION} location snapshot')
+        typecode = {2: 'H', 4: 'I'}[width]
+        position = _HEADER.size
+
+        def take(size, typecode=None):
+            nonlocal position
+            if position + size > len(view):
+                raise ValueError(f'{display_path(path)}: truncated snapshot')
+            chunk = view[position:position + size]
+            position += size + _pad(size)
+            return _ints(chunk, typecode) if typecode else chunk
+
+        offsets = take(4 * (strings + 1), 'I')
+        blob = take(offsets[-1])
+        columns = {name: take(width * rows, typecode) for name in COLUMNS}
+        index = take(12 * province_count, 'I')
+        store = cls(offsets, blob, columns, {}, sha1.hex(), buffer)
+        store.provinces = {store.string(index[i]): (index[i + 1], index[i + 2]) for i in range(0, len(index), 3)}
+        return store
+
+    def close(self):
+        """Release the mapping of a loaded snapshot; the store is unusable afterwards."""
+        if isinstance(self._buffer, mmap.mmap):
+            for ids in [self._offsets, self._blob, *self._columns.values()]:
+                if isinstance(ids, memoryview):
+                    ids.release()
+            self._buffer.close()
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _le(values):
+    if not _LITTLE_ENDIAN:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _ints(chunk, typecode):
+    if _LITTLE_ENDIAN:
+        return chunk.cast(typecode)
+    values = array.array(typecode, chunk.tobytes())
+    values.byteswap()
+    return values
+
+
+def sha1_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def build_snapshot(cities_path=CITIES_JSON, snapshot_path=SNAPSHOT_PATH):
+    """Write the snapshot of ``cities_path``; returns ``(store, written)``."""
+    with open(cities_path, 'r', encoding='utf-8') as f:
+        store = LocationStore.from_records(json.load(f), sha1_file(cities_path))
+    return store, write_if_changed(snapshot_path, store.encode())
+
+
+def open_store(cities_path=CITIES_JSON, snapshot_path=SNAPSHOT_PATH):
+    """The location table of ``cities_path``, from the snapshot when it is current."""
+    try:
+        store = LocationStore.load(snapshot_path)
+        if store.source_sha1 == sha1_file(cities_path):
+            return store
+        store.close()
+    except (OSError, ValueError):
+        pass
+    build_snapshot(cities_path, snapshot_path)
+    return LocationStore.load(snapshot_path)
+
+
+def _measure(load):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the memory-mappable location snapshot from cities.json.')
+    parser.add_argument('--cities', default=CITIES_JSON)
+    parser.add_argument('--out', default=SNAPSHOT_PATH)
+    parser.add_argument('--stats', action='store_true', help='compare load time and memory with json.load')
+    parser.add_argument('--force', action='store_true', help='rebuild even when cities.json is unchanged')
+    args = parser.parse_args(argv)
+
+    try:
+        ran, result = run_cached(
+            f'locstore:{display_path(args.out)}',
+            [args.cities, __file__], [args.out],
+            lambda: build_snapshot(args.cities, args.out),
+            force=args.force,
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Error building location snapshot: {e}")
+        return 1
+    if ran:
+        store, _ = result
+        print(f"✓ Saved: {display_path(args.out)} ({len(store)} rows, {len(store.provinces)} provinces, "
+              f"{len(store._decoded)} distinct strings, {os.path.getsize(args.out)} bytes)")
+    else:
+        print(f"• {display_path(args.out)} is up to date")
+
+    if args.stats:
+        def from_json():
+            with open(args.cities, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        rows, json_seconds, json_bytes = _measure(from_json)
+        store, seconds, size = _measure(lambda: LocationStore.load(args.out))
+        rows_equal = list(store) == [dict((c, r.get(c) or '') for c in COLUMNS) for r in rows]
+        _, _, decoded = _measure(lambda: [store.row(i) for i in range(len(store))])
+        print(f"   json.load       {json_seconds * 1000:7.2f} ms  {json_bytes / 1024:8.1f} KiB")
+        print(f"   snapshot (mmap) {seconds * 1000:7.2f} ms  {size / 1024:8.1f} KiB "
+              f"(+{decoded / 1024:.1f} KiB once every row is read as a dict)")
+        print(f"   rows identical: {'yes' if rows_equal else 'NO'}")
+        store.close()
+        if not rows_equal:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
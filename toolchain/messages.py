@@ -0,0 +1,148 @@
+"""Placeholder parsing, cross-locale checks and precompiled messages.
+
+Translations use Laravel placeholders: ``:name`` (also ``:Name`` and
+``:NAME`` for the capitalized / upper-cased replacement) and ``{name}``.
+``compile_message`` parses a message once into literal segments and
+placeholder slots:
+
+    "Welcome, :name"
+        -> ["Welcome, ", ["name"]]
+    "Minimum Experience: {years} years"
+        -> ["Minimum Experience: ", ["years", 0, "{years}"], " years"]
+    ":Attribute is required"
+        -> [["attribute", 1, ":Attribute"], " is required"]   # 1 = ucfirst, 2 = upper
+
+A slot is ``[name, transform, token]``, shortened to ``[name]`` for a
+plain ``:name``; the token is what gets rendered when no value is given.
+
+Messages without placeholders stay plain strings. toolchain.bundles writes
+compiled chunks next to the plain ones; resources/js/lib/messageFormat.ts
+interpolates them by concatenation, without any regex work per render.
+
+``python -m toolchain.messages`` checks that every locale uses the same
+placeholders as the reference locale for each key, in all three source
+families (see toolchain.coverage).
+"""
+import argparse
+import json
+import re
+import sys
+
+from . import phparray
+from .coverage import FAMILIES, discover_sources
+from .paths import LANG_DIR, display_path
+
+_PLACEHOLDER = re.compile(r':([A-Za-z][A-Za-z0-9_]*)|\{([A-Za-z][A-Za-z0-9_]*)\}')
+
+# Slot transforms; keep in sync with messageFormat.ts.
+AS_IS, UCFIRST, UPPER = 0, 1, 2
+
+
+def _slot(name):
+    if len(name) > 1 and name.isupper():
+        return name.lower(), UPPER
+    if name[0].isupper():
+        return name[0].lower() + name[1:], UCFIRST
+    return name, AS_IS
+
+
+def placeholders(text):
+    """Set of placeholder names in ``text`` (case variants folded)."""
+    if not isinstance(text, str):
+        return set()
+    return {_slot(m.group(1) or m.group(2))[0] for m in _PLACEHOLDER.finditer(text)}
+
+
+def compile_message(text):
+    """Plain string when ``text`` has no placeholders, else a segment list."""
+    if not isinstance(text, str) or (':' not in text and '{' not in text):
+        return text
+    segments = []
+    last = 0
+    for match in _PLACEHOLDER.finditer(text):
+        if match.start() > last:
+            segments.append(text[last:match.start()])
+        name, transform = _slot(match.group(1) or match.group(2))
+        token = match.group(0)
+        segments.append([name] if token == f':{name}' else [name, transform, token])
+        last = match.end()
+    if not segments:
+        return text
+    if last < len(text):
+        segments.append(text[last:])
+    return segments
+
+
+def compile_messages(messages):
+    return {key: compile_message(text) for key, text in messages.items()}
+
+
+def check_placeholders(by_locale, reference='en'):
+    """``[(key, locale, missing, extra), ...]`` for keys whose placeholders differ from ``reference``."""
+    expected = {k: placeholders(v) for k, v in by_locale.get(reference, {}).items()}
+    mismatches = []
+    for locale, messages in sorted(by_locale.items()):
+        if locale == reference:
+            continue
+        for key, text in sorted(messages.items()):
+            if key not in expected:
+                continue
+            found = placeholders(text)
+            if found != expected[key]:
+                mismatches.append((key, locale, sorted(expected[key] - found), sorted(found - expected[key])))
+    return mismatches
+
+
+def load_messages(path, family, group=None):
+    if family == 'php':
+        return phparray.flatten(phparray.load(path), group)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_families(lang_dir=LANG_DIR, families=FAMILIES):
+    """``({family: {locale: {key: text}}}, {path: error})``."""
+    loaded = {}
+    errors = {}
+    for path, family, locale, group in discover_sources(lang_dir):
+        if family not in families:
+            continue
+        try:
+            messages = load_messages(path, family, group)
+        except (OSError, ValueError) as e:
+            errors[display_path(path)] = str(e)
+            continue
+        loaded.setdefault(family, {}).setdefault(locale, {}).update(messages)
+    return loaded, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check translation placeholders across locales.')
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--reference', default='en', help='locale other locales are compared against')
+    parser.add_argument('--family', choices=FAMILIES, action='append', help='limit to a source family')
+    parser.add_argument('--check', action='store_true', help='exit non-zero on mismatches or unreadable files')
+    args = parser.parse_args(argv)
+
+    loaded, errors = load_families(args.lang_dir, args.family or FAMILIES)
+    for path, error in errors.items():
+        print(f"✗ {path}: {error}")
+
+    total = 0
+    for family, by_locale in loaded.items():
+        messages = by_locale.get(args.reference, {})
+        with_slots = sum(1 for text in messages.values() if placeholders(text))
+        mismatches = check_placeholders(by_locale, args.reference)
+        total += len(mismatches)
+        mark = '✓' if not mismatches else '✗'
+        print(f"{mark} {family}: {with_slots}/{len(messages)} {args.reference} messages with placeholders, "
+              f"{len(mismatches)} mismatches")
+        for key, locale, missing, extra in mismatches:
+            details = ', '.join([f"missing :{n}" for n in missing] + [f"unexpected :{n}" for n in extra])
+            print(f"   ✗ {locale} {key}: {details}")
+
+    return 1 if args.check and (total or errors) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
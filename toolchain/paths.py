@@ -0,0 +1,42 @@
+"""Project paths shared by the toolchain modules."""
+import os
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def find_project_root(start):
+    """Nearest directory at or above ``start`` holding Laravel's ``artisan``, or None."""
+    path = os.path.abspath(start)
+    while True:
+        if os.path.isfile(os.path.join(path, 'artisan')):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+# TOOLCHAIN_ROOT is set by `python -m toolchain --root ...` for its stages.
+BASE_PATH = os.path.abspath(
+    os.environ.get('TOOLCHAIN_ROOT') or find_project_root(PACKAGE_DIR) or os.path.dirname(PACKAGE_DIR)
+)
+LANG_DIR = os.path.join(BASE_PATH, 'lang')
+PACKS_DIR = os.path.join(PACKAGE_DIR, 'packs')
+CACHE_DIR = os.path.join(BASE_PATH, 'storage', 'framework', 'toolchain')
+SEED_DATA_DIR = os.path.join(BASE_PATH, 'database', 'seeders', 'data')
+COMMUNES_SQL = os.path.join(BASE_PATH, 'algeria_cities.sql')
+
+LOCALES = ('en', 'ar', 'fr', 'lt')
+FALLBACK_LOCALE = 'en'  # config/app.php fallback_locale
+
+
+def lang_file(locale, lang_dir=LANG_DIR):
+    return os.path.join(lang_dir, f'php_{locale}.json')
+
+
+def display_path(path):
+    """Path relative to the project root when inside it, for log lines."""
+    path = os.path.abspath(path)
+    if path.startswith(BASE_PATH + os.sep):
+        return os.path.relpath(path, BASE_PATH)
+    return path
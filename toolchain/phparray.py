@@ -0,0 +1,167 @@
+"""Pure-Python reader for Laravel ``lang/<locale>/*.php`` files.
+
+Those files are a single ``return [...]`` of string literals, so we parse
+the array literal directly instead of shelling out to PHP once per file.
+"""
+import re
+
+_TOKEN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|\#[^\n]*|/\*.*?\*/)
+  | (?P<open_tag><\?php)
+  | (?P<sq>'(?:[^'\\]|\\.)*')
+  | (?P<dq>"(?:[^"\\]|\\.)*")
+  | (?P<number>-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<arrow>=>)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<punct>[\[\](),;.])
+''', re.VERBOSE | re.DOTALL)
+
+_DQ_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'v': '\v', 'f': '\f', 'e': '\x1b',
+               '0': '\0', '\\': '\\', '$': '$', '"': '"'}
+
+
+class PhpParseError(ValueError):
+    def __init__(self, message, text, pos):
+        line = text.count('\n', 0, pos) + 1
+        column = pos - text.rfind('\n', 0, pos)
+        super().__init__(f'{message}: line {line} column {column}')
+        self.line = line
+        self.column = column
+
+
+def _unquote_single(raw):
+    return re.sub(r"\\([\\'])", r'\1', raw[1:-1])
+
+
+def _unquote_double(raw):
+    return re.sub(r'\\(.)', lambda m: _DQ_ESCAPES.get(m.group(1), m.group(0)), raw[1:-1])
+
+
+def tokenize(text):
+    pos = 0
+    tokens = []
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match:
+            raise PhpParseError(f'Unexpected character {text[pos]!r}', text, pos)
+        kind = match.lastgroup
+        if kind not in ('ws', 'comment', 'open_tag'):
+            tokens.append((kind, match.group(), pos))
+        pos = match.end()
+    tokens.append(('eof', '', pos))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def peek(self):
+        return self.tokens[self.index]
+
+    def next(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, value):
+        kind, text, pos = self.next()
+        if text != value:
+            raise PhpParseError(f'Expecting {value!r}', self.text, pos)
+
+    def error(self, message):
+        raise PhpParseError(message, self.text, self.peek()[2])
+
+    def parse_file(self):
+        kind, word, _ = self.peek()
+        if kind != 'word' or word.lower() != 'return':
+            self.error("Expecting 'return'")
+        self.next()
+        value = self.parse_value()
+        if self.peek()[1] == ';':
+            self.next()
+        if self.peek()[0] != 'eof':
+            self.error('Unexpected data after return value')
+        return value
+
+    def parse_value(self):
+        value = self.parse_scalar()
+        # String concatenation ('a' . 'b') is common enough in lang files.
+        while self.peek()[1] == '.':
+            self.next()
+            right = self.parse_scalar()
+            if not isinstance(value, str) or not isinstance(right, str):
+                self.error('Only string literals can be concatenated')
+            value += right
+        return value
+
+    def parse_scalar(self):
+        kind, text, pos = self.next()
+        if kind == 'sq':
+            return _unquote_single(text)
+        if kind == 'dq':
+            return _unquote_double(text)
+        if kind == 'number':
+            return float(text) if any(c in text for c in '.eE') else int(text)
+        if text == '[':
+            return self.parse_items(']')
+        if kind == 'word':
+            lowered = text.lower()
+            if lowered == 'array' and self.peek()[1] == '(':
+                self.next()
+                return self.parse_items(')')
+            if lowered in ('true', 'false'):
+                return lowered == 'true'
+            if lowered == 'null':
+                return None
+        raise PhpParseError(f'Unsupported token {text!r}', self.text, pos)
+
+    def parse_items(self, close):
+        items = {}
+        next_index = 0
+        while self.peek()[1] != close:
+            value = self.parse_value()
+            if self.peek()[0] == 'arrow':
+                self.next()
+                key = value
+                if isinstance(key, bool) or key is None:
+                    key = int(bool(key)) if key is not None else ''
+                elif isinstance(key, float):
+                    key = int(key)
+                elif isinstance(key, str) and re.fullmatch(r'-?[1-9]\d*|0', key):
+                    key = int(key)
+                value = self.parse_value()
+            else:
+                key = next_index
+            if isinstance(key, int):
+                next_index = max(next_index, key + 1)
+            items[key] = value
+            if self.peek()[1] != close:
+                self.expect(',')
+        self.next()
+        return items
+
+
+def loads(text):
+    """Evaluate the ``return [...]`` array of a PHP lang file into dicts."""
+    return _Parser(text).parse_file()
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return loads(f.read())
+
+
+def flatten(value, prefix=''):
+    """Flatten nested arrays into Laravel's dotted ``group.key`` form."""
+    flat = {}
+    for key, item in value.items():
+        dotted = f'{prefix}.{key}' if prefix else str(key)
+        if isinstance(item, dict):
+            flat.update(flatten(item, dotted))
+        else:
+            flat[dotted] = item
+    return flat
@@ -0,0 +1,212 @@
+"""Sync the lang/<locale>/*.php arrays into lang/php_<locale>.json.
+
+Every PHP lang file is parsed with toolchain.phparray (no PHP process),
+flattened to ``group.key`` and merged into the flat JSON file of its
+locale, the same file the laravel-vue-i18n plugin reads. Locales are
+synced concurrently and changes are spliced in with toolchain.jsonpatch.
+
+Parsed files are cached in storage/framework/toolchain/ by size/mtime and
+sha1, so only edited files are re-parsed. The cache also remembers the
+value last synced for every key, which makes the sync a three-way merge:
+
+    JSON value equals the PHP value or the last synced one   PHP wins
+    JSON value was edited since (or never synced)            conflict
+
+Conflicting keys keep their JSON value and are listed in the output;
+``--prefer-php`` overwrites them. Keys deleted from a PHP file are removed
+from the JSON under the same rule, while keys that only exist in JSON are
+kept. Keys owned by a key pack (toolchain/packs) are left to
+toolchain.translations, which runs after this stage.
+
+    python -m toolchain.phpsync
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import phparray
+from .buildcache import run_cached
+from .coverage import discover_sources
+from .fsutil import write_if_changed
+from .paths import CACHE_DIR, LANG_DIR, display_path, lang_file
+from .translations import (MergeResult, available_packs, combine_packs, load_locale, load_pack, merge_locale,
+                           pack_path, report)
+
+CACHE_VERSION = 2
+CACHE_PATH = os.path.join(CACHE_DIR, 'php-lang-cache.json')
+
+
+class PhpLangCache:
+    """Flattened messages per PHP file plus the ``{key: value}`` last synced into each JSON file."""
+
+    def __init__(self, data=None, path=CACHE_PATH):
+        data = data if data and data.get('version') == CACHE_VERSION else {}
+        self.files = data.get('files', {})
+        self.synced = data.get('synced', {})
+        self.path = path
+        self.stats = {'parsed': 0, 'reused': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=CACHE_PATH):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f), path)
+        except (OSError, ValueError):
+            return cls(path=path)
+
+    def save(self):
+        with self._lock:
+            data = {'version': CACHE_VERSION, 'files': self.files, 'synced': self.synced}
+            encoded = json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        return write_if_changed(self.path, encoded)
+
+    def messages(self, path, group):
+        key = display_path(path)
+        stat = os.stat(path)
+        with self._lock:
+            memo = self.files.get(key)
+        if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            self._count('reused')
+            return memo[3]
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        if memo and memo[2] == digest:
+            messages = memo[3]
+            self._count('reused')
+        else:
+            messages = phparray.flatten(phparray.loads(raw.decode('utf-8')), group)
+            self._count('parsed')
+        with self._lock:
+            self.files[key] = [stat.st_size, stat.st_mtime_ns, digest, messages]
+        return messages
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+def discover(lang_dir=LANG_DIR, locales=None):
+    """``{locale: [(path, group), ...]}`` for every lang/<locale>/*.php."""
+    found = {}
+    for path, family, locale, group in discover_sources(lang_dir):
+        if family == 'php' and (not locales or locale in locales):
+            found.setdefault(locale, []).append((path, group))
+    return found
+
+
+def plan_sync(keys, current, synced, prefer_php=False):
+    """``(changes, remove, conflicts)`` turning ``current`` JSON into the PHP ``keys``.
+
+    ``synced`` is what the previous sync wrote. A JSON value that differs
+    from both it and PHP was edited by hand and is a conflict, unless
+    ``prefer_php``.
+    """
+    changes = {}
+    conflicts = []
+    for key, value in keys.items():
+        if key not in current or current[key] == value:
+            changes[key] = value
+        elif prefer_php or (key in synced and current[key] == synced[key]):
+            changes[key] = value
+        else:
+            conflicts.append((key, current[key], value))
+    remove = []
+    for key in synced:
+        if key in keys or key not in current:
+            continue
+        if prefer_php or current[key] == synced[key]:
+            remove.append(key)
+        else:
+            conflicts.append((key, current[key], None))
+    return changes, remove, conflicts
+
+
+def sync_locale(locale, files, cache, lang_dir=LANG_DIR, exclude=(), patch=True, prefer_php=False):
+    path = lang_file(locale, lang_dir)
+    messages = {}
+    try:
+        for php_path, group in files:
+            messages.update(cache.messages(php_path, group))
+    except (OSError, ValueError) as e:
+        # Never merge a partial locale: its missing keys would be removed.
+        return MergeResult(locale, path, 0, 0, False, f'{display_path(php_path)}: {e}')
+    try:
+        current = load_locale(path)
+    except FileNotFoundError:
+        current = {}
+    except (OSError, ValueError) as e:
+        return MergeResult(locale, path, 0, 0, False, e)
+
+    keys = {k: v for k, v in messages.items() if k not in exclude}
+    target = display_path(path)
+    changes, remove, conflicts = plan_sync(keys, current, cache.synced.get(target, {}), prefer_php)
+    result = merge_locale(locale, changes, lang_dir, patch, remove=remove)
+    if not result.error:
+        with cache._lock:
+            cache.synced[target] = dict(sorted(keys.items()))
+    return result._replace(conflicts=sorted(conflicts))
+
+
+def sync(lang_dir=LANG_DIR, locales=None, packs=None, patch=True, cache=None, prefer_php=False):
+    """Sync every locale concurrently; returns ``(results, cache)``."""
+    cache = cache or PhpLangCache.load()
+    sources = discover(lang_dir, locales)
+    owned = combine_packs(packs or [])
+    with ThreadPoolExecutor(max_workers=len(sources) or 1) as pool:
+        results = list(pool.map(
+            lambda l: sync_locale(l, sources[l], cache, lang_dir, owned.get(l, {}), patch, prefer_php),
+            sorted(sources)))
+    cache.save()
+    return results, cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Merge lang/<locale>/*.php into lang/php_<locale>.json.')
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--locale', action='append', dest='locales', help='limit to a locale (repeatable)')
+    parser.add_argument('--rewrite', action='store_true', help='re-serialize whole files instead of patching changed keys')
+    parser.add_argument('--force', action='store_true', help='sync even when the PHP files are unchanged')
+    parser.add_argument('--prefer-php', action='store_true',
+                        help='overwrite JSON values edited since the last sync instead of reporting them')
+    args = parser.parse_args(argv)
+
+    pack_files = [pack_path(name) for name in available_packs()]
+    sources = discover(args.lang_dir, args.locales)
+    php_files = [path for files in sources.values() for path, _ in files]
+    locale_files = [lang_file(locale, args.lang_dir) for locale in sources]
+
+    def build():
+        results, cache = sync(args.lang_dir, args.locales, [load_pack(p) for p in pack_files], not args.rewrite,
+                              prefer_php=args.prefer_php)
+        ok = report(results)
+        stats = cache.stats
+        print(f"\n{len(php_files)} PHP files: {stats['parsed']} parsed, {stats['reused']} cached")
+        conflicts = sum(len(r.conflicts) for r in results)
+        if conflicts:
+            print(f"• {conflicts} keys edited in JSON kept; fix the PHP files or pass --prefer-php")
+        return ok
+
+    ran, ok = run_cached(
+        f'phpsync:{display_path(args.lang_dir)}',
+        php_files + pack_files + [__file__, phparray.__file__],
+        lambda: [p for p in locale_files if os.path.exists(p)],
+        build,
+        params={'locales': sorted(sources), 'rewrite': args.rewrite, 'prefer_php': args.prefer_php},
+        force=args.force,
+        ok=bool,
+    )
+    if not ran:
+        print(f"• {len(php_files)} PHP lang files unchanged, nothing to sync")
+        return 0
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
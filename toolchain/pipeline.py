@@ -0,0 +1,129 @@
+"""Stage graph and parallel scheduler behind ``python -m toolchain build``.
+
+    communes (algeria_cities.sql -> cities.json)
+      ├── seeds       cities.seed.json
+      ├── hierarchy   public/locations/<code>.<hash>.json
+      ├── search      public/locations/search-index.json
+      ├── proximity   public/locations/proximity.json (needs a coordinates file)
+      └── locstore    storage/framework/toolchain/locations.snapshot
+    lint (lang/*.json)
+      └── phpsync (lang/<locale>/*.php -> lang/php_<locale>.json)
+            └── translations (key packs -> lang/php_<locale>.json)
+                  └── bundles   public/lang/
+    compress (after hierarchy, search, proximity and bundles)
+                  public/{lang,locations}/**/*.json.gz|.br
+
+Every stage runs as ``python -m <module>`` in its own process, so
+independent stages use separate cores and each one only imports what it
+needs. A stage starts as soon as all of its dependencies succeeded;
+stages depending on a failed one are skipped. Each stage's own build
+cache entry still decides whether it has any work to do.
+"""
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+Stage = namedtuple('Stage', 'name module deps args forceable')
+StageResult = namedtuple('StageResult', 'name status seconds output')
+
+STAGES = {s.name: s for s in (
+    Stage('communes', 'toolchain.communes', (), (), True),
+    Stage('seeds', 'toolchain.seeds', ('communes',), (), True),
+    Stage('hierarchy', 'toolchain.hierarchy', ('communes',), (), True),
+    Stage('search', 'toolchain.search', ('communes',), (), True),
+    Stage('proximity', 'toolchain.proximity', ('communes',), (), True),
+    Stage('locstore', 'toolchain.locstore', ('communes',), (), True),
+    Stage('lint', 'toolchain.jsonlint', (), ('--quiet',), False),
+    Stage('phpsync', 'toolchain.phpsync', ('lint',), (), True),
+    Stage('translations', 'toolchain.translations', ('lint', 'phpsync'), (), True),
+    Stage('bundles', 'toolchain.bundles', ('translations',), (), True),
+    Stage('compress', 'toolchain.compress', ('hierarchy', 'search', 'proximity', 'bundles'), (), True),
+)}
+
+OK, FAILED, SKIPPED = 'ok', 'failed', 'skipped'
+
+
+def resolve(names, stages=STAGES, with_deps=True):
+    """``names`` (default: every stage) plus, unless disabled, everything they depend on."""
+    unknown = [n for n in names or () if n not in stages]
+    if unknown:
+        raise KeyError(f"unknown stage(s): {', '.join(unknown)}")
+    selected = set(names or stages)
+    pending = list(selected)
+    while with_deps and pending:
+        for dep in stages[pending.pop()].deps:
+            if dep not in selected:
+                selected.add(dep)
+                pending.append(dep)
+    return [n for n in stages if n in selected]
+
+
+def order(names, stages=STAGES):
+    """Topological order of ``names``; raises ValueError on a cycle."""
+    done = []
+    visiting = set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f'dependency cycle through {name}')
+        visiting.add(name)
+        for dep in stages[name].deps:
+            if dep in names:
+                visit(dep)
+        visiting.discard(name)
+        done.append(name)
+
+    for name in names:
+        visit(name)
+    return done
+
+
+def run_stage(stage, root, force=False):
+    args = list(stage.args) + (['--force'] if force and stage.forceable else [])
+    env = dict(os.environ, TOOLCHAIN_ROOT=root, PYTHONUNBUFFERED='1')
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (package_parent, env.get('PYTHONPATH')) if p)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-m', stage.module] + args, cwd=root, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8')
+    status = OK if proc.returncode == 0 else FAILED
+    return StageResult(stage.name, status, time.perf_counter() - start, proc.stdout)
+
+
+def run_graph(names, root, jobs=None, force=False, stages=STAGES, runner=run_stage, on_done=None):
+    """Run ``names`` respecting dependencies, up to ``jobs`` at a time; returns results in finish order."""
+    names = order(names, stages)
+    waiting = {n: {d for d in stages[n].deps if d in names} for n in names}
+    results = []
+    finished = {}
+
+    def finish(result):
+        finished[result.name] = result.status
+        results.append(result)
+        if on_done:
+            on_done(result)
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        running = {}
+        while waiting or running:
+            for name in [n for n, deps in waiting.items() if all(d in finished for d in deps)]:
+                deps = waiting.pop(name)
+                if any(finished[d] != OK for d in deps):
+                    finish(StageResult(name, SKIPPED, 0.0, ''))
+                    continue
+                running[pool.submit(runner, stages[name], root, force)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    finish(future.result())
+                except Exception as e:
+                    finish(StageResult(name, FAILED, 0.0, f'{e}\n'))
+    return results
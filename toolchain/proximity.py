@@ -0,0 +1,248 @@
+"""Proximity index for "find specialists near you".
+
+Joins a local coordinates file to the communes of cities.json and writes
+public/locations/proximity.json:
+
+    communes    [[province_code, name_ar, name_en, lat, lon], ...]   id = position
+    cell        grid cell size in degrees
+    grid        {"<row>:<col>": [ids]}
+    neighbours  per id, the nearest other communes as [[id, km], ...]
+
+A request for "near commune X" is a single lookup in ``neighbours``; a
+request for "near this point" only visits the grid cells around it
+(``ProximityIndex.nearest``). Consumers join back to the cities table on
+(province_code, name_ar), the seeder's natural key.
+
+The coordinates file is CSV or a JSON list with a province/wilaya code, a
+commune name (Arabic or French) and latitude/longitude; rows are matched
+to communes by toolchain.textnorm form. Without the file the stage is
+skipped.
+
+    python -m toolchain.proximity --coordinates database/seeders/data/commune_coordinates.csv
+    python -m toolchain.proximity --near 36.75,3.06
+"""
+import argparse
+import csv
+import heapq
+import json
+import math
+import os
+import sys
+
+from . import textnorm
+from .buildcache import run_cached
+from .fsutil import write_if_changed
+from .paths import BASE_PATH, SEED_DATA_DIR, display_path
+from .textnorm import normalize
+
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+COORDINATES_FILE = os.path.join(SEED_DATA_DIR, 'commune_coordinates.csv')
+INDEX_PATH = os.path.join(BASE_PATH, 'public', 'locations', 'proximity.json')
+INDEX_VERSION = 1
+
+CELL_DEGREES = 0.25  # ~28 km rows; a commune's neighbours sit in a few cells
+NEIGHBOURS = 8
+RADIUS_KM = 60.0
+EARTH_RADIUS_KM = 6371.0
+
+_CODE_COLUMNS = ('province_code', 'wilaya_code', 'code')
+_NAME_COLUMNS = ('name_ar', 'commune_name', 'name_en', 'commune_name_ascii', 'name')
+_LAT_COLUMNS = ('latitude', 'lat')
+_LON_COLUMNS = ('longitude', 'lon', 'lng')
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _pick(row, columns):
+    for column in columns:
+        value = row.get(column)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def load_coordinates(path):
+    """``[(province_code, [names], lat, lon), ...]`` from a CSV or JSON file."""
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    else:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+    points = []
+    for number, row in enumerate(rows, 1):
+        row = {str(k).strip().lower(): v for k, v in row.items()}
+        code, lat, lon = _pick(row, _CODE_COLUMNS), _pick(row, _LAT_COLUMNS), _pick(row, _LON_COLUMNS)
+        names = [row[c] for c in _NAME_COLUMNS if row.get(c)]
+        if code is None or lat is None or lon is None or not names:
+            raise ValueError(f'{display_path(path)} row {number}: needs a code, a name, latitude and longitude')
+        points.append((str(code).zfill(2), names, float(lat), float(lon)))
+    return points
+
+
+def join_coordinates(cities, points):
+    """``(communes, unmatched)``; communes are ``[code, name_ar, name_en, lat, lon]``."""
+    by_key = {}
+    for city in cities:
+        code = str(city['province_code']).zfill(2)
+        for name in (city['name_ar'], city['name_en']):
+            by_key.setdefault((code, normalize(name)), city)
+    located = {}
+    unmatched = []
+    for code, names, lat, lon in points:
+        city = next((by_key[(code, normalize(n))] for n in names if (code, normalize(n)) in by_key), None)
+        if city is None:
+            unmatched.append((code, names[0]))
+            continue
+        located[(code, city['name_ar'])] = [code, city['name_ar'], city['name_en'], round(lat, 6), round(lon, 6)]
+    return [located[k] for k in sorted(located)], unmatched
+
+
+def _cell(lat, lon, cell=CELL_DEGREES):
+    return math.floor(lat / cell), math.floor(lon / cell)
+
+
+class ProximityIndex:
+    def __init__(self, communes, cell=CELL_DEGREES, grid=None, neighbours=None):
+        self.communes = communes
+        self.cell = cell
+        if grid is None:
+            grid = {}
+            for commune_id, commune in enumerate(communes):
+                row, col = _cell(commune[3], commune[4], cell)
+                grid.setdefault(f'{row}:{col}', []).append(commune_id)
+        self.grid = grid
+        self.neighbours = neighbours
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"unsupported proximity index version {data.get('version')!r}")
+        return cls(data['communes'], data['cell'], data['grid'], data['neighbours'])
+
+    def nearest(self, lat, lon, k=NEIGHBOURS, radius_km=RADIUS_KM, exclude=None):
+        """Up to ``k`` ``(km, id)`` pairs within ``radius_km``, closest first.
+
+        Cells are visited in growing square rings around the point; the
+        search stops once a ring can no longer hold anything closer than
+        the current k-th result.
+        """
+        row, col = _cell(lat, lon, self.cell)
+        cos_lat = math.cos(math.radians(lat))
+        best = []
+        ring = 0
+        while True:
+            for r in range(row - ring, row + ring + 1):
+                for c in range(col - ring, col + ring + 1):
+                    if ring and r not in (row - ring, row + ring) and c not in (col - ring, col + ring):
+                        continue
+                    for commune_id in self.grid.get(f'{r}:{c}', ()):
+                        if commune_id == exclude:
+                            continue
+                        commune = self.communes[commune_id]
+                        km = haversine(lat, lon, commune[3], commune[4])
+                        if km <= radius_km:
+                            heapq.heappush(best, (-km, commune_id))
+                            if len(best) > k:
+                                heapq.heappop(best)
+            # Unvisited cells are at least ``ring`` cells away in latitude or in
+            # longitude; the nearer of the two is the meridian ``ring`` cells off.
+            span = ring * self.cell
+            reach = EARTH_RADIUS_KM * math.asin(cos_lat * math.sin(math.radians(min(span, 90.0))))
+            if span >= 180.0 or reach > radius_km or (len(best) == k and reach >= -best[0][0]):
+                break
+            ring += 1
+        return sorted((-km, commune_id) for km, commune_id in best)
+
+    def build_neighbours(self, k=NEIGHBOURS, radius_km=RADIUS_KM):
+        self.neighbours = [
+            [[other, round(km, 1)] for km, other in self.nearest(c[3], c[4], k, radius_km, exclude=commune_id)]
+            for commune_id, c in enumerate(self.communes)
+        ]
+        return self.neighbours
+
+    def to_json(self):
+        return {
+            'version': INDEX_VERSION,
+            'communes': self.communes,
+            'cell': self.cell,
+            'grid': dict(sorted(self.grid.items())),
+            'neighbours': self.neighbours,
+        }
+
+
+def build_index(cities, points, k=NEIGHBOURS, radius_km=RADIUS_KM):
+    communes, unmatched = join_coordinates(cities, points)
+    index = ProximityIndex(communes)
+    index.build_neighbours(k, radius_km)
+    return index, unmatched
+
+
+def _build(args):
+    with open(args.cities, 'r', encoding='utf-8') as f:
+        cities = json.load(f)
+    index, unmatched = build_index(cities, load_coordinates(args.coordinates), args.neighbours, args.radius)
+    data = json.dumps(index.to_json(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    write_if_changed(args.out, data)
+    return index, unmatched, len(cities), len(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the commune proximity index from a coordinates file.')
+    parser.add_argument('--cities', default=CITIES_JSON)
+    parser.add_argument('--coordinates', default=COORDINATES_FILE, help='CSV or JSON with code, name, lat, lon')
+    parser.add_argument('--out', default=INDEX_PATH)
+    parser.add_argument('--neighbours', type=int, default=NEIGHBOURS, help='neighbours kept per commune')
+    parser.add_argument('--radius', type=float, default=RADIUS_KM, help='neighbour radius in km')
+    parser.add_argument('--near', help='LAT,LON: list the communes nearest to a point')
+    parser.add_argument('--limit', type=int, default=10, help='results for --near')
+    parser.add_argument('--force', action='store_true', help='rebuild even when the inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.coordinates):
+        if args.near:
+            print(f"✗ {display_path(args.coordinates)} not found, cannot answer --near")
+            return 1
+        print(f"• {display_path(args.coordinates)} not found, skipping the proximity index")
+        return 0
+
+    try:
+        ran, result = run_cached(
+            f'proximity:{display_path(args.out)}',
+            [args.cities, args.coordinates, __file__, textnorm.__file__], [args.out],
+            lambda: _build(args),
+            params={'neighbours': args.neighbours, 'radius': args.radius},
+            force=args.force,
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Error building proximity index: {e}")
+        return 1
+
+    if ran:
+        index, unmatched, total, size = result
+        for code, name in unmatched:
+            print(f"✗ [{code}] {name}: no matching commune in {display_path(args.cities)}")
+        print(f"✓ Saved: {display_path(args.out)} ({len(index.communes)}/{total} communes located, "
+              f"{len(index.grid)} cells, {size} bytes)")
+    elif not args.near:
+        print(f"• {display_path(args.out)} is up to date")
+
+    if args.near:
+        lat, lon = (float(v) for v in args.near.split(','))
+        index = ProximityIndex.load(args.out)
+        for km, commune_id in index.nearest(lat, lon, args.limit, args.radius):
+            code, name_ar, name_en = index.communes[commune_id][:3]
+            print(f"   {km:6.1f} km  [{code}] {name_en} / {name_ar}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
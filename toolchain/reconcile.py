@@ -0,0 +1,231 @@
+"""Reconcile hand-curated city lists against the authoritative commune list.
+
+Curated entries (generate_cities_real.cities_data, cities.json backups or
+any JSON list of ``{province_code, name_ar, name_en}``) are matched against
+cities.json as generated by toolchain.communes. Names are compared in
+toolchain.textnorm form, so spelling variants (Hadjadj / El Hadjadje,
+عين صفرة / عين الصفراء) still meet.
+
+Candidates come from a trigram inverted index: a curated name is only
+scored against communes sharing enough trigrams to possibly reach the
+threshold, so the cost grows with the number of near matches rather than
+with curated x communes. Each entry is reported as
+
+    ok          exact match in the claimed province
+    renamed     same province, spelling differs from the commune list
+    moved       best match is in another province
+    mismatched  the Arabic and the Latin name are each exactly the name of
+                a different commune
+    duplicate   resolves to the commune an earlier entry for the same
+                province already claimed
+    unmatched   nothing reaches --min-confidence
+
+with a confidence (best similarity) and a margin over the runner-up.
+
+    python -m toolchain.reconcile                       # generate_cities_real.py
+    python -m toolchain.reconcile database/seeders/data/cities.json.backup.*
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from collections import namedtuple
+
+from .paths import BASE_PATH, SEED_DATA_DIR, display_path
+from .textnorm import normalize, trigrams
+
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+CURATED_SCRIPT = os.path.join(BASE_PATH, 'generate_cities_real.py')
+
+MIN_CONFIDENCE = 0.5
+# A match in the claimed province wins over a slightly better one elsewhere.
+PROVINCE_TOLERANCE = 0.1
+STATUSES = ('ok', 'renamed', 'moved', 'mismatched', 'duplicate', 'unmatched')
+
+Match = namedtuple('Match', 'index entry status confidence margin commune')
+
+
+def load_curated(path):
+    """Curated entries from a JSON list or a script defining ``cities_data``."""
+    if path.endswith('.py'):
+        spec = importlib.util.spec_from_file_location('_curated_cities', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return list(module.cities_data)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError('expected a list of cities')
+    return data
+
+
+def _keys(city):
+    return [k for k in (normalize(city.get('name_ar') or ''), normalize(city.get('name_en') or '')) if k]
+
+
+class CommuneMatcher:
+    """Trigram-indexed fuzzy matcher over the reference communes."""
+
+    def __init__(self, communes):
+        self.communes = communes
+        self.keys = []
+        self.grams = []
+        self.postings = {}
+        for commune_id, commune in enumerate(communes):
+            keys = _keys(commune)
+            grams = [trigrams(k) for k in keys]
+            self.keys.append(keys)
+            self.grams.append(grams)
+            for gram in set().union(*grams):
+                self.postings.setdefault(gram, []).append(commune_id)
+
+    def scores(self, key, min_similarity=MIN_CONFIDENCE):
+        """``{commune_id: similarity}`` of the communes within ``min_similarity`` of one normalized name."""
+        query = trigrams(key)
+        shared = {}
+        for gram in query:
+            for commune_id in self.postings.get(gram, ()):
+                shared[commune_id] = shared.get(commune_id, 0) + 1
+        # Dice >= s needs at least s * |query| / 2 shared trigrams.
+        needed = min_similarity * len(query) / 2
+        scores = {}
+        for commune_id, count in shared.items():
+            if count < needed:
+                continue
+            if key in self.keys[commune_id]:
+                similarity = 1.0
+            else:
+                similarity = max(2.0 * len(query & g) / (len(query) + len(g)) for g in self.grams[commune_id])
+            if similarity >= min_similarity:
+                scores[commune_id] = similarity
+        return scores
+
+    def name_scores(self, city, min_similarity=MIN_CONFIDENCE):
+        """``[scores of name_ar, scores of name_en]`` (see ``scores``); empty for a missing name."""
+        keys = [normalize(city.get(field) or '') for field in ('name_ar', 'name_en')]
+        return [self.scores(key, min_similarity) if key else {} for key in keys]
+
+    def candidates(self, city, min_similarity=MIN_CONFIDENCE, name_scores=None):
+        """``[(similarity, commune_id), ...]`` best first, at or above ``min_similarity``."""
+        scores = {}
+        for by_name in name_scores or self.name_scores(city, min_similarity):
+            for commune_id, similarity in by_name.items():
+                if similarity > scores.get(commune_id, 0.0):
+                    scores[commune_id] = similarity
+        return sorted(((s, i) for i, s in scores.items()), key=lambda c: (-c[0], c[1]))
+
+
+def _disagree(name_scores, commune_id):
+    """Whether the Arabic and the Latin name are exact names of different communes
+    and ``commune_id`` does not even come close to one of them."""
+    exact = [{i for i, s in by_name.items() if s == 1.0} for by_name in name_scores]
+    return all(exact) and not exact[0] & exact[1] and not all(commune_id in s for s in name_scores)
+
+
+def _code(city):
+    return str(city.get('province_code', '')).zfill(2)
+
+
+def reconcile(curated, communes, min_confidence=MIN_CONFIDENCE):
+    """Match every curated entry; returns a list of ``Match``."""
+    matcher = CommuneMatcher(communes)
+    claimed = {}
+    results = []
+    for index, entry in enumerate(curated):
+        name_scores = matcher.name_scores(entry, min_confidence)
+        ranked = matcher.candidates(entry, min_confidence, name_scores)
+        if not ranked:
+            results.append(Match(index, entry, 'unmatched', 0.0, 0.0, None))
+            continue
+
+        code = _code(entry)
+        best_score, best_id = ranked[0]
+        local = next(((s, i) for s, i in ranked if _code(communes[i]) == code), None)
+        if local and local[0] >= best_score - PROVINCE_TOLERANCE:
+            best_score, best_id = local
+        runner_up = next((s for s, i in ranked if i != best_id), 0.0)
+        commune = communes[best_id]
+
+        if (best_id, code) in claimed:
+            status = 'duplicate'
+        elif _disagree(name_scores, best_id):
+            status = 'mismatched'
+        elif _code(commune) != code:
+            status = 'moved'
+        elif best_score == 1.0 and normalize(entry.get('name_ar') or '') == normalize(commune['name_ar']):
+            status = 'ok'
+        else:
+            status = 'renamed'
+        claimed.setdefault((best_id, code), index)
+        results.append(Match(index, entry, status, round(best_score, 3), round(best_score - runner_up, 3), commune))
+    return results
+
+
+def summarize(results):
+    counts = {status: 0 for status in STATUSES}
+    for match in results:
+        counts[match.status] += 1
+    return counts
+
+
+def _describe(city):
+    return f"[{_code(city)}] {city.get('name_en', '')} / {city.get('name_ar', '')}"
+
+
+def _as_json(match):
+    commune = match.commune
+    return {
+        'index': match.index,
+        'status': match.status,
+        'confidence': match.confidence,
+        'margin': match.margin,
+        'curated': match.entry,
+        'commune': None if commune is None else {
+            'province_code': _code(commune), 'name_ar': commune['name_ar'], 'name_en': commune['name_en'],
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reconcile curated city lists against the commune list.')
+    parser.add_argument('curated', nargs='*', default=[CURATED_SCRIPT],
+                        help='curated JSON lists or scripts defining cities_data (default: generate_cities_real.py)')
+    parser.add_argument('--communes', default=CITIES_JSON, help='authoritative commune list')
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE)
+    parser.add_argument('--all', action='store_true', help='also list entries that already match')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    parser.add_argument('--check', action='store_true', help='exit non-zero when any entry needs a correction')
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.communes, 'r', encoding='utf-8') as f:
+            communes = json.load(f)
+        sources = {path: load_curated(path) for path in args.curated}
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"✗ Error loading city lists: {e}")
+        return 1
+
+    report = {path: reconcile(entries, communes, args.min_confidence) for path, entries in sources.items()}
+    if args.json:
+        print(json.dumps({display_path(p): [_as_json(m) for m in r] for p, r in report.items()},
+                         ensure_ascii=False, indent=2))
+    else:
+        for path, results in report.items():
+            counts = summarize(results)
+            print(f"\n{display_path(path)} ({len(results)} entries)")
+            print('   ' + ', '.join(f"{status}: {count}" for status, count in counts.items()))
+            for match in results:
+                if match.status == 'ok' and not args.all:
+                    continue
+                mark = '✓' if match.status == 'ok' else '✗'
+                target = f" -> {_describe(match.commune)}" if match.commune else ''
+                print(f"   {mark} {match.status:<9} {match.confidence:.2f} (±{match.margin:.2f})  "
+                      f"{_describe(match.entry)}{target}")
+
+    needs_fix = any(m.status != 'ok' for results in report.values() for m in results)
+    return 1 if args.check and needs_fix else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
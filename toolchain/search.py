@@ -0,0 +1,213 @@
+"""Prefix + trigram search index for location autocomplete.
+
+Built from cities.json into public/locations/search-index.json:
+
+    entries   [[province_code, name_ar, name_en], ...]       entry id = position
+    terms     sorted normalized tokens (plus article-less Arabic variants)
+    postings  entry ids per term, parallel to ``terms``
+    trigrams  {trigram: [entry ids]} for typo-tolerant fallback
+
+Posting lists are delta-encoded (``[3, 7, 12]`` is stored as ``[3, 4, 5]``),
+and the normalized names used for ranking are recomputed from ``entries``
+by the reader rather than shipped, which keeps the file smaller than
+cities.json.
+
+A query is normalized with toolchain.textnorm; every query token is looked
+up as a prefix by binary search over ``terms`` and the posting lists are
+intersected. Only when that yields fewer than ``limit`` hits (in the
+requested province, if any) are trigram posting lists used to collect
+near matches, scored by Dice similarity. Nothing scans the full entry
+list.
+
+    python -m toolchain.search                      # build
+    python -m toolchain.search --query "ain sefra"  # try a query
+"""
+import argparse
+import bisect
+import json
+import os
+import sys
+
+from . import textnorm
+from .buildcache import run_cached
+from .fsutil import write_if_changed
+from .paths import BASE_PATH, SEED_DATA_DIR, display_path
+from .textnorm import normalize, token_variants, trigrams
+
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+INDEX_PATH = os.path.join(BASE_PATH, 'public', 'locations', 'search-index.json')
+INDEX_VERSION = 2
+
+# Rank tiers, best first.
+EXACT, PREFIX, TOKEN_PREFIX, FUZZY = 3, 2, 1, 0
+MIN_SIMILARITY = 0.4
+
+
+def delta_encode(ids):
+    """Sorted ids -> gaps from the previous id."""
+    return [b - a for a, b in zip([0] + ids, ids)]
+
+
+def delta_decode(gaps):
+    entry_id = 0
+    for gap in gaps:
+        entry_id += gap
+        yield entry_id
+
+
+def entry_keys(entry):
+    """The normalized names of an ``entries`` row."""
+    return [normalize(entry[1]), normalize(entry[2])]
+
+
+def build_index(cities):
+    entries = []
+    term_postings = {}
+    gram_postings = {}
+    for entry_id, city in enumerate(cities):
+        entries.append([city['province_code'], city['name_ar'], city['name_en']])
+        for key in entry_keys(entries[-1]):
+            for token in key.split():
+                for variant in token_variants(token):
+                    term_postings.setdefault(variant, set()).add(entry_id)
+            for gram in trigrams(key):
+                gram_postings.setdefault(gram, set()).add(entry_id)
+
+    terms = sorted(term_postings)
+    return {
+        'version': INDEX_VERSION,
+        'entries': entries,
+        'terms': terms,
+        'postings': [delta_encode(sorted(term_postings[t])) for t in terms],
+        'trigrams': {g: delta_encode(sorted(ids)) for g, ids in sorted(gram_postings.items())},
+    }
+
+
+def encode_index(index):
+    return json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class LocationIndex:
+    def __init__(self, data):
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"unsupported search index version {data.get('version')!r}")
+        self.entries = data['entries']
+        self.terms = data['terms']
+        self.postings = [list(delta_decode(p)) for p in data['postings']]
+        self.trigram_postings = {g: list(delta_decode(p)) for g, p in data['trigrams'].items()}
+        self._keys = {}
+        self._grams = {}
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _prefix_ids(self, token):
+        lo = bisect.bisect_left(self.terms, token)
+        hi = bisect.bisect_left(self.terms, token + '\uffff', lo)
+        ids = set()
+        for postings in self.postings[lo:hi]:
+            ids.update(postings)
+        return ids
+
+    def _entry_keys(self, entry_id):
+        keys = self._keys.get(entry_id)
+        if keys is None:
+            keys = self._keys[entry_id] = entry_keys(self.entries[entry_id])
+        return keys
+
+    def _entry_grams(self, entry_id):
+        grams = self._grams.get(entry_id)
+        if grams is None:
+            grams = self._grams[entry_id] = [trigrams(k) for k in self._entry_keys(entry_id)]
+        return grams
+
+    def _tier(self, entry_id, query):
+        keys = self._entry_keys(entry_id)
+        if query in keys:
+            return EXACT
+        if any(k.startswith(query) for k in keys):
+            return PREFIX
+        return TOKEN_PREFIX
+
+    def search(self, query, limit=10, province=None):
+        """Return up to ``limit`` ``(score, entry)`` pairs, best first."""
+        query = normalize(query)
+        tokens = query.split()
+        if not tokens:
+            return []
+
+        candidates = None
+        for token in tokens:
+            ids = self._prefix_ids(token)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                break
+        # Filter before the fuzzy gate: hits in other provinces must not crowd it out.
+        in_province = (lambda i: self.entries[i][0] == province) if province else (lambda i: True)
+        scored = {i: (self._tier(i, query), 1.0) for i in candidates or () if in_province(i)}
+
+        if len(scored) < limit:
+            query_grams = trigrams(query)
+            hits = {}
+            for gram in query_grams:
+                for entry_id in self.trigram_postings.get(gram, ()):
+                    hits[entry_id] = hits.get(entry_id, 0) + 1
+            # A candidate needs enough shared trigrams to possibly reach MIN_SIMILARITY.
+            needed = MIN_SIMILARITY * len(query_grams) / 2
+            for entry_id, shared in hits.items():
+                if entry_id in scored or shared < needed or not in_province(entry_id):
+                    continue
+                similarity = max(2.0 * len(query_grams & g) / (len(query_grams) + len(g))
+                                 for g in self._entry_grams(entry_id))
+                if similarity >= MIN_SIMILARITY:
+                    scored[entry_id] = (FUZZY, similarity)
+
+        ranked = sorted(scored.items(),
+                        key=lambda item: (-item[1][0], -item[1][1], len(self.entries[item[0]][2]), item[0]))
+        return [(tier + similarity, self.entries[entry_id]) for entry_id, (tier, similarity) in ranked[:limit]]
+
+
+def _build(cities_path, out_path):
+    with open(cities_path, 'r', encoding='utf-8') as f:
+        cities = json.load(f)
+    index = build_index(cities)
+    data = encode_index(index)
+    write_if_changed(out_path, data)
+    return index, len(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or query the location autocomplete index.')
+    parser.add_argument('--cities', default=CITIES_JSON)
+    parser.add_argument('--out', default=INDEX_PATH)
+    parser.add_argument('--query', '-q', help='run a query against the index instead of only building it')
+    parser.add_argument('--province', help='restrict --query results to a province code')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--force', action='store_true', help='rebuild even when cities.json is unchanged')
+    args = parser.parse_args(argv)
+
+    try:
+        ran, result = run_cached(
+            f'search:{display_path(args.out)}', [args.cities, __file__, textnorm.__file__], [args.out],
+            lambda: _build(args.cities, args.out), force=args.force,
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Error building search index: {e}")
+        return 1
+    if ran:
+        index, size = result
+        print(f"✓ Saved: {display_path(args.out)} ({len(index['entries'])} entries, "
+              f"{len(index['terms'])} terms, {len(index['trigrams'])} trigrams, {size} bytes)")
+
+    if args.query:
+        for score, (code, name_ar, name_en) in LocationIndex.load(args.out).search(args.query, args.limit, args.province):
+            print(f"   {score:.2f}  [{code}] {name_en} / {name_ar}")
+    elif not ran:
+        print(f"• {display_path(args.out)} is up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Pre-joined, chunked bulk-seed artifact for AlgeriaSeeder.
+
+Validates every city in cities.json against provinces.json, drops
+duplicates of the seeder's (province, name_ar) key and writes
+database/seeders/data/cities.seed.json:
+
+    {"version": 1, "source_sha1": "<sha1 of cities.json>",
+     "columns": ["province_code", "name_ar", "name_en"],
+     "chunks": [[["01", "أدرار", "Adrar"], ...], ...]}
+
+Each chunk becomes one multi-row INSERT in the seeder, which resolves all
+province codes with a single query. The seeder ignores the artifact when
+``source_sha1`` no longer matches cities.json. ``--csv`` additionally
+writes the rows as CSV for LOAD DATA INFILE.
+
+    python -m toolchain.seeds
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+
+from .buildcache import run_cached
+from .fsutil import AtomicWriter, write_if_changed
+from .paths import SEED_DATA_DIR, display_path
+
+ARTIFACT_VERSION = 1
+CITIES_JSON = os.path.join(SEED_DATA_DIR, 'cities.json')
+PROVINCES_JSON = os.path.join(SEED_DATA_DIR, 'provinces.json')
+SEED_ARTIFACT = os.path.join(SEED_DATA_DIR, 'cities.seed.json')
+COLUMNS = ('province_code', 'name_ar', 'name_en')
+
+# Rows per INSERT. The seeder binds 5 values per row (with timestamps), so
+# 150 rows stay under SQLite's historical 999-variable limit.
+CHUNK_SIZE = 150
+
+
+def sha1_file(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def resolve_rows(cities, province_codes):
+    """Return ``(rows, problems)``; rows are validated, de-duplicated tuples."""
+    rows = []
+    problems = []
+    seen = set()
+    for index, city in enumerate(cities):
+        code = str(city.get('province_code', '')).zfill(2)
+        name_ar = city.get('name_ar')
+        if not name_ar:
+            problems.append(f'#{index}: missing name_ar')
+            continue
+        if code not in province_codes:
+            problems.append(f'#{index}: unknown province code {code!r} for {name_ar}')
+            continue
+        if (code, name_ar) in seen:
+            problems.append(f'#{index}: duplicate {name_ar} in province {code}')
+            continue
+        seen.add((code, name_ar))
+        rows.append((code, name_ar, city.get('name_en') or name_ar))
+    return rows, problems
+
+
+def encode_artifact(rows, source_sha1, chunk_size=CHUNK_SIZE):
+    header = {
+        'version': ARTIFACT_VERSION,
+        'source_sha1': source_sha1,
+        'columns': list(COLUMNS),
+        'rows': len(rows),
+        'chunk_size': chunk_size,
+    }
+    lines = ['{']
+    lines.extend(f'    {json.dumps(k)}: {json.dumps(v)},' for k, v in header.items())
+    # One row per line keeps the artifact reviewable in diffs.
+    chunks = []
+    for start in range(0, len(rows), chunk_size):
+        chunk_rows = ',\n'.join(f'            {json.dumps(list(r), ensure_ascii=False)}'
+                                for r in rows[start:start + chunk_size])
+        chunks.append(f'        [\n{chunk_rows}\n        ]')
+    lines.append('    "chunks": [' + ('\n' + ',\n'.join(chunks) + '\n    ]' if chunks else ']'))
+    lines.append('}')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def write_csv(rows, path):
+    writer = AtomicWriter(path, newline='')
+    with writer as f:
+        out = csv.writer(f)
+        out.writerow(COLUMNS)
+        out.writerows(rows)
+    return writer.changed
+
+
+def build_seed_artifact(cities_path=CITIES_JSON, provinces_path=PROVINCES_JSON,
+                        out_path=SEED_ARTIFACT, csv_path=None, chunk_size=CHUNK_SIZE):
+    """Build the artifact; returns ``(rows, problems, written)``."""
+    with open(provinces_path, 'r', encoding='utf-8') as f:
+        province_codes = {str(p['code']).zfill(2) for p in json.load(f)}
+    with open(cities_path, 'r', encoding='utf-8') as f:
+        cities = json.load(f)
+
+    rows, problems = resolve_rows(cities, province_codes)
+    written = write_if_changed(out_path, encode_artifact(rows, sha1_file(cities_path), chunk_size))
+    if csv_path:
+        written = write_csv(rows, csv_path) or written
+    return rows, problems, written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the chunked bulk-seed artifact for AlgeriaSeeder.')
+    parser.add_argument('--cities', default=CITIES_JSON)
+    parser.add_argument('--provinces', default=PROVINCES_JSON)
+    parser.add_argument('--out', default=SEED_ARTIFACT)
+    parser.add_argument('--csv', help='also write the rows as CSV (for LOAD DATA INFILE)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--force', action='store_true', help='rebuild even when the inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    try:
+        ran, result = run_cached(
+            f'seeds:{display_path(args.out)}',
+            [args.cities, args.provinces, __file__],
+            [args.out] + ([args.csv] if args.csv else []),
+            lambda: build_seed_artifact(args.cities, args.provinces, args.out, args.csv, args.chunk_size),
+            params={'chunk_size': args.chunk_size},
+            force=args.force,
+            ok=lambda result: not result[1],
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Error building seed artifact: {e}")
+        return 1
+    if not ran:
+        print(f"• {display_path(args.out)} is up to date with {display_path(args.cities)}")
+        return 0
+
+    rows, problems, written = result
+
+    for problem in problems:
+        print(f"✗ {display_path(args.cities)} {problem}")
+    chunks = -(-len(rows) // args.chunk_size)
+    state = 'Saved' if written else 'Unchanged'
+    print(f"✓ {state}: {display_path(args.out)} ({len(rows)} cities in {chunks} chunks)")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,33 @@
+from toolchain.bench import measure, regressions
+
+BASE = {'case@1x': {'seconds': 0.1, 'units': 2.0, 'spread': 0.05, 'peak_bytes': 1000}}
+
+
+def result(units, spread=0.05, peak_bytes=1000):
+    return {'case@1x': {'seconds': units / 20, 'units': units, 'spread': spread, 'peak_bytes': peak_bytes}}
+
+
+def test_slowdowns_past_tolerance_and_noise_floor_are_reported():
+    assert [key for key, _ in regressions(result(3.5), BASE, calibration=0.05)] == ['case@1x']
+
+
+def test_slowdowns_within_tolerance_are_ignored():
+    assert regressions(result(2.9), BASE, calibration=0.05) == []
+
+
+def test_slowdowns_under_the_noise_floor_are_ignored():
+    # +1.5 units is 75 ms here with a 50 ms calibration loop, but the spread puts the floor at 3 units.
+    assert regressions(result(3.5, spread=0.95), BASE, calibration=0.05) == []
+    # A 2 ms calibration loop makes the same slowdown 3 ms, below the default 50 ms floor.
+    assert regressions(result(3.5), BASE, calibration=0.002) == []
+
+
+def test_memory_growth_is_reported():
+    assert [m for _, m in regressions(result(2.0, peak_bytes=2048 * 1024), BASE, calibration=0.05)] == [
+        'peak 0 KB -> 2048 KB']
+
+
+def test_measure_reports_median_units_and_peak():
+    seconds, units, spread, peak = measure(lambda: bytearray(1 << 20), repeat=3)
+    assert seconds > 0 and units > 0 and spread >= 0
+    assert peak >= 1 << 20
@@ -0,0 +1,116 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from toolchain.buildcache import BuildCache, run_cached
+
+
+class Stage:
+    """One cached stage writing ``out.txt`` (its input twice) from ``in.txt``."""
+
+    def __init__(self, tmp_path):
+        self.source, self.target = tmp_path / 'in.txt', tmp_path / 'out.txt'
+        self.cache = BuildCache(path=str(tmp_path / 'cache.json'))
+        self.builds = 0
+        self.source.write_text('a', encoding='utf-8')
+
+    def build(self):
+        self.builds += 1
+        self.target.write_text(self.source.read_text(encoding='utf-8') * 2, encoding='utf-8')
+        return self.builds
+
+    def run(self, params=None, build=None, **options):
+        return run_cached('double', [str(self.source)], [str(self.target)], build or self.build, params,
+                          cache=self.cache, **options)
+
+
+@pytest.fixture
+def stage(tmp_path):
+    stage = Stage(tmp_path)
+    assert stage.run({'scale': 2}) == (True, 1)
+    return stage
+
+
+def test_an_unchanged_stage_is_skipped(stage):
+    mtime = stage.target.stat().st_mtime_ns
+    assert stage.run({'scale': 2}) == (False, None)
+    assert stage.target.stat().st_mtime_ns == mtime
+    assert stage.run({'scale': 2}, force=True) == (True, 2)
+
+
+def test_changed_inputs_outputs_or_params_rebuild(stage):
+    stage.source.write_text('bb', encoding='utf-8')
+    assert stage.run({'scale': 2}) == (True, 2)
+
+    stage.target.write_text('edited', encoding='utf-8')
+    assert stage.run({'scale': 2}) == (True, 3)
+    assert stage.target.read_text(encoding='utf-8') == 'bbbb'
+
+    assert stage.run({'scale': 3}) == (True, 4)
+    assert stage.run({'scale': 3}) == (False, None)
+
+    stage.target.unlink()
+    assert stage.run({'scale': 3}) == (True, 5)
+    assert stage.target.exists()
+
+
+def test_a_failed_build_or_check_leaves_no_entry(stage):
+    def fail():
+        stage.target.write_text('half', encoding='utf-8')
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        stage.run({'scale': 2}, force=True, build=fail)
+    assert 'double' not in stage.cache.stages
+
+    assert stage.run({'scale': 2}, ok=lambda result: False) == (True, 2)
+    assert 'double' not in stage.cache.stages
+    assert stage.run({'scale': 2}) == (True, 3)
+
+    stage.cache.save()
+    assert 'double' in BuildCache.load(stage.cache.path).stages
+    stage.run({'scale': 2}, force=True, ok=lambda result: False)
+    stage.cache.save()
+    assert 'double' not in BuildCache.load(stage.cache.path).stages
+
+
+def test_digests_are_memoized_by_size_and_mtime(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text('one', encoding='utf-8')
+    cache = BuildCache(path=str(tmp_path / 'cache.json'))
+    digest = cache.digest(str(path))
+    assert cache.digest(str(path)) == digest
+    path.write_text('three', encoding='utf-8')
+    assert cache.digest(str(path)) != digest
+    assert cache.digest(str(tmp_path / 'missing.txt')) is None
+
+
+def record_and_save(cache_path, stage):
+    cache = BuildCache.load(cache_path)
+    cache.record(stage, [], [], {'by': stage})
+    return cache.save()
+
+
+def test_save_keeps_entries_written_by_other_processes(tmp_path):
+    cache_path = str(tmp_path / 'cache.json')
+    first, second = BuildCache.load(cache_path), BuildCache.load(cache_path)
+    first.record('a', [], [])
+    second.record('b', [], [])
+    first.save()
+    second.save()
+    assert sorted(BuildCache.load(cache_path).stages) == ['a', 'b']
+
+    # Forgetting a stage removes only that one.
+    third = BuildCache.load(cache_path)
+    third.forget('a')
+    third.save()
+    assert sorted(BuildCache.load(cache_path).stages) == ['b']
+
+    stages = [f'stage{i}' for i in range(16)]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(record_and_save, [cache_path] * len(stages), stages))
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        saved = json.load(f)['stages']
+    assert sorted(saved) == sorted(['b'] + stages)
+    assert saved['stage7']['params'] == {'by': 'stage7'}
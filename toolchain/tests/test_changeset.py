@@ -0,0 +1,72 @@
+import json
+
+from toolchain.changeset import build_changeset, encode_changeset
+
+PROVINCES = [
+    {'code': 1, 'name_ar': 'أدرار', 'name_en': 'Adrar'},
+    {'code': 2, 'name_ar': 'الشلف', 'name_en': 'Chlef'},
+]
+CITIES = [
+    {'province_code': '01', 'name_ar': 'أدرار', 'name_en': 'Adrar'},
+    {'province_code': '01', 'name_ar': 'تمنطيط', 'name_en': 'Tamantit'},
+    {'province_code': '02', 'name_ar': 'الشلف', 'name_en': 'Chlef'},
+]
+
+
+def test_identical_versions_produce_no_changes():
+    changeset, duplicates = build_changeset(PROVINCES, PROVINCES, CITIES, CITIES)
+    empty = {'insert': [], 'update': [], 'delete': []}
+    assert changeset == {'version': 1, 'provinces': empty, 'cities': empty}
+    assert duplicates == []
+
+
+def test_insert_update_delete():
+    provinces = [PROVINCES[0], {'code': '02', 'name_ar': 'الشلف', 'name_en': 'Ech Chlef'},
+                 {'code': '03', 'name_ar': 'الأغواط', 'name_en': 'Laghouat'}]
+    cities = [CITIES[0], {'province_code': '03', 'name_ar': 'الأغواط', 'name_en': 'Laghouat'}]
+    changeset, _ = build_changeset(PROVINCES, provinces, CITIES, cities)
+    assert changeset['provinces'] == {
+        'insert': [{'values': {'code': '03', 'name_ar': 'الأغواط', 'name_en': 'Laghouat'}}],
+        'update': [{'key': {'code': '02'}, 'set': {'name_en': 'Ech Chlef'}}],
+        'delete': [],
+    }
+    assert changeset['cities']['insert'] == [
+        {'values': {'province_code': '03', 'name_ar': 'الأغواط', 'name_en': 'Laghouat'}}]
+    assert changeset['cities']['delete'] == [
+        {'key': {'province_code': '01', 'name_ar': 'تمنطيط'}},
+        {'key': {'province_code': '02', 'name_ar': 'الشلف'}},
+    ]
+
+
+def test_respelled_city_is_an_update_keyed_on_the_old_name():
+    # Same commune without the tatweel (and a zero-less code): one update, no insert/delete.
+    old = [{'province_code': '01', 'name_ar': 'تمنـطيط', 'name_en': 'Tamentit'}]
+    new = [{'province_code': '1', 'name_ar': 'تمنطيط', 'name_en': 'Tamantit'}]
+    changeset, _ = build_changeset([], [], old, new)
+    assert changeset['cities'] == {
+        'insert': [],
+        'update': [{'key': {'province_code': '01', 'name_ar': 'تمنـطيط'},
+                    'set': {'name_ar': 'تمنطيط', 'name_en': 'Tamantit'}}],
+        'delete': [],
+    }
+
+
+def test_missing_name_en_falls_back_to_name_ar():
+    old = [{'province_code': '01', 'name_ar': 'أدرار', 'name_en': 'أدرار'}]
+    new = [{'province_code': '01', 'name_ar': 'أدرار', 'name_en': ''}]
+    changeset, _ = build_changeset([], [], old, new)
+    assert changeset['cities']['update'] == []
+
+
+def test_duplicates_are_reported_and_the_first_row_kept():
+    cities = CITIES + [{'province_code': '01', 'name_ar': 'ادرار', 'name_en': 'Adrar bis'}]
+    changeset, duplicates = build_changeset(PROVINCES, PROVINCES, CITIES, cities)
+    assert duplicates == [('new cities', {'province_code': '01', 'name_ar': 'ادرار', 'name_en': 'Adrar bis'})]
+    assert changeset['cities'] == {'insert': [], 'update': [], 'delete': []}
+
+
+def test_encoded_changeset_is_json_with_one_change_per_line():
+    changeset, _ = build_changeset(PROVINCES, PROVINCES[:1], CITIES, CITIES[:2])
+    data = encode_changeset(changeset)
+    assert json.loads(data) == changeset
+    assert '            {"key": {"name_ar": "الشلف", "province_code": "02"}}' in data.decode('utf-8').splitlines()
@@ -0,0 +1,52 @@
+import filecmp
+import json
+
+import pytest
+
+from toolchain.communes import CITIES_JSON, Commune, import_communes, parse_tuples, read_communes
+from toolchain.paths import COMMUNES_SQL
+
+DUMP = """-- comment
+CREATE TABLE `algeria_cities` (`id` int);
+INSERT INTO `algeria_cities` (`id`, `commune_name`, `commune_name_ascii`, `daira_name`, `daira_name_ascii`,
+ `wilaya_code`, `wilaya_name`, `wilaya_name_ascii`) VALUES
+(2, 'تمنطيط', 'Tamantit', 'فنوغيل', 'Fenoughil', '01', 'أدرار', 'Adrar'),
+(1, 'أدرار', 'Adrar', 'أدرار', 'Adrar', '1', 'أدرار', 'Adrar'),
+(3, 'وادي مزي', 'Oued M'zi', 'تيسمسيلت', 'Tissemsilt', '38', 'تيسمسيلت', 'Tissemsilt');
+INSERT INTO `other` (`id`) VALUES (9);
+"""
+
+
+def test_unescaped_apostrophes_and_escapes_are_recovered():
+    assert list(parse_tuples("('Oued M'zi', 'It''s', 'a\\\\b', NULL, 7);")) == [
+        ["Oued M'zi", "It's", 'a\\b', None, '7']]
+
+
+def test_malformed_tuples_are_rejected():
+    with pytest.raises(ValueError):
+        list(parse_tuples("('unterminated"))
+    with pytest.raises(ValueError):
+        list(parse_tuples('(1 2)'))
+
+
+def test_import_sorts_each_wilaya_and_keeps_dairas(tmp_path):
+    sql = tmp_path / 'algeria_cities.sql'
+    sql.write_text(DUMP, encoding='utf-8')
+    assert [c.id for c in read_communes(str(sql))] == ['2', '1', '3']
+    assert isinstance(next(read_communes(str(sql))), Commune)
+
+    out = tmp_path / 'cities.json'
+    count, wilayas, changed = import_communes(str(sql), str(out))
+    assert (count, sorted(wilayas), changed) == (3, ['01', '38'], True)
+    assert wilayas['01'].communes == 2 and wilayas['01'].dairas == {'Adrar', 'Fenoughil'}
+    cities = json.loads(out.read_text(encoding='utf-8'))
+    assert [c['name_en'] for c in cities] == ['Adrar', 'Tamantit', "Oued M'zi"]
+    assert cities[1] == {'province_code': '01', 'name_ar': 'تمنطيط', 'name_en': 'Tamantit',
+                         'daira_name_ar': 'فنوغيل', 'daira_name_en': 'Fenoughil'}
+    assert import_communes(str(sql), str(out))[2] is False
+
+
+def test_shipped_cities_json_matches_the_dump(tmp_path):
+    out = tmp_path / 'cities.json'
+    assert import_communes(COMMUNES_SQL, str(out))[0] > 1500
+    assert filecmp.cmp(out, CITIES_JSON, shallow=False)
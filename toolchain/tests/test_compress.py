@@ -0,0 +1,102 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from toolchain import compress
+from toolchain.compress import MANIFEST_NAME, MIN_SIZE, precompress
+from toolchain.fsutil import AtomicWriter, drop_precompressed, remove_file, write_if_changed
+
+LARGE = json.dumps({f'faq.question_{i}': f'How do I book appointment number {i}?' for i in range(50)}).encode('utf-8')
+SMALL = b'{"title":"' + b'a' * 200 + b'"}'
+
+
+def decompress(path):
+    data = path.read_bytes()
+    if path.suffix == '.gz':
+        return gzip.decompress(data)
+    return compress.brotli.decompress(data)
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / 'en').mkdir()
+    (tmp_path / 'en' / 'faq.json').write_bytes(LARGE)
+    (tmp_path / 'en' / 'tiny.json').write_bytes(SMALL)
+    return tmp_path
+
+
+def siblings(path):
+    return sorted(p.name for p in path.parent.iterdir() if p.name.startswith(path.name + '.'))
+
+
+def test_variants_decompress_to_the_source(root):
+    manifest, compressed, removed = precompress(str(root), jobs=1)
+    assert (compressed, removed) == (2, [])
+    source = root / 'en' / 'faq.json'
+    names = [f'faq.json{suffix}' for _, suffix in compress.encodings()]
+    assert siblings(source) == sorted(names)
+    for name in names:
+        assert decompress(root / 'en' / name) == LARGE
+    entry = manifest['files']['en/faq.json']
+    assert entry['bytes'] == len(LARGE) and entry['gzip'] == len((root / 'en' / 'faq.json.gz').read_bytes())
+    assert json.loads((root / MANIFEST_NAME).read_text(encoding='utf-8')) == manifest
+
+
+def test_files_below_the_threshold_are_skipped(root):
+    # Compressible, but too small to be worth a variant.
+    assert len(SMALL) < MIN_SIZE and len(gzip.compress(SMALL)) < len(SMALL)
+    manifest, _, _ = precompress(str(root), jobs=1)
+    assert siblings(root / 'en' / 'tiny.json') == []
+    assert manifest['files']['en/tiny.json']['gzip'] is None
+
+    # A lower threshold recompresses without --force.
+    manifest, compressed, _ = precompress(str(root), jobs=1, min_size=1)
+    assert compressed == 2 and manifest['min_size'] == 1
+    assert decompress(root / 'en' / 'tiny.json.gz') == SMALL
+
+
+def test_unchanged_files_are_not_recompressed(root):
+    precompress(str(root), jobs=1)
+    mtime = (root / 'en' / 'faq.json.gz').stat().st_mtime_ns
+    assert precompress(str(root), jobs=1)[1] == 0
+    assert (root / 'en' / 'faq.json.gz').stat().st_mtime_ns == mtime
+
+
+def test_rewriting_a_source_drops_its_variants(root):
+    source = root / 'en' / 'faq.json'
+    precompress(str(root), jobs=1)
+    assert not write_if_changed(str(source), LARGE)
+    assert siblings(source)
+
+    write_if_changed(str(source), LARGE + b' ')
+    assert siblings(source) == []
+    manifest, compressed, _ = precompress(str(root), jobs=1)
+    assert compressed == 1 and decompress(root / 'en' / 'faq.json.gz') == LARGE + b' '
+
+    with AtomicWriter(str(source), 'wb') as f:
+        f.write(LARGE)
+    assert siblings(source) == []
+    precompress(str(root), jobs=1)
+
+    drop_precompressed(str(source))
+    assert siblings(source) == []
+    drop_precompressed(str(root / 'missing.json'))
+
+
+def test_siblings_of_removed_sources_go_too(root):
+    precompress(str(root), jobs=1)
+    gz = root / 'en' / 'faq.json.gz'
+    remove_file(str(root / 'en' / 'faq.json'))
+    assert not gz.exists()
+
+    # A source deleted some other way is cleaned up by the next run.
+    (root / 'en' / 'other.json').write_bytes(LARGE)
+    precompress(str(root), jobs=1)
+    (root / 'en' / 'other.json').unlink()
+    manifest, _, removed = precompress(str(root), jobs=1)
+    assert sorted(os.path.basename(p) for p in removed) == sorted(
+        f'other.json{suffix}' for _, suffix in compress.encodings())
+    assert list(manifest['files']) == ['en/tiny.json']
+    assert siblings(root / 'en' / 'other.json') == []
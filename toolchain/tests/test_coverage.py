@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from toolchain.coverage import CoverageIndex, build_index, discover_sources, main
+
+
+@pytest.fixture
+def lang(tmp_path):
+    lang = tmp_path / 'lang'
+    for locale in ('en', 'fr'):
+        (lang / locale).mkdir(parents=True)
+    (lang / 'php_en.json').write_text(json.dumps({'home.title': 'Home', 'about.title': 'About', 'faq.q1': 'Q1'}),
+                                      encoding='utf-8')
+    (lang / 'php_fr.json').write_text(json.dumps({'home.title': 'Accueil', 'legacy.key': 'Ancien'}),
+                                      encoding='utf-8')
+    (lang / 'php_dysgraphia_en.json').write_text('{"reading.tip": "Tip"}', encoding='utf-8')
+    (lang / 'en' / 'auth.php').write_text(
+        "<?php\nreturn ['failed' => 'Failed', 'throttle' => 'Too many' . ' attempts', 'form' => ['email' => 'Email']];\n",
+        encoding='utf-8')
+    (lang / 'fr' / 'auth.php').write_text("<?php\nreturn array('failed' => 'Échec', 'form' => array('email' => 'E-mail'));\n",
+                                          encoding='utf-8')
+    return lang
+
+
+def test_sources_are_discovered_by_family(lang):
+    found = [(path.rsplit('/', 2)[-2:], family, locale, group) for path, family, locale, group in discover_sources(str(lang))]
+    assert [f[1:] for f in found] == [
+        ('php', 'en', 'auth'), ('php', 'fr', 'auth'), ('dysgraphia', 'en', None), ('json', 'en', None),
+        ('json', 'fr', None)]
+
+
+def test_missing_and_extra_keys_per_family(lang, tmp_path):
+    index = build_index(str(lang), str(tmp_path / 'index.json'))
+    report = index.report('en')
+
+    assert report['json']['reference_keys'] == 3
+    fr = report['json']['locales']['fr']
+    assert (fr['missing'], fr['extra']) == (['about.title', 'faq.q1'], ['legacy.key'])
+    assert report['json']['locales']['ar'] == {'file_missing': True, 'missing': ['about.title', 'faq.q1', 'home.title'],
+                                               'extra': []}
+
+    fr_php = report['php']['locales']['fr']
+    assert report['php']['reference_keys'] == 3
+    assert (fr_php['missing'], fr_php['extra']) == (['auth.throttle'], [])
+    assert report['dysgraphia']['locales']['fr']['file_missing']
+    assert index.errors() == {}
+
+
+def test_only_changed_files_are_parsed_again(lang, tmp_path):
+    index_path = str(tmp_path / 'index.json')
+    assert build_index(str(lang), index_path).stats['parsed'] == 5
+    (lang / 'php_fr.json').write_text('{"home.title": "Accueil", "about.title": "À propos", "faq.q1": "Q1"}',
+                                      encoding='utf-8')
+    (lang / 'fr' / 'auth.php').write_text("<?php\nreturn ['failed' => ", encoding='utf-8')
+    index = build_index(str(lang), index_path)
+    assert (index.stats['parsed'], index.stats['reused']) == (2, 3)
+    assert index.report('en')['json']['locales']['fr']['missing'] == []
+    assert list(index.errors()) == [next(p for p in index.files if p.endswith('auth.php') and '/fr/' in p)]
+    assert CoverageIndex.load(index_path).files == index.files
+
+
+def test_check_fails_on_missing_keys(lang, tmp_path, capsys):
+    args = ['--lang-dir', str(lang), '--index', str(tmp_path / 'index.json'), '--family', 'json']
+    assert main(args) == 0
+    assert main(args + ['--check']) == 1
+    out = capsys.readouterr().out
+    assert '✗ fr: 1/3 (33.3%), 1 not in en' in out and '✗ ar: no file' in out
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from toolchain.fallbacks import build_report, chain_for, dependents, parse_chains, required_locales, resolve, write_report
+
+SOURCES = {
+    'en': {'home.title': 'Home', 'about.title': 'About', 'auth.login': 'Log in'},
+    'fr': {'home.title': 'Accueil', 'about.title': 'À propos'},
+    'fr_CA': {'home.title': 'Bienvenue'},
+    'ar': {'auth.login': 'تسجيل الدخول'},
+    'lt': {},
+}
+
+
+def test_regional_locales_fall_back_to_their_base_then_the_default():
+    assert chain_for('en') == ['en']
+    assert chain_for('lt') == ['lt', 'en']
+    assert chain_for('fr_CA') == ['fr_CA', 'fr', 'en']
+    assert chain_for('pt-BR', {'pt': ['es']}) == ['pt-BR', 'pt', 'es', 'en']
+    # An override replaces the base locale.
+    assert chain_for('fr_CA', {'fr_CA': ['ar']}) == ['fr_CA', 'ar', 'en']
+
+
+def test_fallback_chains_are_followed_and_cycles_end():
+    assert chain_for('lt', {'lt': ['fr'], 'fr': ['ar']}) == ['lt', 'fr', 'ar', 'en']
+    assert chain_for('lt', {'lt': ['fr', 'ar'], 'fr': ['lt']}) == ['lt', 'fr', 'ar', 'en']
+    assert chain_for('en', {'en': ['fr'], 'fr': ['en']}) == ['en', 'fr']
+    assert required_locales(['lt', 'fr_CA'], {'lt': ['ar']}) == ['lt', 'ar', 'en', 'fr_CA', 'fr']
+    assert dependents(['fr'], ['en', 'fr', 'fr_CA', 'lt']) == ['fr', 'fr_CA']
+
+
+def test_parse_chains():
+    assert parse_chains(['lt=fr, en', 'ar=']) == {'lt': ['fr', 'en'], 'ar': []}
+    with pytest.raises(ValueError):
+        parse_chains(['lt'])
+    with pytest.raises(ValueError):
+        parse_chains(['=fr'])
+
+
+def test_each_borrowed_key_records_where_it_came_from():
+    resolved, provenance = resolve(SOURCES, ['fr_CA', 'lt', 'en'], {'lt': ['ar']})
+    assert resolved['fr_CA'] == {'home.title': 'Bienvenue', 'about.title': 'À propos', 'auth.login': 'Log in'}
+    assert provenance['fr_CA'] == {'about.title': 'fr', 'auth.login': 'en'}
+    assert resolved['lt']['auth.login'] == 'تسجيل الدخول'
+    assert provenance['lt'] == {'auth.login': 'ar', 'home.title': 'en', 'about.title': 'en'}
+    assert resolved['en'] == SOURCES['en'] and provenance['en'] == {}
+
+
+def test_unknown_locales_are_skipped():
+    resolved, provenance = resolve(SOURCES, ['lt', 'xx'], {'lt': ['xx', 'fr']})
+    assert list(resolved) == ['lt']
+    assert set(provenance['lt'].values()) == {'fr', 'en'}
+    # Only en left when nothing else exists.
+    assert resolve({'en': SOURCES['en'], 'lt': {}}, None, {'lt': ['xx']})[1]['lt'] == {
+        k: 'en' for k in SOURCES['en']}
+
+
+def test_report_counts_own_and_borrowed_keys(tmp_path):
+    report = build_report(*resolve(SOURCES, ['fr_CA', 'ar']))
+    assert report['chains'] == {'fr_CA': ['fr_CA', 'fr', 'en'], 'ar': ['ar', 'en']}
+    assert report['locales']['fr_CA'] == {'keys': 3, 'own': 1, 'from': {'fr': ['about.title'], 'en': ['auth.login']}}
+
+    path = tmp_path / 'report.json'
+    assert write_report(report, str(path))
+    assert write_report(build_report(*resolve(SOURCES, ['lt'])), str(path))
+    assert sorted(json.loads(path.read_text(encoding='utf-8'))['locales']) == ['ar', 'fr_CA', 'lt']
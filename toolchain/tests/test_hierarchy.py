@@ -0,0 +1,85 @@
+import json
+import os
+from collections import Counter
+
+import pytest
+
+from toolchain.bundles import content_hash
+from toolchain.hierarchy import CITIES_JSON, MANIFEST_NAME, PROVINCES_JSON, build_shards, output_files
+
+PROVINCES = [
+    {'code': '1', 'name_ar': 'أدرار', 'name_en': 'Adrar'},
+    {'code': '16', 'name_ar': 'الجزائر', 'name_en': 'Alger'},
+]
+CITIES = [
+    {'province_code': '01', 'name_ar': 'تمنطيط', 'name_en': 'Tamantit', 'daira_name_ar': 'فنوغيل',
+     'daira_name_en': 'Fenoughil'},
+    {'province_code': 1, 'name_ar': 'فنوغيل', 'name_en': 'Fenoughil', 'daira_name_ar': 'فنوغيل',
+     'daira_name_en': 'Fenoughil'},
+    {'province_code': '16', 'name_ar': 'الابيار', 'name_en': 'El Biar'},
+]
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def shard_cities(out_dir, manifest):
+    """``Counter`` of ``(province_code, name_ar, name_en)`` over every shard."""
+    found = Counter()
+    for code, entry in manifest['provinces'].items():
+        shard = load(os.path.join(out_dir, entry['file']))
+        assert shard['code'] == code
+        for daira in shard['dairas']:
+            found.update((code, c['name_ar'], c['name_en']) for c in daira['communes'])
+    return found
+
+
+def test_communes_are_grouped_by_daira(tmp_path):
+    manifest, written, removed = build_shards(CITIES, PROVINCES, str(tmp_path))
+    assert sorted(written) == sorted([e['file'] for e in manifest['provinces'].values()] + [MANIFEST_NAME])
+    adrar = load(tmp_path / manifest['provinces']['01']['file'])
+    assert [d['name_en'] for d in adrar['dairas']] == ['Fenoughil']
+    assert [c['name_en'] for c in adrar['dairas'][0]['communes']] == ['Fenoughil', 'Tamantit']
+    # A city without a daira is its own daira seat.
+    alger = load(tmp_path / manifest['provinces']['16']['file'])
+    assert alger['dairas'] == [{'name_ar': 'الابيار', 'name_en': 'El Biar',
+                                'communes': [{'name_ar': 'الابيار', 'name_en': 'El Biar'}]}]
+
+    with pytest.raises(ValueError, match='unknown province 31'):
+        build_shards(CITIES + [{'province_code': '31', 'name_ar': 'وهران', 'name_en': 'Oran'}], PROVINCES,
+                     str(tmp_path))
+
+
+def test_stale_shards_are_pruned_and_other_files_kept(tmp_path):
+    (tmp_path / 'search-index.json').write_text('{}', encoding='utf-8')
+    first, _, _ = build_shards(CITIES, PROVINCES, str(tmp_path))
+    manifest, written, removed = build_shards(CITIES[:2], PROVINCES, str(tmp_path))
+    assert removed == [first['provinces']['16']['file']] and manifest['provinces']['16']['communes'] == 0
+    assert written == [manifest['provinces']['16']['file'], MANIFEST_NAME]
+    assert (tmp_path / 'search-index.json').exists()
+    assert build_shards(CITIES[:2], PROVINCES, str(tmp_path))[1:] == ([], [])
+
+
+def test_every_city_is_in_exactly_one_shard(tmp_path):
+    cities, provinces = load(CITIES_JSON), load(PROVINCES_JSON)
+    manifest, _, _ = build_shards(cities, provinces, str(tmp_path))
+    expected = Counter((str(c['province_code']).zfill(2), c['name_ar'], c['name_en']) for c in cities)
+    assert shard_cities(str(tmp_path), manifest) == expected
+    assert len(manifest['provinces']) == len(provinces)
+
+
+def test_the_manifest_matches_the_shard_files(tmp_path):
+    manifest, _, _ = build_shards(load(CITIES_JSON), load(PROVINCES_JSON), str(tmp_path))
+    assert load(tmp_path / MANIFEST_NAME) == manifest
+    listed = sorted(os.path.basename(p) for p in output_files(str(tmp_path)))
+    assert listed == sorted(os.listdir(tmp_path))
+    for code, entry in manifest['provinces'].items():
+        data = (tmp_path / entry['file']).read_bytes()
+        shard = json.loads(data)
+        assert entry['file'] == f'{code}.{content_hash(data)}.json'
+        assert entry['bytes'] == len(data)
+        assert (entry['name_ar'], entry['name_en']) == (shard['name_ar'], shard['name_en'])
+        assert entry['dairas'] == len(shard['dairas'])
+        assert entry['communes'] == sum(len(d['communes']) for d in shard['dairas'])
@@ -0,0 +1,67 @@
+import json
+
+from toolchain.jsonlint import _Scanner, lint_file, lint_text
+
+
+def codes(issues):
+    return [i.code for i in issues]
+
+
+def test_clean_text_has_no_issues():
+    assert lint_text('{"a": {"b": [1, 2]}, "c": "d"}') == ([], None)
+
+
+def test_escaped_quotes_are_unescaped():
+    text = '{"welcome": {"title": "Hi",\\"github\\":\\"GitHub\\"}}'
+    issues, repaired = lint_text(text)
+    assert codes(issues) == ['escaped-quote', 'escaped-quote']
+    assert (issues[0].line, issues[0].column) == (1, 28)
+    assert repaired == '{"welcome": {"title": "Hi","github":"GitHub"}}'
+
+
+def test_earlier_duplicate_keys_are_dropped():
+    text = '{\n  "a": 1,\n  "b": {"x": 1, "x": 2},\n  "a": 3\n}'
+    issues, repaired = lint_text(text)
+    assert codes(issues) == ['duplicate-key', 'duplicate-key']
+    assert "(first defined at 2:3)" in issues[1].message
+    assert repaired == '{\n  "b": {"x": 2},\n  "a": 3\n}'
+    assert json.loads(repaired) == json.loads(text)
+
+
+def test_trailing_commas_are_removed():
+    issues, repaired = lint_text('{"a": [1, 2, ], "b": {"c": 1,\n},\n}')
+    assert codes(issues) == ['trailing-comma'] * 3
+    assert all(i.fixable for i in issues)
+    assert repaired == '{"a": [1, 2 ], "b": {"c": 1\n}\n}'
+
+
+def test_syntax_errors_are_not_repaired():
+    issues, repaired = lint_text('{"a": 1,, "b": [1,]}')
+    assert codes(issues) == ['syntax']
+    assert not issues[0].fixable and repaired is None
+
+
+def test_fix_rewrites_fixable_files_only(tmp_path):
+    fixable = tmp_path / 'php_en.json'
+    fixable.write_text('{"a": 1, "a": 2,}', encoding='utf-8')
+    result = lint_file(str(fixable), fix=True)
+    assert result.fixed and codes(result.issues) == ['duplicate-key', 'trailing-comma']
+    assert fixable.read_text(encoding='utf-8') == '{"a": 2}'
+
+    broken = tmp_path / 'php_fr.json'
+    broken.write_bytes('{"a": 1,, "b": 2,}'.encode('utf-8'))
+    result = lint_file(str(broken), fix=True)
+    assert not result.fixed and 'syntax' in codes(result.issues)
+    assert broken.read_bytes() == '{"a": 1,, "b": 2,}'.encode('utf-8')
+
+
+def test_clean_files_are_left_byte_identical(tmp_path):
+    clean = tmp_path / 'php_ar.json'
+    data = '{\n    "a": "\\u0645\\"x",\n    "b": [\n        1\n    ]\n}\n'.encode('utf-8')
+    clean.write_bytes(data)
+    mtime = clean.stat().st_mtime_ns
+    result = lint_file(str(clean), fix=True)
+    assert (result.issues, result.fixed, result.error) == ([], False, None)
+    assert clean.read_bytes() == data and clean.stat().st_mtime_ns == mtime
+    text = data.decode('utf-8')
+    assert _Scanner(text).scan().repaired() == text
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from toolchain.jsonpatch import patch_file, patch_text
+
+INDENTED = '{\n    "a": "1",\n    "b": "2",\n    "c": "3"\n}\n'
+
+
+def test_only_changed_values_are_spliced():
+    patch = patch_text(INDENTED, {'b': 'two', 'c': '3'})
+    assert patch.text == '{\n    "a": "1",\n    "b": "two",\n    "c": "3"\n}\n'
+    assert (patch.added, patch.updated, patch.removed) == ([], ['b'], [])
+
+
+def test_new_keys_follow_the_file_style():
+    assert patch_text(INDENTED, {'d': 'é'}).text == '{\n    "a": "1",\n    "b": "2",\n    "c": "3",\n    "d": "é"\n}\n'
+    assert patch_text('{"a": 1}', {'b': 2}).text == '{"a": 1, "b": 2}'
+    assert patch_text('{}', {'a': 1}).text == '{"a":1}'
+
+
+def test_removed_runs_take_one_separator():
+    assert patch_text(INDENTED, {}, remove=('a', 'b')).text == '{\n    "c": "3"\n}\n'
+    assert patch_text(INDENTED, {}, remove=('b', 'c')).text == '{\n    "a": "1"\n}\n'
+    assert json.loads(patch_text(INDENTED, {}, remove=('a', 'b', 'c')).text) == {}
+
+
+def test_result_matches_a_full_reserialization():
+    changes = {'a': 'x', 'd': ['y'], 'e': None}
+    patch = patch_text(INDENTED, changes, remove=('b',))
+    expected = {**json.loads(INDENTED), **changes}
+    del expected['b']
+    assert json.loads(patch.text) == expected
+
+
+def test_no_effective_change_returns_the_same_string():
+    patch = patch_text(INDENTED, {'a': '1'}, remove=('missing',))
+    assert patch.text is INDENTED
+    assert (patch.added, patch.updated, patch.removed) == ([], [], [])
+
+
+def test_last_duplicate_is_patched():
+    assert patch_text('{"a": 1, "a": 2}', {'a': 3}).text == '{"a": 1, "a": 3}'
+
+
+def test_conflicting_change_and_remove_is_rejected():
+    with pytest.raises(ValueError):
+        patch_text(INDENTED, {'a': 'x'}, remove=('a',))
+
+
+def test_invalid_json_is_rejected():
+    with pytest.raises(json.JSONDecodeError):
+        patch_text('{"a": 1,}', {'b': 2})
+
+
+def test_patch_file_leaves_unchanged_files_alone(tmp_path):
+    path = tmp_path / 'en.json'
+    path.write_text(INDENTED, encoding='utf-8')
+    mtime = path.stat().st_mtime_ns
+    patch_file(str(path), {'a': '1'})
+    assert path.stat().st_mtime_ns == mtime
+    patch_file(str(path), {'a': 'one'})
+    assert json.loads(path.read_text(encoding='utf-8'))['a'] == 'one'
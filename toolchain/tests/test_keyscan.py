@@ -0,0 +1,73 @@
+from toolchain.keyscan import KeyUsage, scan, scan_text
+
+KEYS = {
+    'nav.home': 'Home',
+    'nav.about': 'About',
+    'faq.intro_title': 'FAQ',
+    'faq.item_1': 'One',
+    'faq.item_2': 'Two',
+    'faq.title': 'Title',
+    'appointments.pending': 'Pending',
+    'appointments.done': 'Done',
+    'auth.failed': 'Failed',
+    'auth.throttle': 'Throttled',
+    'unused.key': 'Nobody',
+}
+
+
+def usage(*sources):
+    return KeyUsage({f'file{i}.vue': scan_text(text) for i, text in enumerate(sources)})
+
+
+def test_every_call_form_is_recognised():
+    result = scan_text("""
+        {{ $t('nav.home') }} {{ t("nav.about") }}
+        __('auth.failed'); trans(`auth.throttle`); wTransChoice('faq.title', 2)
+        format('not.a.call'); it('ignores.it'); $t( 'nav.home' )
+    """)
+    assert result['calls'] == ['auth.failed', 'auth.throttle', 'faq.title', 'nav.about', 'nav.home']
+    assert result['literals'] == ['ignores.it', 'not.a.call']
+    assert result['computed'] == 0
+
+
+def test_template_and_concatenated_keys_become_prefixes():
+    result = scan_text("""
+        t(`appointments.${status}`)
+        const key = `faq.item_${n}`
+        $t('faq.' + section + '.title'); __(prefix + '.x'); t(item.titleKey)
+    """)
+    assert result['prefixes'] == ['appointments.', 'faq.', 'faq.item_']
+    assert result['calls'] == [] and result['computed'] == 2
+
+
+def test_dynamic_prefixes_protect_every_key_under_them():
+    used = usage("t(`appointments.${status}`)", "const k = `faq.item_${n}`; $t(k)", "$t('nav.' + name)")
+    assert used.unused(KEYS) == ['auth.failed', 'auth.throttle', 'faq.intro_title', 'faq.title', 'unused.key']
+    assert used.is_used('faq.item_99') and not used.is_used('faq.items')
+
+
+def test_literals_count_as_used_and_only_calls_can_be_missing():
+    used = usage("const items = [{ titleKey: 'faq.intro_title' }]; $t(item.titleKey)",
+                 "t('auth.failed'); t('auth.gone')")
+    assert used.is_used('faq.intro_title') and used.is_used('auth.failed')
+    assert used.missing(KEYS) == ['auth.gone']
+    assert used.calls['auth.gone'] == ['file1.vue']
+    assert used.filter({'faq.intro_title': 'FAQ', 'unused.key': 'x'}) == {'faq.intro_title': 'FAQ'}
+
+
+def test_scan_reuses_unchanged_files(tmp_path):
+    sources = tmp_path / 'js'
+    (sources / 'node_modules').mkdir(parents=True)
+    (sources / 'node_modules' / 'lib.js').write_text("t('vendor.key')", encoding='utf-8')
+    (sources / 'App.vue').write_text("$t('nav.home')", encoding='utf-8')
+    (sources / 'util.ts').write_text("t(`faq.${id}`)", encoding='utf-8')
+    index = str(tmp_path / 'index.json')
+
+    used, stats = scan(str(sources), index, jobs=1)
+    assert (stats['files'], stats['scanned']) == (2, 2)
+    assert sorted(used.calls) == ['nav.home'] and used.prefixes == {'faq.'}
+
+    (sources / 'App.vue').write_text("$t('nav.about')", encoding='utf-8')
+    used, stats = scan(str(sources), index, jobs=1)
+    assert (stats['scanned'], stats['reused']) == (1, 1)
+    assert sorted(used.calls) == ['nav.about'] and used.prefixes == {'faq.'}
@@ -0,0 +1,71 @@
+import csv
+import datetime
+import filecmp
+import os
+
+from toolchain.loadgen import TABLES, generate, role_sql, sqlite_script
+
+LOCATIONS = [(1, 1), (1, 2), (16, 3), (31, 4)]
+
+
+def run(out_dir, **options):
+    os.makedirs(out_dir, exist_ok=True)
+    options = {'doctors': 20, 'partners': 50, 'chunk_rows': 40, 'locations': LOCATIONS, **options}
+    writers = generate(str(out_dir), **options)
+    return {table: [os.path.basename(p) for p in writer.files] for table, writer in writers.items()}
+
+
+def read(out_dir, files):
+    rows = []
+    for name in files:
+        with open(os.path.join(out_dir, name), newline='', encoding='utf-8') as f:
+            rows += list(csv.DictReader(f))
+    return rows
+
+
+def test_same_seed_gives_identical_files(tmp_path):
+    first = run(tmp_path / 'a')
+    assert run(tmp_path / 'b') == first
+    for files in first.values():
+        for name in files:
+            assert filecmp.cmp(tmp_path / 'a' / name, tmp_path / 'b' / name, shallow=False)
+    run(tmp_path / 'c', seed=2)
+    assert not filecmp.cmp(tmp_path / 'a' / 'users.0001.csv', tmp_path / 'c' / 'users.0001.csv', shallow=False)
+
+
+def test_tables_are_split_into_chunks_with_headers(tmp_path):
+    files = run(tmp_path)
+    users = read(tmp_path, files['users'])
+    assert files['users'] == ['users.0001.csv', 'users.0002.csv']
+    assert [int(u['id']) for u in users] == list(range(1, 71))
+    with open(tmp_path / 'users.0002.csv', newline='', encoding='utf-8') as f:
+        assert next(csv.reader(f)) == list(TABLES['users'])
+
+
+def test_appointments_sit_on_their_providers_slot_grid(tmp_path):
+    files = run(tmp_path)
+    durations = {p['id']: int(p['slot_duration']) for p in read(tmp_path, files['provider_profiles'])}
+    children = {c['id']: c['partner_id'] for c in read(tmp_path, files['children'])}
+    appointments = read(tmp_path, files['appointments'])
+    assert appointments
+    for appointment in appointments:
+        start = datetime.datetime.strptime(appointment['start_time'], '%H:%M:%S')
+        end = datetime.datetime.strptime(appointment['end_time'], '%H:%M:%S')
+        minutes = durations[appointment['provider_profile_id']]
+        assert end - start == datetime.timedelta(minutes=minutes)
+        assert (start.hour * 60 + start.minute - 8 * 60) % minutes == 0
+        assert end.hour * 60 + end.minute <= 17 * 60
+        assert children[appointment['child_id']] == appointment['user_id']
+
+
+def test_empty_tables_are_left_out_of_the_sqlite_script(tmp_path):
+    files = run(tmp_path, partners=0)
+    assert files['children'] == files['appointments'] == []
+    files['specializations'] = ['specializations.csv']
+    script = sqlite_script(files, role_sql(20, 0))
+    assert '_loadgen_children' not in script and '_loadgen_appointments' not in script
+    assert '.import --csv provider_profiles.0001.csv _loadgen_provider_profiles' in script
+    assert "r.name = 'partner'" not in script
+
+    files = run(tmp_path / 'none', appointments_per_child=0)
+    assert files['children'] and files['appointments'] == []
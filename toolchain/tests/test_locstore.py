@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from toolchain.locstore import LocationStore, open_store, sha1_file
+
+CITIES = [
+    {'province_code': '16', 'name_ar': 'الجزائر الوسطى', 'name_en': 'Alger Centre',
+     'daira_name_ar': 'سيدي امحمد', 'daira_name_en': 'Sidi M\'Hamed'},
+    {'province_code': 1, 'name_ar': 'أدرار', 'name_en': 'Adrar', 'daira_name_ar': 'أدرار', 'daira_name_en': 'Adrar'},
+    {'province_code': '01', 'name_ar': 'تمنطيط', 'name_en': 'Tamantit'},
+    {'province_code': '16', 'name_ar': 'باب الوادي', 'name_en': 'Bab El Oued',
+     'daira_name_ar': 'باب الوادي', 'daira_name_en': 'Bab El Oued'},
+]
+
+
+def expected_rows():
+    rows = []
+    for city in sorted(CITIES, key=lambda c: str(c['province_code']).zfill(2)):
+        rows.append({'province_code': str(city['province_code']).zfill(2), 'name_ar': city['name_ar'],
+                     'name_en': city['name_en'], 'daira_name_ar': city.get('daira_name_ar', ''),
+                     'daira_name_en': city.get('daira_name_en', '')})
+    return rows
+
+
+def test_records_are_grouped_by_province():
+    store = LocationStore.from_records(CITIES)
+    assert list(store) == expected_rows()
+    assert store.province_rows('1') == range(0, 2)
+    assert store.province_rows(16) == range(2, 4)
+    assert store.province_rows('48') == range(0, 0)
+
+
+def test_find_matches_either_name_within_the_province():
+    store = LocationStore.from_records(CITIES)
+    assert store.row(store.find('01', 'Tamantit'))['name_ar'] == 'تمنطيط'
+    assert store.row(store.find('16', 'باب الوادي'))['name_en'] == 'Bab El Oued'
+    assert store.find('01', 'Bab El Oued') is None
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_snapshot_round_trip(tmp_path, use_mmap):
+    store = LocationStore.from_records(CITIES, 'ab' * 20)
+    path = tmp_path / 'locations.snapshot'
+    path.write_bytes(store.encode())
+    with LocationStore.load(str(path), use_mmap=use_mmap) as loaded:
+        assert len(loaded) == len(CITIES)
+        assert list(loaded) == expected_rows()
+        assert loaded.provinces == store.provinces
+        assert loaded.source_sha1 == 'ab' * 20
+        assert loaded.column('name_en') == store.column('name_en')
+        assert loaded.find('16', 'Alger Centre') == store.find('16', 'Alger Centre')
+
+
+def test_truncated_snapshot_is_rejected(tmp_path):
+    path = tmp_path / 'locations.snapshot'
+    path.write_bytes(LocationStore.from_records(CITIES).encode()[:-8])
+    with pytest.raises(ValueError):
+        LocationStore.load(str(path), use_mmap=False)
+    path.write_bytes(b'nope' + bytes(40))
+    with pytest.raises(ValueError):
+        LocationStore.load(str(path), use_mmap=False)
+
+
+def test_open_store_rebuilds_a_stale_snapshot(tmp_path):
+    cities_path = tmp_path / 'cities.json'
+    snapshot_path = tmp_path / 'locations.snapshot'
+    cities_path.write_text(json.dumps(CITIES, ensure_ascii=False), encoding='utf-8')
+    with open_store(str(cities_path), str(snapshot_path)) as store:
+        assert store.source_sha1 == sha1_file(str(cities_path))
+        assert len(store) == 4
+    cities_path.write_text(json.dumps(CITIES[:1], ensure_ascii=False), encoding='utf-8')
+    with open_store(str(cities_path), str(snapshot_path)) as store:
+        assert list(store) == [expected_rows()[2]]
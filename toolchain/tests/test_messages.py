@@ -0,0 +1,40 @@
+from toolchain.messages import UCFIRST, UPPER, check_placeholders, compile_message, load_families, placeholders
+
+
+def test_placeholders_fold_case_variants_and_braces():
+    assert placeholders('Hello :name, :Name, :NAME') == {'name'}
+    assert placeholders('Minimum Experience: {years} years') == {'years'}
+    assert placeholders('Ratio 3:2 at 10:30') == set()
+    assert placeholders(['not', 'a', 'string']) == set()
+
+
+def test_plain_messages_stay_strings():
+    assert compile_message('No placeholders here') == 'No placeholders here'
+    assert compile_message('Time: 10:30') == 'Time: 10:30'
+    assert compile_message(None) is None
+
+
+def test_compiled_slots_keep_their_original_token():
+    assert compile_message('Welcome, :name') == ['Welcome, ', ['name']]
+    assert compile_message('Minimum Experience: {years} years') == [
+        'Minimum Experience: ', ['years', 0, '{years}'], ' years']
+    assert compile_message(':Attribute is required') == [['attribute', UCFIRST, ':Attribute'], ' is required']
+    assert compile_message('STOP :NAME!') == ['STOP ', ['name', UPPER, ':NAME'], '!']
+
+
+def test_check_placeholders_reports_missing_and_extra():
+    by_locale = {
+        'en': {'greeting': 'Hi :name', 'count': ':count items', 'plain': 'Hello'},
+        'fr': {'greeting': 'Salut :Name', 'count': 'articles', 'plain': 'Bonjour :user', 'extra': ':x'},
+    }
+    assert check_placeholders(by_locale) == [
+        ('count', 'fr', ['count'], []),
+        ('plain', 'fr', [], ['user']),
+    ]
+
+
+def test_shipped_translations_agree_on_placeholders():
+    loaded, errors = load_families()
+    assert errors == {}
+    for family, by_locale in loaded.items():
+        assert check_placeholders(by_locale) == [], family
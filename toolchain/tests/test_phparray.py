@@ -0,0 +1,59 @@
+import pytest
+
+from toolchain.phparray import PhpParseError, flatten, loads
+
+
+def test_short_and_long_array_syntax():
+    assert loads("<?php\nreturn ['a' => 'A', 'b' => 'B'];") == {'a': 'A', 'b': 'B'}
+    assert loads("<?php return array('a' => 'A', 'b' => array('c' => 'C'),);") == {'a': 'A', 'b': {'c': 'C'}}
+    assert loads('<?php return [];') == {}
+
+
+def test_string_concatenation():
+    assert loads("<?php return ['a' => 'Hello, ' . \"world\" . '!'];") == {'a': 'Hello, world!'}
+    with pytest.raises(PhpParseError):
+        loads("<?php return ['a' => 'x' . 1];")
+
+
+def test_single_quoted_escapes():
+    # Only \\ and \' are escapes in single quotes; \n stays literal.
+    assert loads(r"<?php return ['a' => 'It\'s a \\ and a \n'];") == {'a': "It's a \\ and a \\n"}
+
+
+def test_double_quoted_escapes():
+    assert loads(r'<?php return ["a" => "Say \"hi\"\n\tand \$name \\ \q"];') == {'a': 'Say "hi"\n\tand $name \\ \\q'}
+
+
+def test_comments_scalars_and_implicit_keys():
+    text = """<?php
+    // line comment
+    # hash comment
+    return [
+        /* block
+           comment */
+        'count' => 3,
+        'ratio' => 1.5,
+        'on' => true,
+        'off' => null,
+        '7' => 'numeric string key',
+        'list' => ['first', 'second', 5 => 'fifth', 'sixth'],
+    ];
+    """
+    assert loads(text) == {'count': 3, 'ratio': 1.5, 'on': True, 'off': None, 7: 'numeric string key',
+                           'list': {0: 'first', 1: 'second', 5: 'fifth', 6: 'sixth'}}
+
+
+def test_nested_keys_flatten_to_dotted_form():
+    messages = loads("<?php return ['title' => 'T', 'form' => ['name' => 'N', 'errors' => ['required' => 'R']]];")
+    assert flatten(messages, 'auth') == {'auth.title': 'T', 'auth.form.name': 'N', 'auth.form.errors.required': 'R'}
+    assert flatten({'list': {0: 'a'}}) == {'list.0': 'a'}
+
+
+def test_errors_report_line_and_column():
+    with pytest.raises(PhpParseError) as error:
+        loads("<?php\nreturn [\n    'a' => 'A'\n    'b' => 'B',\n];")
+    assert (error.value.line, error.value.column) == (4, 5)
+    with pytest.raises(PhpParseError):
+        loads("<?php $x = ['a' => 'A']; return $x;")
+    with pytest.raises(PhpParseError):
+        loads("<?php return ['a' => 'A']; echo 'x';")
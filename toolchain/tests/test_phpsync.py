@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from toolchain.phpsync import PhpLangCache, plan_sync, sync
+
+
+@pytest.fixture
+def tree(tmp_path):
+    lang = tmp_path / 'lang'
+    (lang / 'en').mkdir(parents=True)
+    (lang / 'en' / 'auth.php').write_text(
+        "<?php\nreturn ['login' => 'Log in', 'form' => ['email' => 'Email'], 'old' => 'Old'];\n", encoding='utf-8')
+    (lang / 'php_en.json').write_text('{\n    "json_only": "Kept"\n}\n', encoding='utf-8')
+    return lang, PhpLangCache(path=str(tmp_path / 'cache.json'))
+
+
+def run(tree, **options):
+    lang, cache = tree
+    results, _ = sync(str(lang), ['en'], cache=cache, **options)
+    return results[0], json.loads((lang / 'php_en.json').read_text(encoding='utf-8'))
+
+
+def write_php(tree, body):
+    lang, _ = tree
+    (lang / 'en' / 'auth.php').write_text(f'<?php\nreturn {body};\n', encoding='utf-8')
+
+
+def test_php_keys_are_flattened_into_the_json(tree):
+    result, messages = run(tree)
+    assert messages == {'json_only': 'Kept', 'auth.login': 'Log in', 'auth.form.email': 'Email', 'auth.old': 'Old'}
+    assert (result.added, result.updated, result.removed, result.conflicts) == (3, 0, 0, [])
+
+
+def test_keys_deleted_from_php_are_removed_but_json_only_keys_stay(tree):
+    run(tree)
+    write_php(tree, "['login' => 'Sign in', 'form' => ['email' => 'Email']]")
+    result, messages = run(tree)
+    assert messages == {'json_only': 'Kept', 'auth.login': 'Sign in', 'auth.form.email': 'Email'}
+    assert (result.updated, result.removed, result.conflicts) == (1, 1, [])
+
+
+def test_values_edited_in_json_are_reported_not_overwritten(tree):
+    lang, _ = tree
+    (lang / 'php_en.json').write_text('{"auth.login": "Sign in here"}', encoding='utf-8')
+    result, messages = run(tree)
+    assert messages['auth.login'] == 'Sign in here'
+    assert result.conflicts == [('auth.login', 'Sign in here', 'Log in')]
+
+    # Still a conflict on the next sync, and when PHP removes the key.
+    assert run(tree)[0].conflicts == [('auth.login', 'Sign in here', 'Log in')]
+    write_php(tree, "['form' => ['email' => 'Email']]")
+    result, messages = run(tree)
+    assert messages['auth.login'] == 'Sign in here'
+    assert result.conflicts == [('auth.login', 'Sign in here', None)]
+
+
+def test_prefer_php_overwrites_conflicts(tree):
+    lang, _ = tree
+    (lang / 'php_en.json').write_text('{"auth.login": "Sign in here"}', encoding='utf-8')
+    result, messages = run(tree, prefer_php=True)
+    assert messages['auth.login'] == 'Log in'
+    assert (result.updated, result.conflicts) == (1, [])
+
+
+def test_keys_owned_by_a_pack_are_left_alone(tree):
+    result, messages = run(tree, packs=[{'en': {'auth.login': 'From pack'}}])
+    assert 'auth.login' not in messages
+    assert result.conflicts == []
+
+
+def test_a_file_that_fails_to_parse_changes_nothing(tree):
+    run(tree)
+    lang, _ = tree
+    before = (lang / 'php_en.json').read_bytes()
+    write_php(tree, "['login' => 'Log in'")
+    result, _ = run(tree)
+    assert result.error and 'auth.php' in result.error
+    assert (lang / 'php_en.json').read_bytes() == before
+
+
+def test_plan_sync_three_way_rules():
+    synced = {'a': 'A', 'b': 'B', 'gone': 'G', 'edited_gone': 'E'}
+    current = {'a': 'A', 'b': 'B (edited)', 'c': 'C (edited)', 'gone': 'G', 'edited_gone': 'E (edited)'}
+    keys = {'a': 'A2', 'b': 'B2', 'c': 'C', 'new': 'N'}
+    changes, remove, conflicts = plan_sync(keys, current, synced)
+    assert changes == {'a': 'A2', 'new': 'N'}
+    assert remove == ['gone']
+    assert sorted(conflicts) == [('b', 'B (edited)', 'B2'), ('c', 'C (edited)', 'C'),
+                                 ('edited_gone', 'E (edited)', None)]
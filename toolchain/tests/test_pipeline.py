@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+from toolchain import __main__ as cli, pipeline
+from toolchain.pipeline import FAILED, OK, SKIPPED, Stage, StageResult, order, resolve, run_graph
+
+STAGES = {s.name: s for s in (
+    Stage('source', 'm.source', (), (), True),
+    Stage('left', 'm.left', ('source',), (), True),
+    Stage('right', 'm.right', ('source',), (), True),
+    Stage('join', 'm.join', ('left', 'right'), (), True),
+    Stage('lint', 'm.lint', (), (), False),
+)}
+
+
+class Runner:
+    """Stands in for run_stage; records the order stages start in."""
+
+    def __init__(self, failing=(), raising=()):
+        self.failing, self.raising = failing, raising
+        self.started = []
+        self.forced = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, stage, root, force=False):
+        with self._lock:
+            self.started.append(stage.name)
+            self.forced[stage.name] = force
+        if stage.name in self.raising:
+            raise OSError('no such module')
+        return StageResult(stage.name, FAILED if stage.name in self.failing else OK, 0.0, f'{stage.name}\n')
+
+
+def statuses(results):
+    return {r.name: r.status for r in results}
+
+
+def test_resolve_adds_dependencies_in_graph_order():
+    assert resolve(['join'], STAGES) == ['source', 'left', 'right', 'join']
+    assert resolve(['join'], STAGES, with_deps=False) == ['join']
+    assert resolve(None, STAGES) == list(STAGES)
+    with pytest.raises(KeyError, match='nope'):
+        resolve(['left', 'nope'], STAGES)
+
+
+def test_order_rejects_cycles():
+    assert order(['join', 'left', 'source', 'right'], STAGES) == ['source', 'left', 'right', 'join']
+    cyclic = dict(STAGES, source=Stage('source', 'm.source', ('join',), (), True))
+    with pytest.raises(ValueError, match='cycle'):
+        order(list(cyclic), cyclic)
+    with pytest.raises(ValueError):
+        run_graph(list(cyclic), '/tmp', stages=cyclic, runner=Runner())
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_stages_start_after_their_dependencies(jobs):
+    runner = Runner()
+    done = []
+    results = run_graph(list(STAGES), '/tmp', jobs=jobs, stages=STAGES, runner=runner, on_done=done.append)
+    assert statuses(results) == dict.fromkeys(STAGES, OK)
+    assert done == results
+    started = runner.started
+    assert started.index('source') < started.index('left') < started.index('join')
+    assert started.index('right') < started.index('join')
+
+
+def test_dependents_of_a_failed_stage_are_skipped():
+    results = run_graph(list(STAGES), '/tmp', stages=STAGES, runner=Runner(failing=['left']))
+    assert statuses(results) == {'source': OK, 'left': FAILED, 'right': OK, 'join': SKIPPED, 'lint': OK}
+
+    runner = Runner(raising=['source'])
+    results = run_graph(list(STAGES), '/tmp', stages=STAGES, runner=runner)
+    assert statuses(results) == {'source': FAILED, 'left': SKIPPED, 'right': SKIPPED, 'join': SKIPPED, 'lint': OK}
+    assert sorted(runner.started) == ['lint', 'source']
+    assert next(r for r in results if r.name == 'source').output == 'no such module\n'
+
+
+def test_force_is_passed_to_every_stage():
+    runner = Runner()
+    run_graph(['lint', 'source'], '/tmp', force=True, stages=STAGES, runner=runner)
+    assert runner.forced == {'lint': True, 'source': True}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / 'artisan').write_text('', encoding='utf-8')
+    monkeypatch.setenv('TOOLCHAIN_ROOT', str(tmp_path))
+    return tmp_path
+
+
+def fake_graph(monkeypatch, runner):
+    monkeypatch.setattr(pipeline, 'run_graph',
+                        lambda names, root, **options: run_graph(names, root, runner=runner, **options))
+
+
+def test_build_exit_codes(project, monkeypatch, capsys):
+    fake_graph(monkeypatch, Runner())
+    assert cli.main(['--root', str(project), 'build', 'seeds']) == 0
+    out = capsys.readouterr().out
+    assert '✓ communes' in out and '✓ seeds' in out and '2/2 stages succeeded' in out
+
+    fake_graph(monkeypatch, Runner(failing=['communes']))
+    assert cli.main(['--root', str(project), 'build', 'seeds', 'lint']) == 1
+    out = capsys.readouterr().out
+    assert '✗ communes' in out and '• seeds (dependency failed)' in out and '1/3 stages succeeded' in out
+
+    assert cli.main(['--root', str(project), 'build', 'nope']) == 2
+    assert '✗ unknown stage(s): nope' in capsys.readouterr().out
+
+
+def test_missing_project_root_exits_2(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('TOOLCHAIN_ROOT', str(tmp_path))
+    assert cli.main(['graph']) == 2
+    assert 'artisan' in capsys.readouterr().out
+
+
+def test_run_stage_reports_the_module_exit_code(tmp_path):
+    (tmp_path / 'lang').mkdir()
+    (tmp_path / 'lang' / 'php_en.json').write_text('{"a": "b"}', encoding='utf-8')
+    lint = pipeline.STAGES['lint']
+    assert pipeline.run_stage(lint, str(tmp_path)).status == OK
+
+    (tmp_path / 'lang' / 'php_en.json').write_text('{"a": "b",, }', encoding='utf-8')
+    result = pipeline.run_stage(lint, str(tmp_path), force=True)
+    assert result.status == FAILED and 'php_en.json' in result.output
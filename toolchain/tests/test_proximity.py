@@ -0,0 +1,86 @@
+import json
+import random
+
+import pytest
+
+from toolchain.proximity import ProximityIndex, build_index, haversine, join_coordinates, load_coordinates, main
+
+
+def communes(count=400, seed=7):
+    # Scattered over northern Algeria, with a tight cluster so several share a cell.
+    rng = random.Random(seed)
+    points = [(rng.uniform(34.0, 37.0), rng.uniform(-1.5, 8.5)) for _ in range(count)]
+    points += [(36.75 + rng.uniform(-0.05, 0.05), 3.06 + rng.uniform(-0.05, 0.05)) for _ in range(40)]
+    return [['01', f'c{i}', f'c{i}', lat, lon] for i, (lat, lon) in enumerate(points)]
+
+
+def brute_force(items, lat, lon, k, radius_km, exclude=None):
+    found = sorted((haversine(lat, lon, c[3], c[4]), i) for i, c in enumerate(items) if i != exclude)
+    return [(km, i) for km, i in found if km <= radius_km][:k]
+
+
+def test_haversine():
+    assert haversine(36.75, 3.06, 36.75, 3.06) == 0
+    # Algiers to Oran is about 350 km.
+    assert haversine(36.7538, 3.0588, 35.6971, -0.6308) == pytest.approx(350, abs=10)
+
+
+@pytest.mark.parametrize('k, radius_km', [(1, 60.0), (8, 60.0), (20, 30.0), (5, 500.0)])
+def test_nearest_matches_brute_force(k, radius_km):
+    items = communes()
+    index = ProximityIndex(items)
+    rng = random.Random(k)
+    queries = [(rng.uniform(33.5, 37.5), rng.uniform(-2.0, 9.0)) for _ in range(50)] + [(36.75, 3.06)]
+    for lat, lon in queries:
+        assert index.nearest(lat, lon, k, radius_km) == brute_force(items, lat, lon, k, radius_km)
+
+
+def test_neighbours_exclude_the_commune_itself():
+    items = communes(100)
+    index = ProximityIndex(items)
+    neighbours = index.build_neighbours(k=4, radius_km=80.0)
+    for commune_id, commune in enumerate(items):
+        expected = brute_force(items, commune[3], commune[4], 4, 80.0, exclude=commune_id)
+        assert neighbours[commune_id] == [[i, round(km, 1)] for km, i in expected]
+
+
+def test_coordinates_join_on_normalized_names(tmp_path):
+    path = tmp_path / 'coordinates.csv'
+    path.write_text('wilaya_code,commune_name_ascii,latitude,longitude\n'
+                    '1,ADRAR,27.87,-0.29\n16,Alger Centre,36.77,3.06\n3,Nowhere,0,0\n', encoding='utf-8')
+    cities = [
+        {'province_code': '01', 'name_ar': 'أدرار', 'name_en': 'Adrar'},
+        {'province_code': '16', 'name_ar': 'الجزائر الوسطى', 'name_en': 'Alger Centre'},
+    ]
+    located, unmatched = join_coordinates(cities, load_coordinates(str(path)))
+    assert located == [['01', 'أدرار', 'Adrar', 27.87, -0.29], ['16', 'الجزائر الوسطى', 'Alger Centre', 36.77, 3.06]]
+    assert unmatched == [('03', 'Nowhere')]
+
+
+def test_index_round_trips_through_json(tmp_path):
+    cities = [{'province_code': '01', 'name_ar': f'c{i}', 'name_en': f'c{i}'} for i in range(50)]
+    points = [('01', [c[1]], c[3], c[4]) for c in communes(50)[:50]]
+    index, unmatched = build_index(cities, points, k=3)
+    assert unmatched == []
+    path = tmp_path / 'proximity.json'
+    path.write_text(json.dumps(index.to_json()), encoding='utf-8')
+    loaded = ProximityIndex.load(str(path))
+    assert loaded.neighbours == index.neighbours
+    assert loaded.nearest(36.0, 3.0) == index.nearest(36.0, 3.0)
+
+
+def test_nearest_matches_brute_force_near_the_pole():
+    # A degree of longitude shrinks to a few km up here, so each ring covers less ground than the one before.
+    rng = random.Random(3)
+    items = [['01', f'c{i}', f'c{i}', rng.uniform(85.0, 89.9), rng.uniform(-60.0, 60.0)] for i in range(200)]
+    index = ProximityIndex(items, cell=1.0)
+    for lat, lon in [(rng.uniform(85.0, 89.9), rng.uniform(-60.0, 60.0)) for _ in range(50)]:
+        assert index.nearest(lat, lon, 3, 3000.0) == brute_force(items, lat, lon, 3, 3000.0)
+
+
+def test_near_without_coordinates_fails(tmp_path, capsys):
+    args = ['--coordinates', str(tmp_path / 'missing.csv'), '--out', str(tmp_path / 'proximity.json')]
+    assert main(args) == 0
+    assert 'skipping' in capsys.readouterr().out
+    assert main(args + ['--near', '36.75,3.06']) == 1
+    assert capsys.readouterr().out.startswith('✗ ')
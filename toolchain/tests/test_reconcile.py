@@ -0,0 +1,88 @@
+import json
+
+from toolchain.reconcile import CITIES_JSON, CURATED_SCRIPT, load_curated, main, reconcile, summarize
+
+COMMUNES = [
+    {'province_code': '01', 'name_ar': 'أدرار', 'name_en': 'Adrar'},
+    {'province_code': '13', 'name_ar': 'أولاد ميمون', 'name_en': 'Ouled Mimoun'},
+    {'province_code': '24', 'name_ar': 'قالمة', 'name_en': 'Guelma'},
+    {'province_code': '25', 'name_ar': 'أولاد رحمون', 'name_en': 'Ouled Rahmoun'},
+    {'province_code': '32', 'name_ar': 'عين الصفراء', 'name_en': 'Ain Sefra'},
+    {'province_code': '32', 'name_ar': 'الحجاج', 'name_en': 'El Hadjadj'},
+    {'province_code': '48', 'name_ar': 'غليزان', 'name_en': 'Relizane'},
+]
+
+
+def classify(*curated, **options):
+    return [(m.status, m.commune and m.commune['name_en']) for m in reconcile(list(curated), COMMUNES, **options)]
+
+
+def city(code, name_ar, name_en):
+    return {'province_code': code, 'name_ar': name_ar, 'name_en': name_en}
+
+
+def test_exact_matches_are_ok():
+    results = reconcile([city(1, 'أدرار', 'Adrar'), city('32', 'عين الصفرة', 'Aïn Sefra')], COMMUNES)
+    assert [(m.status, m.confidence) for m in results] == [('ok', 1.0), ('ok', 1.0)]
+    assert results[0].commune is COMMUNES[0]
+
+
+def test_arabic_and_latin_spelling_variants_meet():
+    # The Arabic name decides whether the entry is ok; Latin variants still meet.
+    assert classify(city('32', 'الحجاج', 'Hadjadj')) == [('ok', 'El Hadjadj')]
+    assert classify(city('32', 'عين صفرة', 'Ain Sefra')) == [('renamed', 'Ain Sefra')]
+    # A Latin name alone, or an Arabic one alone, is enough to match.
+    assert classify(city('24', '', 'Guelma')) == [('renamed', 'Guelma')]
+    assert classify(city('24', 'قالمة', '')) == [('ok', 'Guelma')]
+
+
+def test_near_matches_need_the_dice_threshold():
+    near = city('25', 'أولاد رحمونة', 'Ouled Rahmouna')
+    [match] = reconcile([near], COMMUNES)
+    assert match.status == 'renamed' and 0.5 <= match.confidence < 1.0
+    assert classify(near, min_confidence=match.confidence + 0.01) == [('unmatched', None)]
+    assert classify(city('25', 'قسنطينة', 'Constantine')) == [('unmatched', None)]
+
+
+def test_a_better_match_elsewhere_is_a_move():
+    assert classify(city('08', 'أولاد ميمون', 'Ouled Mimoun')) == [('moved', 'Ouled Mimoun')]
+    # Within the tolerance the claimed province wins.
+    assert classify(city('25', 'أولاد رحمون', 'Ouled Rahmoun')) == [('ok', 'Ouled Rahmoun')]
+
+
+def test_only_repeats_for_the_same_province_are_duplicates():
+    # Two wrong provinces claiming the same commune are two moves, not a duplicate.
+    assert classify(city('08', 'أولاد ميمون', 'Ouled Mimoun'), city('25', 'أولاد ميمون', 'Ouled Mimoun')) == [
+        ('moved', 'Ouled Mimoun'), ('moved', 'Ouled Mimoun')]
+    assert classify(city('08', 'أولاد ميمون', 'Ouled Mimoun'), city('13', 'أولاد ميمون', 'Ouled Mimoun')) == [
+        ('moved', 'Ouled Mimoun'), ('ok', 'Ouled Mimoun')]
+    assert classify(city('13', 'أولاد ميمون', 'Ouled Mimoun'), city('13', 'اولاد ميمون', 'Ouled Mimoun')) == [
+        ('ok', 'Ouled Mimoun'), ('duplicate', 'Ouled Mimoun')]
+
+
+def test_arabic_and_latin_names_of_different_communes_are_mismatched():
+    # غليزان is Relizane: neither a move to Guelma nor to Relizane is right.
+    [match] = reconcile([city('44', 'غليزان', 'Guelma')], COMMUNES)
+    assert (match.status, match.margin) == ('mismatched', 0.0)
+    summary = summarize(reconcile([city('44', 'غليزان', 'Guelma'), city(1, 'أدرار', 'Adrar')], COMMUNES))
+    assert summary == {'ok': 1, 'renamed': 0, 'moved': 0, 'mismatched': 1, 'duplicate': 0, 'unmatched': 0}
+
+
+def test_check_fails_when_an_entry_needs_a_fix(tmp_path, capsys):
+    communes = tmp_path / 'cities.json'
+    communes.write_text(json.dumps(COMMUNES), encoding='utf-8')
+    curated = tmp_path / 'curated.json'
+    curated.write_text(json.dumps([city('01', 'أدرار', 'Adrar')]), encoding='utf-8')
+    assert main([str(curated), '--communes', str(communes), '--check']) == 0
+    curated.write_text(json.dumps([city('44', 'غليزان', 'Guelma')]), encoding='utf-8')
+    assert main([str(curated), '--communes', str(communes), '--check']) == 1
+    assert 'mismatched' in capsys.readouterr().out
+
+
+def test_shipped_curated_list():
+    with open(CITIES_JSON, 'r', encoding='utf-8') as f:
+        communes = json.load(f)
+    curated = load_curated(CURATED_SCRIPT)
+    results = {(m.entry['province_code'], m.entry['name_en']): m.status for m in reconcile(curated, communes)}
+    assert results[('08', 'Ouled Mimoun')] == results[('25', 'Ouled Mimoun')] == 'moved'
+    assert results[('44', 'Guelma')] == 'mismatched'
@@ -0,0 +1,67 @@
+import json
+import os
+
+from toolchain.paths import BASE_PATH
+from toolchain.search import CITIES_JSON, LocationIndex, build_index, delta_decode, delta_encode, encode_index
+
+CITIES = [
+    {'province_code': '01', 'name_ar': 'وهران الشمالية', 'name_en': 'Oran Nord'},
+    {'province_code': '01', 'name_ar': 'وهرانية', 'name_en': 'Oranais'},
+    {'province_code': '02', 'name_ar': 'أوران', 'name_en': 'Ouran'},
+    {'province_code': '02', 'name_ar': 'تلمسان', 'name_en': 'Tlemcen'},
+]
+# The same index, read by resources/js/lib/locationSearch.test.ts.
+FIXTURE = os.path.join(BASE_PATH, 'resources', 'js', 'lib', '__fixtures__', 'search-index.json')
+
+
+def names(results):
+    return [entry[2] for _, entry in results]
+
+
+def test_prefix_hits_rank_above_fuzzy_ones():
+    index = LocationIndex(build_index(CITIES))
+    assert names(index.search('oran')) == ['Oranais', 'Oran Nord', 'Ouran']
+
+
+def test_exact_match_ranks_first():
+    index = LocationIndex(build_index(CITIES))
+    assert names(index.search('oran nord'))[0] == 'Oran Nord'
+
+
+def test_arabic_query_is_normalized():
+    index = LocationIndex(build_index(CITIES))
+    assert names(index.search('وهران', limit=2)) == ['Oranais', 'Oran Nord']
+
+
+def test_typo_falls_back_to_trigrams():
+    index = LocationIndex(build_index(CITIES))
+    assert names(index.search('tlemsen')) == ['Tlemcen']
+
+
+def test_province_filter_applies_before_the_fuzzy_gate():
+    # The two prefix hits in 01 fill the limit but must not hide 02.
+    index = LocationIndex(build_index(CITIES))
+    assert names(index.search('oran', limit=2, province='02')) == ['Ouran']
+    assert names(index.search('oran nord', province='02')) == []
+
+
+def test_js_fixture_matches_the_built_index():
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        assert json.load(f) == build_index(CITIES)
+
+
+def test_posting_lists_are_delta_encoded():
+    assert delta_encode([3, 7, 12]) == [3, 4, 5]
+    assert list(delta_decode([3, 4, 5])) == [3, 7, 12]
+    index = build_index(CITIES)
+    assert index['trigrams'][' or'] == [0, 1]
+    assert list(delta_decode(index['trigrams']['ran'])) == [0, 1, 2]
+    assert 'keys' not in index
+
+
+def test_index_is_smaller_than_the_cities_it_indexes():
+    with open(CITIES_JSON, 'rb') as f:
+        raw = f.read()
+    data = encode_index(build_index(json.loads(raw)))
+    assert len(data) < 0.85 * len(raw)
+    assert LocationIndex(json.loads(data)).search('ain sefra', limit=1)[0][1][2] == 'Ain Sefra'
@@ -0,0 +1,37 @@
+import filecmp
+import json
+
+from toolchain.seeds import SEED_ARTIFACT, build_seed_artifact, encode_artifact, resolve_rows
+
+
+def test_rows_are_validated_and_deduplicated():
+    cities = [
+        {'province_code': 1, 'name_ar': 'أدرار', 'name_en': 'Adrar'},
+        {'province_code': '01', 'name_ar': 'تمنطيط'},
+        {'province_code': '01', 'name_ar': 'أدرار', 'name_en': 'Adrar again'},
+        {'province_code': '99', 'name_ar': 'مكان'},
+        {'province_code': '01', 'name_en': 'Nameless'},
+    ]
+    rows, problems = resolve_rows(cities, {'01', '02'})
+    assert rows == [('01', 'أدرار', 'Adrar'), ('01', 'تمنطيط', 'تمنطيط')]
+    assert problems == [
+        '#2: duplicate أدرار in province 01',
+        "#3: unknown province code '99' for مكان",
+        '#4: missing name_ar',
+    ]
+
+
+def test_artifact_chunks_rows():
+    rows = [('01', f'c{i}', f'c{i}') for i in range(5)]
+    artifact = json.loads(encode_artifact(rows, 'ab' * 20, chunk_size=2))
+    assert artifact['rows'] == 5 and artifact['source_sha1'] == 'ab' * 20
+    assert [len(chunk) for chunk in artifact['chunks']] == [2, 2, 1]
+    assert [tuple(r) for chunk in artifact['chunks'] for r in chunk] == rows
+    assert json.loads(encode_artifact([], ''))['chunks'] == []
+
+
+def test_shipped_artifact_is_current(tmp_path):
+    out = tmp_path / 'cities.seed.json'
+    rows, problems, written = build_seed_artifact(out_path=str(out))
+    assert problems == [] and written
+    assert filecmp.cmp(out, SEED_ARTIFACT, shallow=False)
@@ -0,0 +1,139 @@
+import json
+import os
+
+import pytest
+
+from toolchain import watch
+from toolchain.phpsync import PhpLangCache
+
+MESSAGES = {
+    'en': {'home.title': 'Home', 'about.title': 'About', 'auth.login': 'Log in'},
+    'fr': {'home.title': 'Accueil', 'auth.login': 'Connexion'},
+    'ar': {'home.title': 'الرئيسية'},
+    'lt': {'home.title': 'Pradžia'},
+}
+PACK = {'en': {'home.title': 'Home'}, 'fr': {'home.title': 'Accueil'}}
+
+
+class Stop(Exception):
+    pass
+
+
+@pytest.fixture
+def tree(tmp_path):
+    lang, packs, out = tmp_path / 'lang', tmp_path / 'packs', tmp_path / 'out'
+    (lang / 'en').mkdir(parents=True)
+    packs.mkdir()
+    for locale, messages in MESSAGES.items():
+        write_json(lang / f'php_{locale}.json', messages)
+    write_json(packs / 'home.json', PACK)
+    (lang / 'en' / 'auth.php').write_text("<?php\nreturn ['login' => 'Log in'];\n", encoding='utf-8')
+
+    log = []
+    watcher = watch.Watcher(str(lang), str(packs), str(out), log=log.append)
+    watcher.php_cache = PhpLangCache(path=str(tmp_path / 'cache.json'))
+    # The first sync records what PHP put in the JSON, so later PHP edits are not conflicts.
+    watcher.handle([str(lang / f'php_{locale}.json') for locale in MESSAGES] + [str(lang / 'en' / 'auth.php')])
+    del log[:]
+    return lang, packs, out, watcher, log
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=4), encoding='utf-8')
+
+
+def outputs(out):
+    """``{relative path: bytes}`` of every chunk file (the manifest left out)."""
+    files = {}
+    for directory, _, names in os.walk(out):
+        for name in names:
+            path = os.path.join(directory, name)
+            if name != 'manifest.json':
+                with open(path, 'rb') as f:
+                    files[os.path.relpath(path, out)] = f.read()
+    return files
+
+
+def rebuilt(before, after):
+    """The ``locale/namespace`` of each chunk added or removed between two outputs."""
+    return {'/'.join(rel.split('.')[0].split(os.sep)) for rel in before.keys() ^ after.keys()}
+
+
+def test_a_locale_edit_rebuilds_only_its_changed_namespace(tree):
+    lang, _, out, watcher, log = tree
+    before = outputs(out)
+    write_json(lang / 'php_fr.json', {**MESSAGES['fr'], 'home.title': 'Bienvenue'})
+    assert watcher.handle([str(lang / 'php_fr.json')]) == {'fr'}
+    assert rebuilt(before, outputs(out)) == {'fr/home'}
+    assert watcher.written == set()
+
+
+def test_a_fallback_edit_rebuilds_the_locales_that_borrow_it(tree):
+    lang, _, out, watcher, _ = tree
+    before = outputs(out)
+    write_json(lang / 'php_en.json', {**MESSAGES['en'], 'about.title': 'About us'})
+    assert watcher.handle([str(lang / 'php_en.json')]) == {'en'}
+    # Every locale borrows about.title from en; none of them has its own.
+    assert rebuilt(before, outputs(out)) == {'en/about', 'fr/about', 'ar/about', 'lt/about'}
+
+
+def test_a_pack_edit_merges_and_rebuilds_only_the_reworded_locale(tree):
+    lang, packs, out, watcher, log = tree
+    before = outputs(out)
+    write_json(packs / 'home.json', {**PACK, 'fr': {'home.title': 'Bienvenue'}})
+    assert watcher.handle([str(packs / 'home.json')]) == {'fr'}
+    assert json.loads((lang / 'php_fr.json').read_text(encoding='utf-8'))['home.title'] == 'Bienvenue'
+    assert watcher.written == {str(lang / 'php_fr.json')}
+    assert rebuilt(before, outputs(out)) == {'fr/home'}
+    assert log[0] == '   fr: home +0 ~1 keys'
+
+
+def test_a_php_edit_syncs_its_locale(tree):
+    lang, _, out, watcher, _ = tree
+    before = outputs(out)
+    (lang / 'en' / 'auth.php').write_text("<?php\nreturn ['login' => 'Sign in'];\n", encoding='utf-8')
+    assert watcher.handle([str(lang / 'en' / 'auth.php')]) == {'en'}
+    assert json.loads((lang / 'php_en.json').read_text(encoding='utf-8'))['auth.login'] == 'Sign in'
+    # fr has its own auth.login, the other locales borrow en's.
+    assert rebuilt(before, outputs(out)) == {'en/auth', 'ar/auth', 'lt/auth'}
+
+
+def test_a_broken_locale_file_is_reported_and_skipped(tree):
+    lang, _, out, watcher, log = tree
+    before = outputs(out)
+    (lang / 'php_fr.json').write_text('{"home.title": "Accueil",, }', encoding='utf-8')
+    assert watcher.handle([str(lang / 'php_fr.json')]) == {'fr'}
+    assert outputs(out) == before
+    assert log[0].startswith('✗ ') and log[0].endswith('(bundles not rebuilt)')
+
+
+def test_the_loop_survives_a_broken_edit(tree, monkeypatch):
+    lang, _, out, watcher, log = tree
+    before = outputs(out)
+    en, fr = lang / 'php_en.json', lang / 'php_fr.json'
+    steps = [
+        lambda: fr.write_text('{"home.title": "Accueil",, }', encoding='utf-8'),
+        None,
+        # en is fine, but rebuilding its dependents needs the broken fr.
+        lambda: write_json(en, {**MESSAGES['en'], 'about.title': 'About us'}),
+        None,
+        lambda: write_json(fr, {**MESSAGES['fr'], 'home.title': 'Bienvenue'}),
+        None,
+    ]
+
+    def sleep(interval):
+        if not steps:
+            raise Stop
+        step = steps.pop(0)
+        if step:
+            step()
+
+    monkeypatch.setattr(watch.time, 'sleep', sleep)
+    with pytest.raises(Stop):
+        watcher.run(interval=0, debounce=0)
+    errors = [line for line in log if line.startswith('✗')]
+    # fr fails lint in both batches; en's dependents then need it as well.
+    assert len(errors) == 3 and all('php_fr.json' in line for line in errors)
+    assert len([line for line in log if line.startswith('✓ done')]) == 3
+    # The en edit that failed to build is retried along with the fixed fr.
+    assert rebuilt(before, outputs(out)) == {'fr/home', 'en/about', 'fr/about', 'ar/about', 'lt/about'}
@@ -0,0 +1,71 @@
+"""Orthographic normalization for Arabic and French-transliterated place names.
+
+``normalize`` folds the variants users type interchangeably so that they
+compare equal:
+
+* Arabic: hamza/madda carriers (أ إ آ ؤ ئ) decompose to their base letter,
+  ٱ -> ا, ى -> ي, ة -> ه, Persian ک/ی -> ك/ي; harakat, tatweel and bare
+  hamza are dropped, and a final ا folds to ه so that taa-marbuta and
+  alef(-hamza) endings meet (صفرة / الصفراء).
+* Latin: accents are stripped (Aïn -> ain), repeated letters collapse
+  (Hammam -> hamam) and common transliteration pairs fold together
+  (dj -> j, ou -> u, q -> k, y -> i, al -> el).
+
+resources/js/lib/locationSearch.ts mirrors these rules; keep them in sync.
+"""
+import re
+import unicodedata
+
+_ARABIC_MAP = str.maketrans({
+    'ٱ': 'ا',
+    'ى': 'ي',
+    'ة': 'ه',
+    'ک': 'ك',
+    'ی': 'ي',
+    'ء': None,
+    'ـ': None,
+})
+_LATIN_TOKEN = re.compile(r'^[a-z]+$')
+_REPEATS = re.compile(r'([a-z])\1+')
+_LATIN_FOLDS = (('dj', 'j'), ('ou', 'u'), ('q', 'k'), ('y', 'i'))
+_ARABIC_ARTICLE = 'ال'
+_ARABIC_TOKEN = re.compile(r'^[\u0621-\u064a]+$')
+
+
+def _fold_latin(token):
+    token = _REPEATS.sub(r'\1', token)
+    for source, target in _LATIN_FOLDS:
+        token = token.replace(source, target)
+    return 'el' if token == 'al' else token
+
+
+def _fold_arabic(token):
+    return token[:-1] + 'ه' if len(token) > 2 and token.endswith('ا') else token
+
+
+def normalize(text):
+    """Lower-case, script-normalized form of ``text`` with single spaces."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.category(c).startswith('M'))
+    cleaned = stripped.translate(_ARABIC_MAP).lower()
+    tokens = ''.join(c if c.isalnum() else ' ' for c in cleaned).split()
+    return ' '.join(
+        _fold_latin(t) if _LATIN_TOKEN.match(t) else _fold_arabic(t) if _ARABIC_TOKEN.match(t) else t
+        for t in tokens
+    )
+
+
+def token_variants(token):
+    """The token plus its form without the Arabic definite article (الجزائر -> جزائر)."""
+    if token.startswith(_ARABIC_ARTICLE) and len(token) > len(_ARABIC_ARTICLE) + 1:
+        return (token, token[len(_ARABIC_ARTICLE):])
+    return (token,)
+
+
+def trigrams(text):
+    """Padded character trigrams of every token of an already normalized string."""
+    grams = set()
+    for token in text.split():
+        padded = f' {token} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
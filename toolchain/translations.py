@@ -0,0 +1,166 @@
+"""Single-pass merge engine for the flat lang/php_<locale>.json bundles.
+
+Key packs are JSON files shaped ``{"<locale>": {"<key>": "<text>", ...}}``
+(see toolchain/packs/). Any number of packs are folded together first and
+then every locale file is loaded, merged and written exactly once, with the
+locales handled concurrently. Files whose content does not change are left
+alone. By default changes are spliced into the existing text (see
+toolchain.jsonpatch) so untouched keys keep their bytes and order;
+``--rewrite`` re-serializes the whole file instead.
+
+    python -m toolchain.translations                 # apply every pack
+    python -m toolchain.translations doctors_page    # apply selected packs
+"""
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .buildcache import run_cached
+from .fsutil import write_if_changed
+from .jsonpatch import patch_text
+from .paths import LANG_DIR, LOCALES, PACKS_DIR, display_path, lang_file
+
+# ``conflicts``: ``[(key, kept_value, source_value), ...]`` left alone by toolchain.phpsync.
+MergeResult = namedtuple('MergeResult', 'locale path added updated written error removed conflicts',
+                         defaults=(0, ()))
+
+
+def pack_path(name, packs_dir=PACKS_DIR):
+    if name.endswith('.json') or os.sep in name:
+        return name
+    return os.path.join(packs_dir, f'{name}.json')
+
+
+def available_packs(packs_dir=PACKS_DIR):
+    return sorted(f[:-5] for f in os.listdir(packs_dir) if f.endswith('.json'))
+
+
+def load_pack(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        pack = json.load(f)
+    if not isinstance(pack, dict) or not all(isinstance(v, dict) for v in pack.values()):
+        raise ValueError(f'{path}: a key pack must map locales to {{key: text}} objects')
+    return pack
+
+
+def combine_packs(packs):
+    """Fold packs into one ``{locale: {key: text}}`` mapping; later packs win."""
+    combined = {}
+    for pack in packs:
+        for locale, keys in pack.items():
+            combined.setdefault(locale, {}).update(keys)
+    return combined
+
+
+def load_locale(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_locale(translations):
+    # Same compact layout the laravel-vue-i18n plugin writes.
+    return json.dumps(translations, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def merge_locale(locale, keys, lang_dir=LANG_DIR, patch=True, remove=()):
+    path = lang_file(locale, lang_dir)
+    try:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            text = None
+
+        if patch and text is not None:
+            result = patch_text(text, keys, remove)
+            if result.text is text:
+                return MergeResult(locale, path, 0, 0, False, None)
+            written = write_if_changed(path, result.text.encode('utf-8'))
+            return MergeResult(locale, path, len(result.added), len(result.updated), written, None,
+                               len(result.removed))
+
+        translations = json.loads(text) if text is not None else {}
+
+        added = sum(1 for k in keys if k not in translations)
+        updated = sum(1 for k, v in keys.items() if k in translations and translations[k] != v)
+        removed = [k for k in remove if k in translations and k not in keys]
+        if not added and not updated and not removed:
+            return MergeResult(locale, path, 0, 0, False, None)
+
+        for key in removed:
+            del translations[key]
+        translations.update(keys)
+        written = write_if_changed(path, dump_locale(translations))
+        return MergeResult(locale, path, added, updated, written, None, len(removed))
+    except (OSError, ValueError) as e:
+        return MergeResult(locale, path, 0, 0, False, e)
+
+
+def merge_packs(packs, lang_dir=LANG_DIR, locales=None, workers=None, patch=True):
+    """Apply ``packs`` to every locale file in one load-merge-write cycle each."""
+    combined = combine_packs(packs)
+    locales = [l for l in (locales or LOCALES) if combined.get(l)]
+    with ThreadPoolExecutor(max_workers=workers or len(locales) or 1) as pool:
+        return list(pool.map(lambda l: merge_locale(l, combined[l], lang_dir, patch), locales))
+
+
+def apply_packs(names=None, packs_dir=PACKS_DIR, lang_dir=LANG_DIR, locales=None, patch=True):
+    names = names or available_packs(packs_dir)
+    packs = [load_pack(pack_path(name, packs_dir)) for name in names]
+    return merge_packs(packs, lang_dir=lang_dir, locales=locales, patch=patch)
+
+
+def report(results):
+    failed = False
+    for r in results:
+        rel_path = display_path(r.path)
+        if isinstance(r.error, json.JSONDecodeError):
+            failed = True
+            print(f"✗ Error updating {rel_path}:{r.error.lineno}:{r.error.colno}: {r.error.msg}")
+            print(f"   run: python -m toolchain.jsonlint {rel_path}")
+        elif r.error:
+            failed = True
+            print(f"✗ Error updating {rel_path}: {r.error}")
+        elif r.written:
+            dropped = f", -{r.removed} removed" if r.removed else ''
+            print(f"✓ Updated {rel_path} (+{r.added} new, {r.updated} changed{dropped})")
+        else:
+            print(f"• {rel_path} already up to date")
+        for key, kept, source in r.conflicts:
+            wanted = 'removes it' if source is None else f'has {json.dumps(source, ensure_ascii=False)}'
+            print(f"   ≠ {key}: kept {json.dumps(kept, ensure_ascii=False)}, PHP {wanted}")
+    return not failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply translation key packs to lang/php_<locale>.json.')
+    parser.add_argument('packs', nargs='*', help='pack names from toolchain/packs or paths to pack files (default: all)')
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--locale', action='append', dest='locales', help='limit to a locale (repeatable)')
+    parser.add_argument('--rewrite', action='store_true', help='re-serialize whole files instead of patching changed keys')
+    parser.add_argument('--force', action='store_true', help='merge even when packs and lang files are unchanged')
+    args = parser.parse_args(argv)
+
+    names = args.packs or available_packs()
+    pack_files = [pack_path(name) for name in names]
+    locale_files = [lang_file(locale, args.lang_dir) for locale in args.locales or LOCALES]
+    ran, ok = run_cached(
+        f'translations:{display_path(args.lang_dir)}',
+        pack_files + [__file__],
+        lambda: [p for p in locale_files if os.path.exists(p)],
+        lambda: report(apply_packs(names, lang_dir=args.lang_dir, locales=args.locales, patch=not args.rewrite)),
+        params={'packs': names, 'rewrite': args.rewrite},
+        force=args.force,
+        ok=bool,
+    )
+    if not ran:
+        print(f"• {len(names)} packs and {len(locale_files)} locale files unchanged, nothing to merge")
+        return 0
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
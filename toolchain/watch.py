@@ -0,0 +1,281 @@
+"""Watch key packs and lang/ sources and rebuild incrementally.
+
+Polls toolchain/packs/*.json, lang/<locale>/*.php and lang/php_*.json
+(stat only, every ``--interval``) and coalesces changes until nothing has
+changed for ``--debounce``. Then, for that batch only:
+
+    pack edited      merge just the keys whose text changed, per locale
+    PHP file edited  re-parse that file and sync its locale (toolchain.phpsync)
+    locale JSON      (edited directly or by the two above) rebuild the
+                     namespace chunks of that locale and of the locales
+                     falling back to it; unchanged chunks are not
+                     rewritten, so Vite only sees the namespaces that moved
+
+Bundles take the same options as ``python -m toolchain.bundles``
+(``--chain``, ``--no-fallbacks``, ``--prune-unused``), so the incremental
+output matches a full build; with ``--prune-unused`` the frontend sources
+are watched as well and an edit there rebuilds every locale.
+
+Files are only ever written when their content changes. The paths the
+watcher writes itself are re-baselined at their post-write stat, so it
+does not trigger itself, while any other edit saved during a rebuild is
+picked up by the next poll. Locales whose bundles could not be rebuilt
+(a broken file, a placeholder mismatch) are retried with the next batch.
+
+    python -m toolchain.watch
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+from . import bundles, fallbacks, keyscan, phpsync
+from .jsonlint import lint_file
+from .messages import check_placeholders
+from .paths import LANG_DIR, LOCALES, PACKS_DIR, display_path, lang_file
+from .translations import available_packs, load_pack, merge_locale, pack_path
+
+POLL_INTERVAL = 0.1
+DEBOUNCE = 0.05
+_LOCALE_FILE = re.compile(r'^php_(?!dysgraphia_)([A-Za-z_]+)\.json$')
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def snapshot(lang_dir=LANG_DIR, packs_dir=PACKS_DIR, sources_dir=None):
+    """``{path: (mtime_ns, size)}`` of every watched file (and of the frontend sources, if given)."""
+    state = {}
+    if sources_dir:
+        for path in keyscan.discover_sources(sources_dir):
+            stat = _stat(path)
+            if stat:
+                state[path] = stat
+    for directory, suffix in ((packs_dir, '.json'), (lang_dir, '.json')):
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(suffix):
+                stat = entry.stat()
+                state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            elif entry.is_dir() and directory == lang_dir:
+                for php in os.scandir(entry.path):
+                    if php.name.endswith('.php'):
+                        stat = php.stat()
+                        state[php.path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_paths(before, after):
+    return {p for p in before.keys() | after.keys() if before.get(p) != after.get(p)}
+
+
+def _pack_changes(old, new):
+    """``{locale: {key: text}}`` of keys added or reworded between two versions of a pack."""
+    changes = {}
+    for locale, keys in new.items():
+        previous = old.get(locale, {})
+        diff = {k: v for k, v in keys.items() if previous.get(k) != v}
+        if diff:
+            changes[locale] = diff
+    return changes
+
+
+class Watcher:
+    """``overrides``/``use_fallbacks`` and ``sources_dir`` are bundles' --chain/--no-fallbacks
+    and --prune-unused/--sources."""
+
+    def __init__(self, lang_dir=LANG_DIR, packs_dir=PACKS_DIR, out_dir=bundles.BUNDLES_DIR, log=print,
+                 overrides=None, use_fallbacks=True, sources_dir=None):
+        self.lang_dir = lang_dir
+        self.packs_dir = packs_dir
+        self.out_dir = out_dir
+        self.log = log
+        # As in bundles.shipped_messages: None ships every locale as it is.
+        self.overrides = (overrides or {}) if use_fallbacks else None
+        self.sources_dir = sources_dir
+        self.packs = {name: self._load_pack(name) for name in available_packs(packs_dir)}
+        self.php_cache = phpsync.PhpLangCache.load()
+        self.written = set()
+        # Locales whose last bundle build did not go through.
+        self.stale = set()
+        self.state = self.snapshot()
+
+    def snapshot(self):
+        return snapshot(self.lang_dir, self.packs_dir, self.sources_dir)
+
+    def _load_pack(self, name):
+        try:
+            return load_pack(pack_path(name, self.packs_dir))
+        except (OSError, ValueError) as e:
+            self.log(f"✗ {name}: {e}")
+            return None
+
+    def handle(self, paths):
+        """Process one coalesced batch of changed paths; returns the locales rebuilt.
+
+        The files written along the way are left in ``self.written``.
+        """
+        touched = {l for l in self.stale if os.path.exists(lang_file(l, self.lang_dir))}
+        self.written = set()
+        packs_dir = os.path.abspath(self.packs_dir)
+        sources_dir = os.path.join(os.path.abspath(self.sources_dir), '') if self.sources_dir else None
+        php_locales = set()
+        for path in sorted(paths):
+            directory = os.path.dirname(os.path.abspath(path))
+            if sources_dir and os.path.abspath(path).startswith(sources_dir):
+                # Key usage may have changed for every locale.
+                touched |= {l for l in LOCALES if os.path.exists(lang_file(l, self.lang_dir))}
+            elif directory == packs_dir:
+                touched |= self._merge_pack(os.path.basename(path)[:-5])
+            elif path.endswith('.php'):
+                php_locales.add(os.path.basename(directory))
+            else:
+                match = _LOCALE_FILE.match(os.path.basename(path))
+                if match:
+                    touched.add(match.group(1))
+
+        if php_locales:
+            packs = [p for p in self.packs.values() if p]
+            results, _ = phpsync.sync(self.lang_dir, sorted(php_locales), packs, cache=self.php_cache)
+            for result in results:
+                if result.error:
+                    self.log(f"✗ {display_path(result.path)}: {result.error}")
+                    continue
+                if result.written:
+                    self.log(f"   {result.locale}: PHP +{result.added} ~{result.updated} -{result.removed} keys")
+                    self.written.add(result.path)
+                    touched.add(result.locale)
+                for key, _, _ in result.conflicts:
+                    self.log(f"   {result.locale}: {key} edited in JSON, kept (phpsync --prefer-php overwrites it)")
+
+        if touched:
+            self.stale = set(touched)
+            self.stale = self._bundle(touched)
+        return touched
+
+    def _merge_pack(self, name):
+        new = self._load_pack(name) if os.path.exists(pack_path(name, self.packs_dir)) else {}
+        if new is None:
+            return set()
+        changes = _pack_changes(self.packs.get(name) or {}, new)
+        self.packs[name] = new
+        touched = set()
+        for locale, keys in changes.items():
+            result = merge_locale(locale, keys, self.lang_dir)
+            if result.error:
+                self.log(f"✗ {display_path(result.path)}: {result.error}")
+            elif result.written:
+                self.log(f"   {locale}: {name} +{result.added} ~{result.updated} keys")
+                self.written.add(result.path)
+                touched.add(locale)
+        return touched
+
+    def _bundle(self, changed):
+        """Rebuild the bundles affected by ``changed``; returns the locales left stale."""
+        ok = []
+        for locale in sorted(changed):
+            path = lang_file(locale, self.lang_dir)
+            result = lint_file(path)
+            if result.error or result.issues:
+                first = result.issues[0] if result.issues else None
+                where = f":{first.line}:{first.column}: {first.message}" if first else f": {result.error}"
+                self.log(f"✗ {display_path(path)}{where} (bundles not rebuilt)")
+            else:
+                ok.append(locale)
+        if self.overrides is None:
+            locales = ok
+            needed = locales
+        else:
+            # An edit to en also changes every locale that falls back to it.
+            locales = fallbacks.dependents(ok, LOCALES, self.overrides)
+            needed = fallbacks.required_locales(locales, self.overrides)
+        if not locales:
+            return set(changed)
+        sources = fallbacks.load_sources(needed, self.lang_dir, self.log)
+        mismatches = check_placeholders(sources)
+        for key, locale, missing, extra in mismatches:
+            details = ', '.join([f"missing :{n}" for n in missing] + [f"unexpected :{n}" for n in extra])
+            self.log(f"✗ {display_path(lang_file(locale, self.lang_dir))} {key}: {details} (bundles not rebuilt)")
+        if mismatches:
+            return set(changed)
+        usage = keyscan.scan(self.sources_dir)[0] if self.sources_dir else None
+        resolved = bundles.shipped_messages(sources, locales, self.overrides, usage, log=lambda line: None)
+        _, written, removed = bundles.build_bundles(resolved, self.out_dir)
+        chunks = [p for p in written if not p.endswith(bundles.MANIFEST_NAME)]
+        self.log(f"   {', '.join(resolved)}: {len(chunks)} chunk files written, {len(removed)} removed")
+        return set(changed) - set(ok)
+
+    def run(self, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        pending = set()
+        last_change = None
+        while True:
+            current = self.snapshot()
+            changed = changed_paths(self.state, current)
+            self.state = current
+            if changed:
+                # Every new write restarts the quiet period.
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= debounce:
+                start = time.perf_counter()
+                self.log(f"↻ {', '.join(display_path(p) for p in sorted(pending))}")
+                try:
+                    self.handle(pending)
+                except (OSError, ValueError) as e:
+                    self.log(f"✗ {e}")
+                self.log(f"✓ done in {(time.perf_counter() - start) * 1000:.0f} ms")
+                # Our own writes are part of this batch, not a new change. Everything
+                # else keeps its pre-batch stat, so edits saved meanwhile show up next poll.
+                for path in self.written:
+                    stat = _stat(path)
+                    if stat:
+                        self.state[path] = stat
+                    else:
+                        self.state.pop(path, None)
+                pending = set()
+            time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild locale files and bundles as packs and lang sources change.')
+    parser.add_argument('--lang-dir', default=LANG_DIR)
+    parser.add_argument('--packs-dir', default=PACKS_DIR)
+    parser.add_argument('--out-dir', default=bundles.BUNDLES_DIR)
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='seconds between polls')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE, help='quiet period before a batch is processed')
+    # The bundles options, so the incremental output matches `python -m toolchain.bundles`.
+    parser.add_argument('--prune-unused', action='store_true', help='drop keys resources/js never references')
+    parser.add_argument('--sources', default=keyscan.SOURCES_DIR, help='frontend sources scanned by --prune-unused')
+    parser.add_argument('--no-fallbacks', dest='fallbacks', action='store_false',
+                        help='ship each locale as is instead of filling in keys from its fallback chain')
+    parser.add_argument('--chain', action='append', metavar='LOCALE=FALLBACK,...', help='custom fallback chain')
+    args = parser.parse_args(argv)
+
+    try:
+        overrides = fallbacks.parse_chains(args.chain)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+    watcher = Watcher(args.lang_dir, args.packs_dir, args.out_dir, log=lambda line: print(line, flush=True),
+                      overrides=overrides, use_fallbacks=args.fallbacks,
+                      sources_dir=args.sources if args.prune_unused else None)
+    print(f"• watching {display_path(args.packs_dir)} and {display_path(args.lang_dir)} "
+          f"({len(watcher.state)} files, Ctrl+C to stop)", flush=True)
+    try:
+        watcher.run(args.interval, args.debounce)
+    except KeyboardInterrupt:
+        print("\n• stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())